@@ -1,14 +1,43 @@
-from flask import Flask, request, jsonify, send_file
-from linkedinparser import parse_linkedin_pdf, generate_resume, retrieve_profile
-from latexgenerator import ResumeGenerator, ResumeTheme
-import os
-import shutil
+from flask import Flask, g, request, jsonify, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from linkedinparser import parse_linkedin_pdf, retrieve_profile
+from batchrender import parse_batch, zip_stream
+from rendercache import render_key
+from renderservice import ENGINES, RenderQueueFull, RenderTimeout
+from previewrenderer import PREVIEW_FORMATS, preview_key, validate_preview
+from clients import clients
+from jobqueue import JobQueueFull
+from metrics import REQUEST_SECONDS, begin_request, exposition, server_timing, timed
+from services import (
+    BATCH_MAX_ITEMS, PREVIEW_DPI, PROFILER_MAX_SECONDS, STORE_JOB_WAIT, UPLOAD_FOLDER, FastJSONMixin,
+    batch_renderer, parse_cache, preview_cache, preview_renderer, profiler, render_cache, render_service,
+    store_jobs, theme_from_options
+)
+import io
+import time
+
+from flask_cors import CORS
+class JSONProvider(FastJSONMixin, DefaultJSONProvider):
+    pass
 
-from flask_cors import CORS, cross_origin
 app = Flask(__name__)
+app.json = JSONProvider(app)
 cors = CORS(app)
 app.config['CORS_HEADERS'] = 'Content-Type'
-app.config['UPLOAD_FOLDER'] = os.path.join(os.getcwd(), 'tmp')
+app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    begin_request()
+
+@app.after_request
+def record_request_timing(response):
+    total = time.perf_counter() - g.request_start
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_SECONDS.observe(total, request.method, endpoint, str(response.status_code))
+    response.headers['Server-Timing'] = server_timing(total)
+    return response
 
 @app.route('/api/parse-linkedin', methods=['POST'])
 def parse_linkedin():
@@ -20,64 +49,198 @@ def parse_linkedin():
         return jsonify({'error': 'No file selected'}), 400
         
     try:
-        # Create tmp directory if it doesn't exist
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        
-        # Save uploaded file temporarily
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], 'linkedin_profile.pdf')
-        file.save(temp_path)
-        
-        # Parse PDF and get profile ID
-        profile_id, result = parse_linkedin_pdf(temp_path)
-        
-        # Clean up
-        os.remove(temp_path)
+        # Parse the upload in memory; storing continues in the background
+        profile_id, result = parse_linkedin_pdf(file.read(), cache=parse_cache, jobs=store_jobs)
+        job = store_jobs.get_by_key(profile_id)
         
         return jsonify({
             'profile_id': profile_id,
-            'profile_data': result
+            'profile_data': result,
+            'job_id': job.id if job else None
         })
+    except JobQueueFull as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def store_job_error(profile_id):
+    """Error response if the profile's store job is still running or failed, else None"""
+    # Give a freshly uploaded profile time to finish storing, even when
+    # another server worker took the upload
+    with timed('store_wait'):
+        job = store_jobs.wait_by_key(profile_id, STORE_JOB_WAIT)
+    if job:
+        if job['status'] in ('queued', 'running'):
+            response = jsonify({'error': 'Profile is still being stored', 'job': job})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        if job['status'] == 'failed':
+            return jsonify({'error': f"Failed to store profile: {job['error']}", 'job': job}), 500
+    return None
+
+def not_modified(key):
+    response = app.response_class(status=304)
+    response.set_etag(key)
+    return response
+
+def rendered_pdf_bytes(profile_data, theme, engine, key):
+    """The PDF for a render key, from the render cache or freshly rendered"""
+    pdf_bytes = render_cache.read(key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+    pdf_bytes = render_service.render(profile_data, theme, engine)
+    render_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
 @app.route('/api/generate-resume/<profile_id>', methods=['POST'])
 def generate_resume_endpoint(profile_id):
     try:
         # Get theme options from request
         theme_options = request.json or {}
-        theme = ResumeTheme(
-            primary_color=theme_options.get('primary_color', 'black'),
-            accent_color=theme_options.get('accent_color', '0.5,0.5,0.5'),
-            font_family=theme_options.get('font_family', 'helvetica'),
-            section_style=theme_options.get('section_style', 'basic'),
-            layout=theme_options.get('layout', 'traditional'),
-            font_size=theme_options.get('font_size', '11pt')
-        )
+        theme = theme_from_options(theme_options)
+        engine = theme_options.get('engine', 'latex')
+        if engine not in ENGINES:
+            return jsonify({'error': f'Unknown engine: {engine}'}), 400
+
+        if error := store_job_error(profile_id):
+            return error
 
-        # Retrieve profile from Pinecone
+        # Retrieve profile from the profile store
         profile_data = retrieve_profile(profile_id)
         if not profile_data:
             return jsonify({'error': 'Profile not found'}), 404
 
-        # Create output directory if it doesn't exist
-        output_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate resume PDF with theme
-        output_path = os.path.join(output_dir, f'resume_{profile_id}')
-        generator = ResumeGenerator(profile_data, theme)
-        pdf_path = generator.generate(output_path)
+        # The client already holds this exact render
+        key = render_key(profile_data, theme, engine)
+        if key in request.if_none_match:
+            return not_modified(key)
+
+        # Served from memory, whether cached or freshly rendered
+        pdf_bytes = rendered_pdf_bytes(profile_data, theme, engine, key)
         
         # Return PDF file
         return send_file(
-            pdf_path,
+            io.BytesIO(pdf_bytes),
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=f'resume_{profile_id}.pdf'
+            download_name=f'resume_{profile_id}.pdf',
+            etag=key
         )
 
+    except RenderQueueFull as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    except RenderTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/preview-resume/<profile_id>', methods=['POST'])
+def preview_resume_endpoint(profile_id):
+    try:
+        # Same theme options as generate-resume, plus the image size and format
+        theme_options = request.json or {}
+        theme = theme_from_options(theme_options)
+        engine = theme_options.get('engine', 'latex')
+        if engine not in ENGINES:
+            return jsonify({'error': f'Unknown engine: {engine}'}), 400
+        try:
+            dpi = int(theme_options.get('dpi', PREVIEW_DPI))
+            fmt = theme_options.get('format', 'png')
+            validate_preview(dpi, fmt)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if error := store_job_error(profile_id):
+            return error
+
+        profile_data = retrieve_profile(profile_id)
+        if not profile_data:
+            return jsonify({'error': 'Profile not found'}), 404
+
+        key = render_key(profile_data, theme, engine)
+        image_key = preview_key(key, dpi, fmt)
+        if image_key in request.if_none_match:
+            return not_modified(image_key)
+
+        image_bytes = preview_cache.read(image_key)
+        if image_bytes is None:
+            # Rasterize page one of the (possibly cached) PDF on the preview pool
+            image_bytes = preview_renderer.render(rendered_pdf_bytes(profile_data, theme, engine, key), dpi, fmt)
+            preview_cache.put(image_key, image_bytes)
+
+        return send_file(io.BytesIO(image_bytes), mimetype=PREVIEW_FORMATS[fmt], etag=image_key)
+
+    except RenderQueueFull as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    except RenderTimeout as e:
+        return jsonify({'error': str(e)}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/batch-resumes', methods=['POST'])
+def batch_resumes_endpoint():
+    """Resumes for many (profile_id, theme) pairs as a ZIP streamed while
+    they render; see batchrender.py for the request body. Per-item failures
+    are listed in the archive's manifest.json."""
+    try:
+        items = parse_batch(request.get_json(silent=True), BATCH_MAX_ITEMS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = app.response_class(
+        stream_with_context(zip_stream(batch_renderer.render(items))), mimetype='application/zip'
+    )
+    response.headers['Content-Disposition'] = 'attachment; filename=resumes.zip'
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = store_jobs.status(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return app.response_class(exposition(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/profile', methods=['GET'])
+def profile_endpoint():
+    """Sample stacks for ?seconds=N (optionally only ?threads=<name prefix>)
+    and return them in collapsed form for a flame graph."""
+    if profiler is None:
+        return jsonify({'error': 'Profiler is disabled; set PROFILER_ENABLED=1'}), 404
+    try:
+        seconds = float(request.args.get('seconds', 10))
+    except ValueError:
+        return jsonify({'error': 'seconds must be a number'}), 400
+    # `not > 0` also turns away nan
+    if not seconds > 0:
+        return jsonify({'error': 'seconds must be positive'}), 400
+    seconds = min(seconds, PROFILER_MAX_SECONDS)
+    try:
+        stacks = profiler.profile(seconds, request.args.get('threads'))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return app.response_class(stacks, mimetype='text/plain')
+
+@app.route('/api/render/stats', methods=['GET'])
+def render_stats():
+    return jsonify({
+        **render_service.stats(),
+        'cache': render_cache.stats(),
+        'previews': {**preview_renderer.stats(), 'cache': preview_cache.stats()}
+    })
+
 if __name__ == '__main__':
+    # Build the shared API clients now so the first request skips setup.
+    # Not at import: the batch pool's spawned workers re-run this file as
+    # __mp_main__, and they only render
+    clients.warm()
     app.run(debug=True)
\ No newline at end of file
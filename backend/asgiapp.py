@@ -0,0 +1,254 @@
+from quart import Quart, Response, g, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from linkedinparser import aparse_linkedin_pdf, aretrieve_profile
+from batchrender import azip_stream, parse_batch
+from rendercache import render_key
+from renderservice import ENGINES, RenderQueueFull, RenderTimeout
+from previewrenderer import PREVIEW_FORMATS, preview_key, validate_preview
+from clients import clients
+from jobqueue import JobQueueFull
+from metrics import REQUEST_SECONDS, begin_request, exposition, server_timing, timed
+from services import (
+    BATCH_MAX_ITEMS, PREVIEW_DPI, PROFILER_MAX_SECONDS, STORE_JOB_WAIT, FastJSONMixin, batch_renderer,
+    parse_cache, preview_cache, preview_renderer, profiler, render_cache, render_service, store_jobs,
+    theme_from_options
+)
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import time
+
+# ASGI version of app.py for concurrent serving (run it with serve.py).
+# Handlers await the OpenAI and vector store calls on asyncio clients and
+# hand parsing, rendering and rasterizing to executors, so one worker
+# process keeps serving other requests while those run.
+class JSONProvider(FastJSONMixin, DefaultJSONProvider):
+    pass
+
+app = cors(Quart(__name__))
+app.json = JSONProvider(app)
+
+# Parsing is CPU-bound Python, so it gets its own processes rather than
+# threads; PARSE_PROCESSES=0 parses on a worker thread instead
+PARSE_PROCESSES = int(os.getenv('PARSE_PROCESSES', 2))
+parse_pool = ProcessPoolExecutor(
+    max_workers=PARSE_PROCESSES, mp_context=multiprocessing.get_context('spawn')
+) if PARSE_PROCESSES > 0 else None
+
+@app.before_serving
+async def warm_clients():
+    # The sync clients back the profile store fallbacks and Pinecone setup
+    await asyncio.to_thread(clients.warm)
+
+@app.after_serving
+async def close_clients():
+    await clients.aclose()
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+    batch_renderer.shutdown()
+
+@app.before_request
+async def start_request_timer():
+    g.request_start = time.perf_counter()
+    begin_request()
+
+@app.after_request
+async def record_request_timing(response):
+    total = time.perf_counter() - g.request_start
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_SECONDS.observe(total, request.method, endpoint, str(response.status_code))
+    response.headers['Server-Timing'] = server_timing(total)
+    return response
+
+def retry_later(error):
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+@app.route('/api/parse-linkedin', methods=['POST'])
+async def parse_linkedin():
+    files = await request.files
+    if 'file' not in files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    try:
+        profile_id, result = await aparse_linkedin_pdf(
+            file.read(), cache=parse_cache, jobs=store_jobs, executor=parse_pool
+        )
+        job = store_jobs.get_by_key(profile_id) if profile_id else None
+
+        return jsonify({
+            'profile_id': profile_id,
+            'profile_data': result,
+            'job_id': job.id if job else None
+        })
+    except JobQueueFull as e:
+        return retry_later(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+async def store_job_error(profile_id):
+    """Error response if the profile's store job is still running or failed, else None"""
+    # The job may be running in another server worker; its status is shared
+    with timed('store_wait'):
+        job = await store_jobs.await_by_key(profile_id, STORE_JOB_WAIT)
+    if job:
+        if job['status'] in ('queued', 'running'):
+            response = jsonify({'error': 'Profile is still being stored', 'job': job})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        if job['status'] == 'failed':
+            return jsonify({'error': f"Failed to store profile: {job['error']}", 'job': job}), 500
+    return None
+
+def not_modified(key):
+    response = Response('', status=304)
+    response.set_etag(key)
+    return response
+
+async def rendered_pdf_bytes(profile_data, theme, engine, key):
+    """The PDF for a render key, from the render cache or freshly rendered"""
+    pdf_bytes = await asyncio.to_thread(render_cache.read, key)
+    if pdf_bytes is None:
+        pdf_bytes = await render_service.render_async(profile_data, theme, engine)
+        await asyncio.to_thread(render_cache.put, key, pdf_bytes)
+    return pdf_bytes
+
+async def resume_request(profile_id):
+    """Theme, engine and profile for a generate/preview request, or an error response"""
+    theme_options = await request.get_json(silent=True) or {}
+    engine = theme_options.get('engine', 'latex')
+    if engine not in ENGINES:
+        return None, (jsonify({'error': f'Unknown engine: {engine}'}), 400)
+
+    if error := await store_job_error(profile_id):
+        return None, error
+
+    profile_data = await aretrieve_profile(profile_id)
+    if not profile_data:
+        return None, (jsonify({'error': 'Profile not found'}), 404)
+    return (theme_from_options(theme_options), engine, profile_data), None
+
+@app.route('/api/generate-resume/<profile_id>', methods=['POST'])
+async def generate_resume_endpoint(profile_id):
+    try:
+        resume, error = await resume_request(profile_id)
+        if error:
+            return error
+        theme, engine, profile_data = resume
+
+        # The client already holds this exact render
+        key = render_key(profile_data, theme, engine)
+        if key in request.if_none_match:
+            return not_modified(key)
+
+        pdf_bytes = await rendered_pdf_bytes(profile_data, theme, engine, key)
+        response = Response(pdf_bytes, mimetype='application/pdf')
+        response.headers['Content-Disposition'] = f'attachment; filename=resume_{profile_id}.pdf'
+        response.set_etag(key)
+        return response
+
+    except RenderQueueFull as e:
+        return retry_later(e)
+    except RenderTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/preview-resume/<profile_id>', methods=['POST'])
+async def preview_resume_endpoint(profile_id):
+    try:
+        theme_options = await request.get_json(silent=True) or {}
+        try:
+            dpi = int(theme_options.get('dpi', PREVIEW_DPI))
+            fmt = theme_options.get('format', 'png')
+            validate_preview(dpi, fmt)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        resume, error = await resume_request(profile_id)
+        if error:
+            return error
+        theme, engine, profile_data = resume
+
+        key = render_key(profile_data, theme, engine)
+        image_key = preview_key(key, dpi, fmt)
+        if image_key in request.if_none_match:
+            return not_modified(image_key)
+
+        image_bytes = await asyncio.to_thread(preview_cache.read, image_key)
+        if image_bytes is None:
+            pdf_bytes = await rendered_pdf_bytes(profile_data, theme, engine, key)
+            image_bytes = await preview_renderer.render_async(pdf_bytes, dpi, fmt)
+            await asyncio.to_thread(preview_cache.put, image_key, image_bytes)
+
+        response = Response(image_bytes, mimetype=PREVIEW_FORMATS[fmt])
+        response.set_etag(image_key)
+        return response
+
+    except RenderQueueFull as e:
+        return retry_later(e)
+    except RenderTimeout as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/batch-resumes', methods=['POST'])
+async def batch_resumes_endpoint():
+    """Resumes for many (profile_id, theme) pairs as a ZIP streamed while
+    they render; see batchrender.py for the request body. Per-item failures
+    are listed in the archive's manifest.json."""
+    try:
+        items = parse_batch(await request.get_json(silent=True), BATCH_MAX_ITEMS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = Response(azip_stream(batch_renderer.render_async(items)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = 'attachment; filename=resumes.zip'
+    response.timeout = None  # Large batches outlast Quart's default response timeout
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+async def job_status(job_id):
+    job = await asyncio.to_thread(store_jobs.status, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/metrics', methods=['GET'])
+async def metrics_endpoint():
+    return Response(exposition(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/profile', methods=['GET'])
+async def profile_endpoint():
+    """Sample stacks for ?seconds=N (optionally only ?threads=<name prefix>)
+    and return them in collapsed form for a flame graph."""
+    if profiler is None:
+        return jsonify({'error': 'Profiler is disabled; set PROFILER_ENABLED=1'}), 404
+    try:
+        seconds = float(request.args.get('seconds', 10))
+    except ValueError:
+        return jsonify({'error': 'seconds must be a number'}), 400
+    # `not > 0` also turns away nan
+    if not seconds > 0:
+        return jsonify({'error': 'seconds must be positive'}), 400
+    seconds = min(seconds, PROFILER_MAX_SECONDS)
+    try:
+        stacks = await asyncio.to_thread(profiler.profile, seconds, request.args.get('threads'))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return Response(stacks, mimetype='text/plain')
+
+@app.route('/api/render/stats', methods=['GET'])
+async def render_stats():
+    return jsonify({
+        **render_service.stats(),
+        'cache': render_cache.stats(),
+        'previews': {**preview_renderer.stats(), 'cache': preview_cache.stats()}
+    })
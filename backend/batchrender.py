@@ -0,0 +1,304 @@
+"""Render resumes for many (profile_id, theme) pairs and stream them as a ZIP.
+
+Used by the /api/batch-resumes endpoints and from the command line:
+
+    python batchrender.py batch.json -o resumes.zip
+
+where batch.json holds either explicit pairs or every profile in every theme:
+
+    {"items": [{"profile_id": "profile_...", "theme": {"section_style": "modern"}}],
+     "engine": "latex"}
+    {"profile_ids": ["profile_...", "profile_..."], "themes": [{}, {"layout": "modern"}]}
+
+Profiles are fetched in one bulk lookup, PDFs already in the render cache
+are sent first, and the rest compile across a process pool and go into the
+archive in the order they finish. The last member, manifest.json, reports
+each item as rendered or failed with its error; if the profile lookup
+itself fails, every item is reported failed rather than the ZIP being cut
+short.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import re
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from latexgenerator import ResumeTheme, theme_from_options
+from linkedinparser import retrieve_profiles
+from rendercache import RenderCache, render_key
+from renderservice import ENGINES, render_pdf
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchItem:
+    index: int
+    profile_id: str
+    theme: ResumeTheme
+    engine: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.index:04d}_resume_{re.sub(r'[^A-Za-z0-9_.-]', '_', self.profile_id)}.pdf"
+
+# (item, PDF bytes, error); exactly one of the last two is set
+BatchResult = Tuple[BatchItem, Optional[bytes], Optional[str]]
+
+def parse_batch(payload: Dict, max_items: int) -> List[BatchItem]:
+    """Items from a batch request body; raises ValueError if it is malformed."""
+    if not isinstance(payload, dict):
+        raise ValueError("Batch must be a JSON object")
+    engine = payload.get('engine', 'latex')
+    default_theme = payload.get('theme') or {}
+    if 'items' in payload:
+        if not isinstance(payload['items'], list):
+            raise ValueError("items must be a list")
+        pairs = [(item.get('profile_id'), item.get('theme') or default_theme, item.get('engine', engine))
+                 for item in payload['items'] if isinstance(item, dict)]
+        if len(pairs) != len(payload['items']):
+            raise ValueError("Every item must be an object with a profile_id")
+    else:
+        profile_ids = payload.get('profile_ids') or []
+        themes = payload.get('themes') or [default_theme]
+        if not isinstance(profile_ids, list):
+            raise ValueError("profile_ids must be a list")
+        if not isinstance(themes, list):
+            raise ValueError("themes must be a list")
+        pairs = [(profile_id, theme, engine) for profile_id in profile_ids for theme in themes]
+
+    if not pairs:
+        raise ValueError("Give items, or profile_ids (and optionally themes)")
+    if len(pairs) > max_items:
+        raise ValueError(f"At most {max_items} resumes per batch, got {len(pairs)}")
+
+    items = []
+    for index, (profile_id, theme, item_engine) in enumerate(pairs, start=1):
+        if not isinstance(profile_id, str) or not profile_id:
+            raise ValueError(f"Item {index} has no profile_id")
+        if item_engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {item_engine}")
+        if not isinstance(theme, dict):
+            raise ValueError(f"Item {index} has a theme that is not an object")
+        items.append(BatchItem(index, profile_id, theme_from_options(theme), item_engine))
+    return items
+
+class BatchRenderer:
+    """Renders batch items on a process pool of `processes` workers.
+
+    The pool is started on first use with the spawn method, so it is safe
+    to create one at import time in a threaded or async server. Identical
+    items (same profile content, theme and engine) are rendered once.
+    """
+
+    def __init__(self, processes: int = 2, timeout: float = 30.0, cache: Optional[RenderCache] = None):
+        self.processes = processes
+        self.timeout = timeout
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _plan(self, items: List[BatchItem], profiles: Dict[str, Dict]
+              ) -> Tuple[List[BatchResult], Dict[Future, Tuple[str, List[BatchItem]]]]:
+        """Results available straight away (missing profiles, cache hits) and
+        the render futures for the rest, each mapped to its key and items."""
+        ready = []
+        renders: Dict[str, Tuple[Future, List[BatchItem]]] = {}
+        for item in items:
+            profile_data = profiles.get(item.profile_id)
+            if profile_data is None:
+                ready.append((item, None, 'Profile not found'))
+                continue
+            key = render_key(profile_data, item.theme, item.engine)
+            if key in renders:
+                renders[key][1].append(item)
+                continue
+            pdf_bytes = self.cache.read(key) if self.cache is not None else None
+            if pdf_bytes is not None:
+                ready.append((item, pdf_bytes, None))
+                continue
+            future = self._executor().submit(render_pdf, profile_data, item.theme, item.engine, self.timeout)
+            renders[key] = (future, [item])
+        return ready, {future: (key, batch) for key, (future, batch) in renders.items()}
+
+    def _finished(self, key: str, batch: List[BatchItem], future: Future) -> Iterator[BatchResult]:
+        try:
+            pdf_bytes, error = future.result(), None
+        except subprocess.TimeoutExpired:
+            pdf_bytes, error = None, f"Resume generation exceeded {self.timeout:.0f}s"
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            self.shutdown()
+            pdf_bytes, error = None, "Render worker crashed"
+        except Exception as e:
+            pdf_bytes, error = None, str(e) or type(e).__name__
+        if pdf_bytes is not None and self.cache is not None:
+            self.cache.put(key, pdf_bytes)
+        for item in batch:
+            yield item, pdf_bytes, error
+
+    def _lookup_failed(self, items: List[BatchItem], error: Exception) -> List[BatchResult]:
+        """Every item failed, once the ZIP may already be on its way to the client."""
+        logger.error(f"Profile lookup for a batch of {len(items)} failed: {error}")
+        return [(item, None, f"Profile lookup failed: {error}") for item in items]
+
+    def render(self, items: List[BatchItem]) -> Iterator[BatchResult]:
+        """Yield a result for every item as soon as it is available."""
+        try:
+            profiles = retrieve_profiles([item.profile_id for item in items])
+        except Exception as e:
+            yield from self._lookup_failed(items, e)
+            return
+        ready, pending = self._plan(items, profiles)
+        yield from ready
+        try:
+            for future in as_completed(pending):
+                yield from self._finished(*pending[future], future)
+        finally:
+            for future in pending:
+                future.cancel()  # The client went away; skip renders not yet started
+
+    async def render_async(self, items: List[BatchItem]) -> AsyncIterator[BatchResult]:
+        """Like render, awaiting the lookups and renders instead of blocking."""
+        try:
+            profiles = await asyncio.to_thread(retrieve_profiles, [item.profile_id for item in items])
+        except Exception as e:
+            for result in self._lookup_failed(items, e):
+                yield result
+            return
+        ready, pending = await asyncio.to_thread(self._plan, items, profiles)
+        for result in ready:
+            yield result
+        waiting = {asyncio.wrap_future(future): future for future in pending}
+        try:
+            while waiting:
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for wrapped in done:
+                    future = waiting.pop(wrapped)
+                    results = await asyncio.to_thread(list, self._finished(*pending[future], future))
+                    for result in results:
+                        yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+class _ZipOutput(io.RawIOBase):
+    """Write-only, unseekable sink that hands back what was written so far."""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+class ZipStream:
+    """Builds a ZIP archive incrementally; add() and close() return the bytes
+    to send next. PDFs are already compressed, so members are stored as is."""
+
+    def __init__(self):
+        self._output = _ZipOutput()
+        self._archive = zipfile.ZipFile(self._output, 'w', compression=zipfile.ZIP_STORED)
+        self.manifest: List[Dict] = []
+
+    def add(self, item: BatchItem, pdf_bytes: Optional[bytes], error: Optional[str]) -> bytes:
+        entry = {'index': item.index, 'profile_id': item.profile_id, 'engine': item.engine,
+                 'theme': asdict(item.theme)}
+        if error is None:
+            self._archive.writestr(item.filename, pdf_bytes)
+            entry.update(status='rendered', file=item.filename)
+        else:
+            entry.update(status='failed', error=error)
+        self.manifest.append(entry)
+        return self._output.take()
+
+    def close(self) -> bytes:
+        self.manifest.sort(key=lambda entry: entry['index'])
+        self._archive.writestr('manifest.json', json.dumps({'items': self.manifest}, indent=2))
+        self._archive.close()
+        return self._output.take()
+
+def zip_stream(results: Iterable[BatchResult]) -> Iterator[bytes]:
+    """ZIP archive chunks for a batch, one per finished item."""
+    archive = ZipStream()
+    for result in results:
+        yield archive.add(*result)
+    yield archive.close()
+
+async def azip_stream(results: AsyncIterator[BatchResult]) -> AsyncIterator[bytes]:
+    archive = ZipStream()
+    async for result in results:
+        yield archive.add(*result)
+    yield archive.close()
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Render resumes for many profiles and themes into a ZIP.')
+    parser.add_argument('batch', help='JSON batch file (see the module docstring), or - for stdin')
+    parser.add_argument('-o', '--output', required=True, help='ZIP file to write')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Render processes (defaults to the number of CPU cores)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds allowed per resume')
+    parser.add_argument('--max-items', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    with (sys.stdin if args.batch == '-' else open(args.batch)) as f:
+        items = parse_batch(json.load(f), args.max_items)
+
+    renderer = BatchRenderer(processes=args.workers or multiprocessing.cpu_count(), timeout=args.timeout)
+    start = time.perf_counter()
+    archive = ZipStream()
+    try:
+        with open(args.output, 'wb') as out:
+            for item, pdf_bytes, error in renderer.render(items):
+                if error:
+                    logger.error(f"Item {item.index} ({item.profile_id}) failed: {error}")
+                out.write(archive.add(item, pdf_bytes, error))
+            out.write(archive.close())
+    finally:
+        renderer.shutdown()
+
+    failed = sum(entry['status'] == 'failed' for entry in archive.manifest)
+    logger.info(f"Wrote {len(items) - failed} resumes to {args.output} in {time.perf_counter() - start:.1f}s"
+                f" ({failed} failed)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Synthetic LinkedIn "Save to PDF" exports for parser benchmarks.
+
+Pages follow the export layout: a narrow sidebar (contact, top skills,
+languages, certifications) written before the main column (name, headline,
+summary, experience, education), so text extraction yields the same order
+as a real export. Each PDF comes with the profile it was generated from.
+
+    python -m benchmarks.corpus --output /tmp/linkedin_corpus
+"""
+import argparse
+import json
+import random
+import textwrap
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+# Size name -> (positions, skills, certifications)
+CORPUS_SIZES = {
+    'small': (2, 5, 1),
+    'medium': (10, 25, 3),
+    'large': (60, 120, 10),
+    'huge': (300, 600, 40),
+}
+
+PAGE_RECT = fitz.paper_rect('letter')
+SIDEBAR_X = 36
+MAIN_X = 210
+TOP = 60
+BOTTOM = PAGE_RECT.height - 60
+LINE_HEIGHT = 13
+MAIN_WRAP = 80
+SIDEBAR_WRAP = 28
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries',
+             'Wayne Enterprises', 'Tyrell Systems', 'Cyberdyne', 'Soylent Data']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Staff Engineer', 'Engineering Manager',
+          'Developer Advocate', 'Data Scientist', 'Product Manager', 'Site Reliability Engineer']
+LOCATIONS = ['San Francisco, California', 'New York, New York, United States', 'Austin, Texas',
+             'London, England, United Kingdom', 'San Francisco Bay Area', 'Remote']
+SCHOOLS = ['Drexel University', 'Stanford University', 'University of Waterloo', 'MIT']
+DEGREES = ['Bachelor of Science - BS', 'Master of Science - MS', 'Bachelor of Arts - BA']
+FIELDS = ['Computer Engineering', 'Computer Science', 'Mathematics', 'Economics']
+SKILLS = ['Python', 'JavaScript', 'React.js', 'Go', 'Rust', 'PostgreSQL', 'Kubernetes', 'Terraform',
+          'GraphQL', 'Distributed Systems', 'Machine Learning', 'AWS', 'Next.js', 'TypeScript']
+LANGUAGES = ['English (Native or Bilingual)', 'French (Limited Working)', 'Arabic (Native or Bilingual)']
+ISSUERS = ['Amazon Web Services', 'Scrum.org', 'Google Cloud', 'Linux Foundation']
+BULLETS = [
+    'Built open source apps that have gotten 500k+ users & 10k+ GitHub stars',
+    'Cut p99 latency by 40% across the storage tier while halving cost',
+    'Led a team of 6 engineers shipping the v2 platform to enterprise customers',
+    'Migrated the monolith to services running on Kubernetes and Terraform',
+    'Ran 10 tech meetups and conferences (100k+ registrants) that sourced pipeline',
+]
+# Text that trips up naive patterns: regex metacharacters, all-caps lines
+# that look like entry headers, dates in the middle of prose, long lines
+HOSTILE_BULLETS = [
+    'Wrote C++/C# parsers for *.proto files, (a|b)+ patterns and [0-9]{3}? escapes \\d \\w $1',
+    'SOC 2 / HIPAA / GDPR COMPLIANCE PROGRAM',
+    'Grew revenue from $1.2M to $4.5M (+275%) between Jan 2020 - Dec 2021, see linkedin.com/in/x',
+    'Owned the roadmap; shipped features ' + 'and iterated quickly ' * 30,
+    'KEY RESULTS: 99.99% UPTIME, 3X THROUGHPUT, 0 SEV-1S',
+    'Contact: oncall@example.com, Experience, Education, Skills - all in one line',
+]
+
+def _date(rng: random.Random, year: int) -> str:
+    return f"{rng.choice(MONTHS)} {year}"
+
+def synthetic_profile(positions: int, skills: int, certifications: int, seed: int = 0,
+                      hostile: bool = False) -> Dict:
+    """A profile in the parser's output shape with the requested sizes."""
+    rng = random.Random(seed)
+    bullets = BULLETS + (HOSTILE_BULLETS if hostile else [])
+    name = "Zoë O'Brien-Núñez" if hostile else 'Jordan Rivera'
+    slug = f'jordan-rivera-{seed}'
+
+    experience = []
+    year = 2024
+    for i in range(positions):
+        start = year - rng.randint(1, 3)
+        experience.append({
+            'company': f'{rng.choice(COMPANIES)} {i}' if positions > len(COMPANIES) else rng.choice(COMPANIES),
+            'title': rng.choice(TITLES),
+            'location': rng.choice(LOCATIONS),
+            'dates': {'start': _date(rng, start), 'end': 'Present' if i == 0 else _date(rng, year)},
+            'description': '\n'.join(f'- {b}' for b in rng.sample(bullets, k=min(len(bullets), rng.randint(2, 5)))),
+        })
+        year = start
+
+    return {
+        'contact': {
+            'name': name,
+            'email': f'{slug}@example.com',
+            'location': rng.choice(LOCATIONS),
+            'linkedin_url': f'https://www.linkedin.com/in/{slug}',
+        },
+        'headline': f'{rng.choice(TITLES)} at {rng.choice(COMPANIES)}',
+        'summary': ' '.join(rng.choice(bullets) + '.' for _ in range(4)),
+        'experience': experience,
+        'education': [
+            {'school': rng.choice(SCHOOLS), 'degree': rng.choice(DEGREES), 'field': rng.choice(FIELDS),
+             'dates': {'start': str(2010 + i), 'end': str(2014 + i)}}
+            for i in range(max(1, positions // 20))
+        ],
+        'skills': [SKILLS[i % len(SKILLS)] + (f' {i // len(SKILLS)}' if i >= len(SKILLS) else '')
+                   for i in range(skills)],
+        'certifications': [
+            {'name': f'Certified Practitioner {i}' + (' (C++ & $SQL)' if hostile else ''),
+             'issuer': rng.choice(ISSUERS), 'date': _date(rng, 2020 + i % 4), 'expires': ''}
+            for i in range(certifications)
+        ],
+        'languages': LANGUAGES[:1 + seed % len(LANGUAGES)],
+    }
+
+def _wrap(text: str, width: int) -> List[str]:
+    return [line for paragraph in text.split('\n') for line in (textwrap.wrap(paragraph, width) or [''])]
+
+def _columns(profile: Dict) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """(text, font size) lines for the sidebar and the main column."""
+    contact = profile['contact']
+    sidebar = [('Contact', 13), (contact['email'], 10),
+               (contact['linkedin_url'].replace('https://', ''), 10), ('(LinkedIn)', 10),
+               ('Top Skills', 13)]
+    sidebar += [(line, 10) for skill in profile['skills'] for line in _wrap(skill, SIDEBAR_WRAP)]
+    sidebar += [('Languages', 13)] + [(lang, 10) for lang in profile['languages']]
+    if profile['certifications']:
+        sidebar.append(('Certifications', 13))
+        for cert in profile['certifications']:
+            sidebar += [(line, 10) for line in _wrap(cert['name'], SIDEBAR_WRAP)]
+            sidebar += [(cert['issuer'], 10), (f"Issued {cert['date']}", 10)]
+
+    main = [(contact['name'], 24), (profile['headline'], 12), (contact['location'], 10),
+            ('Summary', 15)]
+    main += [(line, 10) for line in _wrap(profile['summary'], MAIN_WRAP)]
+    main.append(('Experience', 15))
+    for exp in profile['experience']:
+        main += [(exp['company'], 12), (exp['title'], 11),
+                 (f"{exp['dates']['start']} - {exp['dates']['end']}", 10), (exp['location'], 10)]
+        main += [(line, 10) for line in _wrap(exp['description'], MAIN_WRAP)]
+    main.append(('Education', 15))
+    for edu in profile['education']:
+        main += [(edu['school'], 12),
+                 (f"{edu['degree']}, {edu['field']} · ({edu['dates']['start']} - {edu['dates']['end']})", 10)]
+    return sidebar, main
+
+def write_linkedin_pdf(profile: Dict, path: Optional[str] = None) -> bytes:
+    """Lay a profile out like a LinkedIn export; returns the PDF bytes and
+    also writes them to path when given."""
+    sidebar, main = _columns(profile)
+    per_page = int((BOTTOM - TOP) // LINE_HEIGHT)
+    pages = max(-(-len(sidebar) // per_page), -(-len(main) // per_page))
+
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        for x, lines in ((SIDEBAR_X, sidebar), (MAIN_X, main)):
+            y = TOP
+            for text, size in lines[number * per_page:(number + 1) * per_page]:
+                page.insert_text((x, y), text, fontsize=size, fontname='helv')
+                y += LINE_HEIGHT
+        page.insert_text((PAGE_RECT.width / 2 - 30, PAGE_RECT.height - 30),
+                         f'Page {number + 1} of {pages}', fontsize=9, fontname='helv')
+    pdf_bytes = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+
+    if path:
+        Path(path).write_bytes(pdf_bytes)
+    return pdf_bytes
+
+def build_corpus(sizes: Optional[List[str]] = None, seed: int = 0) -> Dict[str, Tuple[Dict, bytes]]:
+    """Generate one plain and one regex-hostile PDF per size, in memory."""
+    corpus = {}
+    for size in sizes or CORPUS_SIZES:
+        positions, skills, certifications = CORPUS_SIZES[size]
+        for hostile in (False, True):
+            name = f"{size}{'-hostile' if hostile else ''}"
+            profile = synthetic_profile(positions, skills, certifications, seed=seed, hostile=hostile)
+            corpus[name] = (profile, write_linkedin_pdf(profile))
+    return corpus
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', required=True, help='directory for the PDFs and their source profiles')
+    parser.add_argument('--sizes', nargs='+', default=list(CORPUS_SIZES), choices=list(CORPUS_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    for name, (profile, pdf_bytes) in build_corpus(args.sizes, args.seed).items():
+        (output / f'{name}.pdf').write_bytes(pdf_bytes)
+        (output / f'{name}.json').write_text(json.dumps(profile, indent=2, ensure_ascii=False))
+        print(f"{name:<16}{len(pdf_bytes) / 1024:>10.1f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Concurrent-request load test against running API servers.
+
+Start the servers to compare, then point the test at each by name:
+
+    python app.py                                   # Flask dev server on :5000
+    WEB_CONCURRENCY=2 PORT=8000 python serve.py     # ASGI workers on :8000
+    python -m benchmarks.load_test --target flask=http://127.0.0.1:5000 \\
+        --target asgi=http://127.0.0.1:8000 --concurrency 32 --requests 400
+
+The generate scenario uploads one profile per target and then requests
+resumes for it; with --vary-theme every request uses a new accent colour,
+so each one misses the render cache and renders. The parse scenario
+uploads a different synthetic PDF per request, so each one is parsed and
+queued for storing.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.corpus import synthetic_profile, write_linkedin_pdf
+
+def _pdf(seed: int) -> bytes:
+    return write_linkedin_pdf(synthetic_profile(positions=5, skills=15, certifications=2, seed=seed))
+
+async def _upload(client: httpx.AsyncClient, url: str, pdf_bytes: bytes) -> httpx.Response:
+    return await client.post(f'{url}/api/parse-linkedin', files={'file': ('profile.pdf', pdf_bytes, 'application/pdf')})
+
+async def _stored_profile(client: httpx.AsyncClient, url: str) -> str:
+    """Upload a profile and wait for its store job to finish."""
+    response = await _upload(client, url, _pdf(seed=int(time.time())))
+    response.raise_for_status()
+    body = response.json()
+    while body.get('job_id'):
+        job = (await client.get(f"{url}/api/jobs/{body['job_id']}")).json()
+        if job['status'] == 'failed':
+            raise RuntimeError(f"Storing the test profile failed: {job['error']}")
+        if job['status'] == 'succeeded':
+            break
+        await asyncio.sleep(0.1)
+    return body['profile_id']
+
+async def run_target(url: str, scenario: str, requests: int, concurrency: int,
+                     engine: str, vary_theme: bool) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        if scenario == 'generate':
+            profile_id = await _stored_profile(client, url)
+        else:
+            pdfs = [_pdf(seed) for seed in range(requests)]
+
+        latencies: List[float] = []
+        statuses: Dict[int, int] = {}
+        counter = iter(range(requests))
+
+        async def one(i: int) -> Tuple[float, int]:
+            start = time.perf_counter()
+            if scenario == 'generate':
+                options = {'engine': engine}
+                if vary_theme:
+                    options['accent_color'] = f'{i % 256},{i // 256 % 256},{time.time_ns() % 256}'
+                response = await client.post(f'{url}/api/generate-resume/{profile_id}', json=options)
+            else:
+                response = await _upload(client, url, pdfs[i])
+            return time.perf_counter() - start, response.status_code
+
+        async def worker() -> None:
+            for i in counter:
+                try:
+                    seconds, status = await one(i)
+                except httpx.HTTPError:
+                    seconds, status = 0.0, 0  # Connection refused, reset or timed out
+                latencies.append(seconds)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+
+    ok = sorted(seconds for seconds in latencies if seconds)
+    quantiles = statistics.quantiles(ok, n=100) if len(ok) > 1 else ok * 99
+    return {
+        'wall': wall,
+        'throughput': statuses.get(200, 0) / wall,
+        'p50': quantiles[49] if ok else 0.0,
+        'p95': quantiles[94] if ok else 0.0,
+        'p99': quantiles[98] if ok else 0.0,
+        'statuses': statuses,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', required=True,
+                        help='name=base URL of a running server; repeat to compare')
+    parser.add_argument('--scenario', choices=['generate', 'parse'], default='generate')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--engine', default='pymupdf', help='rendering engine for the generate scenario')
+    parser.add_argument('--vary-theme', action='store_true', help='make every generate request render')
+    args = parser.parse_args()
+
+    print(f"{args.scenario}: {args.requests} requests, {args.concurrency} concurrent")
+    print(f"{'target':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for target in args.target:
+        name, _, url = target.partition('=')
+        result = asyncio.run(run_target(url.rstrip('/'), args.scenario, args.requests,
+                                        args.concurrency, args.engine, args.vary_theme))
+        print(f"{name:<10} {result['throughput']:>8.1f} {result['p50'] * 1000:>8.1f} "
+              f"{result['p95'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f}  {result['statuses']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Field accuracy and speed of the experience, education and certification parsers.
+
+Synthetic documents are scored against the profiles they were generated
+from; the bundled hassan_profile.pdf against the fields below, checked by
+hand against the PDF. Exits with status 1 if any document scores below
+--min-accuracy. Multi-page synthetic documents repeat the sidebar on every
+page, and its text lands between experience entries, so they stay a
+little under 100%. Run from the backend directory:
+
+    python -m benchmarks.parser_accuracy --sizes small medium large
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.corpus import CORPUS_SIZES, build_corpus
+from linkedinparser import LinkedInPDFParser
+
+HASSAN_PDF = Path(__file__).resolve().parents[2] / 'hassan_profile.pdf'
+
+def _job(company, title, start, end, location):
+    return {'company': company, 'title': title, 'location': location, 'dates': {'start': start, 'end': end}}
+
+# Descriptions are left out: the export's wrapping of the last paragraph
+# is ambiguous, so only the structured fields are scored
+HASSAN_EXPECTED = {
+    'experience': [
+        _job('Together AI', 'Senior Manager, Developer Relations', 'January 2024', 'Present', 'San Francisco Bay Area'),
+        _job('Vercel', 'Senior Developer Advocate', 'August 2022', 'October 2023', 'New York City Metropolitan Area'),
+        _job('Vercel', 'Developer Advocate', 'September 2021', 'August 2022', 'San Francisco Bay Area'),
+        _job('Fig', 'Developer Advocate', 'July 2021', 'September 2021', 'San Francisco Bay Area'),
+        _job('Sleek', 'Software Engineer', 'April 2020', 'June 2020', 'San Francisco Bay Area'),
+        _job('UltraShock Gaming LLC', 'Founder & CEO', 'October 2015', 'March 2020', 'Pennsylvania, United States'),
+    ],
+    'education': [
+        {'school': 'Drexel University', 'degree': 'Bachelor of Science - BS', 'field': 'Computer Engineering',
+         'dates': {'start': '2016', 'end': '2021'}},
+    ],
+    'certifications': [
+        {'name': 'Professional Scrum Master I', 'issuer': '', 'date': '', 'expires': ''},
+    ],
+}
+
+SECTIONS = ('experience', 'education', 'certifications')
+
+def _flatten(entry: Dict, prefix: str = '') -> Dict[str, str]:
+    fields = {}
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            fields.update(_flatten(value, f'{key}.'))
+        else:
+            fields[prefix + key] = ' '.join(str(value).split())
+    return fields
+
+def _short(value, width: int = 60):
+    return value[:width] + '...' if value and len(value) > width else value
+
+def score(expected: List[Dict], parsed: List[Dict]) -> Tuple[int, int, List[str]]:
+    """(matching fields, expected fields, mismatches); extra or missing
+    entries count every field of theirs as wrong."""
+    correct, total, mismatches = 0, 0, []
+    for i in range(max(len(expected), len(parsed))):
+        want = _flatten(expected[i]) if i < len(expected) else {}
+        got = _flatten(parsed[i]) if i < len(parsed) else {}
+        for key in want.keys() | (got.keys() if i >= len(expected) else set()):
+            total += 1
+            if want.get(key) == got.get(key):
+                correct += 1
+            else:
+                mismatches.append(f"[{i}].{key}: expected {_short(want.get(key))!r}, got {_short(got.get(key))!r}")
+    return correct, total, mismatches
+
+def _best_ms(func, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def documents(sizes: List[str]) -> Dict[str, Tuple[Dict, bytes]]:
+    docs = {name: (profile, pdf_bytes) for name, (profile, pdf_bytes) in build_corpus(sizes).items()}
+    if HASSAN_PDF.exists():
+        docs['hassan_profile.pdf'] = (HASSAN_EXPECTED, HASSAN_PDF.read_bytes())
+    return docs
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium', 'large'], choices=list(CORPUS_SIZES))
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--min-accuracy', type=float, default=0.95)
+    parser.add_argument('--verbose', action='store_true', help='list every mismatched field')
+    args = parser.parse_args()
+
+    failed = []
+    print(f"{'document':<20}" + ''.join(f"{section:>16}" for section in SECTIONS) + f"{'entry ms':>10}")
+    for name, (expected, pdf_bytes) in documents(args.sizes).items():
+        pdf_parser = LinkedInPDFParser(pdf_bytes)
+        parsed = pdf_parser.parse()
+        row, problems, correct_all, total_all = f"{name:<20}", [], 0, 0
+        for section in SECTIONS:
+            correct, total, mismatches = score(expected.get(section, []), parsed.get(section, []))
+            correct_all, total_all = correct_all + correct, total_all + total
+            problems += [f"  {section}{m}" for m in mismatches]
+            row += f"{f'{correct}/{total}':>16}"
+        ms = _best_ms(lambda: (pdf_parser.parse_experience(), pdf_parser.parse_education(),
+                               pdf_parser.parse_certifications()), args.runs)
+        print(f"{row}{ms:>10.3f}")
+        if args.verbose:
+            print('\n'.join(problems))
+        if total_all and correct_all / total_all < args.min_accuracy:
+            failed.append(name)
+
+    if failed:
+        print(f"\nBelow {args.min_accuracy:.0%} field accuracy: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Parser and .tex generation benchmarks over the synthetic corpus.
+
+Every run is saved under benchmarks/results/ and compared against a
+baseline run; any benchmark whose best time slows down by more than its
+tolerance fails the run with exit status 1. Times are compared relative to
+a fixed calibration workload timed in the same run, and best-of-N rather
+than the median, so a busy or throttled machine does not read as a
+regression. Baselines are only meaningful
+on the machine that recorded them, so record one before changing code:
+
+    python -m benchmarks.parser_suite --save-baseline
+    python -m benchmarks.parser_suite            # compare against it
+"""
+import argparse
+import gc
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import CORPUS_SIZES, build_corpus
+from benchmarks.render_engines import THEMES
+from latexgenerator import ResumeGenerator, _cached_fragment
+from linkedinparser import LinkedInPDFParser, profile_to_text
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+BASELINE = RESULTS_DIR / 'baseline.json'
+
+# Allowed slowdown of the best time before a benchmark counts as a regression;
+# loose enough for shared machines, tight enough for accidental quadratic work
+DEFAULT_TOLERANCE = 0.5
+TOLERANCES = {
+    'extract_text': 0.6,  # Dominated by MuPDF, which is noisier run to run
+}
+# Differences below this many seconds are treated as noise
+NOISE_FLOOR = 0.0002
+
+def _parsed(pdf_bytes: bytes) -> LinkedInPDFParser:
+    parser = LinkedInPDFParser(pdf_bytes)
+    parser.extract_text()
+    parser.identify_sections()
+    return parser
+
+def _cold_tex(profile: Dict) -> str:
+    _cached_fragment.cache_clear()
+    return ResumeGenerator(profile, THEMES['modern']).to_tex()
+
+def benchmarks_for(profile: Dict, pdf_bytes: bytes) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable for one corpus document."""
+    parser = _parsed(pdf_bytes)
+    parsed = parser.parse()
+    return {
+        'extract_text': lambda: LinkedInPDFParser(pdf_bytes).extract_text(),
+        'identify_sections': parser.identify_sections,
+        'parse_contact': parser.parse_contact,
+        'parse_experience': parser.parse_experience,
+        'parse_education': parser.parse_education,
+        'parse_certifications': parser.parse_certifications,
+        'profile_to_text': lambda: profile_to_text(parsed),
+        'tex_generation': lambda: _cold_tex(profile),
+    }
+
+def _loops(func: Callable[[], object], min_seconds: float) -> int:
+    """Calls per sample so that fast benchmarks still span min_seconds."""
+    start = time.perf_counter()
+    func()
+    return max(1, int(min_seconds / max(time.perf_counter() - start, 1e-7)))
+
+def _calibration_workload() -> None:
+    """Fixed mix of regex, string and JSON work similar to the parser's."""
+    text = '\n'.join(f'Line {i} of Company {i % 7}, Jan {2000 + i % 20} - Present' for i in range(400))
+    for line in text.split('\n'):
+        re.search(r'((?:Jan|Feb|Mar)\s+\d{4})\s*-\s*(Present)', line)
+    json.loads(json.dumps(text.split('\n')))
+
+def run_suite(sizes: List[str], runs: int, only: Optional[List[str]] = None,
+              min_seconds: float = 0.02) -> Dict:
+    """Time every benchmark on every corpus document.
+
+    Samples are taken in interleaved rounds (one sample of each benchmark
+    per round), so a slow stretch on the machine spreads over all of them
+    instead of ruining one benchmark's samples.
+    """
+    benchmarks = {'calibration': _calibration_workload}
+    for doc_name, (profile, pdf_bytes) in build_corpus(sizes).items():
+        for bench_name, func in benchmarks_for(profile, pdf_bytes).items():
+            if not only or bench_name in only:
+                benchmarks[f'{bench_name}/{doc_name}'] = func
+    loops = {key: _loops(func, min_seconds) for key, func in benchmarks.items()}
+
+    samples = {key: [] for key in benchmarks}
+    for _ in range(runs):
+        for key, func in benchmarks.items():
+            # Like timeit, keep collector pauses out of the samples
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for _ in range(loops[key]):
+                    func()
+                samples[key].append((time.perf_counter() - start) / loops[key])
+            finally:
+                gc.enable()
+
+    results = {
+        key: {'median': statistics.median(times), 'min': min(times), 'runs': runs, 'loops': loops[key]}
+        for key, times in samples.items()
+    }
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'calibration': results.pop('calibration')['min'],
+        'results': results,
+    }
+
+def compare(run: Dict, baseline: Dict, tolerance: Optional[float] = None) -> List[str]:
+    """Print the run next to the baseline and return the regressed benchmark keys."""
+    regressions = []
+    # Express baseline times in this run's machine speed
+    scale = run['calibration'] / baseline['calibration'] if baseline.get('calibration') else 1.0
+    print(f"Calibration {run['calibration'] * 1000:.3f} ms (baseline scaled by {scale:.2f})")
+    print(f"{'benchmark':<42}{'median ms':>12}{'min ms':>10}{'baseline':>10}{'change':>9}")
+    for key, result in run['results'].items():
+        best = result['min']
+        base = baseline['results'].get(key)
+        row = f"{key:<42}{result['median'] * 1000:>12.3f}{best * 1000:>10.3f}"
+        if base is None:
+            print(f"{row}{'-':>10}{'new':>9}")
+            continue
+
+        expected = base['min'] * scale
+        change = best / expected - 1 if expected else 0.0
+        allowed = tolerance if tolerance is not None else TOLERANCES.get(key.split('/')[0], DEFAULT_TOLERANCE)
+        regressed = change > allowed and best - expected > NOISE_FLOOR
+        if regressed:
+            regressions.append(key)
+        print(f"{row}{expected * 1000:>10.3f}{change:>+9.0%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=list(CORPUS_SIZES), choices=list(CORPUS_SIZES))
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--only', nargs='+', help='benchmark names to run (e.g. parse_experience)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--tolerance', type=float, help='override every per-benchmark tolerance')
+    parser.add_argument('--save-baseline', action='store_true', help='record this run as the new baseline')
+    args = parser.parse_args()
+
+    run = run_suite(args.sizes, args.runs, args.only)
+    RESULTS_DIR.mkdir(exist_ok=True)
+    run_path = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    run_path.write_text(json.dumps(run, indent=2))
+
+    if args.save_baseline or not args.baseline.exists():
+        compare(run, {'results': {}})
+        if args.save_baseline:
+            args.baseline.write_text(json.dumps(run, indent=2))
+            print(f"\nSaved baseline to {args.baseline}")
+        else:
+            print(f"\nNo baseline at {args.baseline}; saved this run to {run_path}")
+        return
+
+    regressions = compare(run, json.loads(args.baseline.read_text()), args.tolerance)
+    print(f"\nSaved run to {run_path}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""CPU time and memory of the profile model against the old dict pipeline.
+
+The old pipeline turned the parser's dataclasses into dicts with asdict
+and stored them with json.dumps/json.loads; the new one keeps typed
+Profile objects and stores the compact rows from encode_profile. Run from
+the backend directory:
+
+    python -m benchmarks.profile_model --sizes large huge --runs 50
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import CORPUS_SIZES, build_corpus
+from linkedinparser import LinkedInPDFParser
+from profilemodel import Profile, decode_profile, encode_profile, json_dumps, orjson
+
+def _best_ms(func: Callable, runs: int) -> float:
+    gc.disable()
+    try:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+    finally:
+        gc.enable()
+
+def _retained_bytes(build: Callable, copies: int) -> float:
+    """Bytes held per object when `copies` objects from build() are kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    kept = [build() for _ in range(copies)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / copies
+
+def _asdict_profile(profile: Profile) -> Dict:
+    """What LinkedInPDFParser.parse used to build."""
+    result = {
+        'contact': asdict(profile.contact),
+        'summary': profile.summary,
+        'experience': [asdict(exp) for exp in profile.experience],
+        'education': [asdict(edu) for edu in profile.education],
+        'skills': profile.skills,
+        'certifications': [asdict(cert) for cert in profile.certifications],
+        'languages': profile.languages,
+        'other': profile.other,
+    }
+    return {k: v for k, v in result.items() if v}
+
+def benchmark(pdf_bytes: bytes, runs: int, copies: int) -> List[tuple]:
+    profile = LinkedInPDFParser(pdf_bytes).parse_profile()
+    data = profile.to_dict()
+    old_blob = json.dumps(data)
+    new_blob = encode_profile(profile)
+    return [
+        ('to dict ms', _best_ms(lambda: _asdict_profile(profile), runs), _best_ms(profile.to_dict, runs)),
+        ('store encode ms', _best_ms(lambda: json.dumps(data), runs), _best_ms(lambda: encode_profile(profile), runs)),
+        ('store decode ms', _best_ms(lambda: json.loads(old_blob), runs), _best_ms(lambda: decode_profile(new_blob), runs)),
+        ('decode + dict ms', _best_ms(lambda: json.loads(old_blob), runs),
+         _best_ms(lambda: decode_profile(new_blob).to_dict(), runs)),
+        ('API response ms', _best_ms(lambda: json.dumps(data, sort_keys=True), runs),
+         _best_ms(lambda: json_dumps(data, sort_keys=True), runs)),
+        ('stored KiB', len(old_blob.encode()) / 1024, len(new_blob) / 1024),
+        ('in memory KiB', _retained_bytes(lambda: json.loads(old_blob), copies) / 1024,
+         _retained_bytes(lambda: decode_profile(new_blob), copies) / 1024),
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['large', 'huge'], choices=list(CORPUS_SIZES))
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--copies', type=int, default=20, help='profiles held for the memory figure')
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if orjson is not None else 'no (stdlib json)'}")
+    for name, (_, pdf_bytes) in build_corpus(args.sizes).items():
+        print(f"\n{name}")
+        print(f"{'':<18} {'dicts':>10} {'model':>10} {'saving':>8}")
+        for label, old, new in benchmark(pdf_bytes, args.runs, args.copies):
+            print(f"{label:<18} {old:>10.3f} {new:>10.3f} {1 - new / old:>8.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Side-by-side render latency for the LaTeX and PyMuPDF engines.
+
+Run from the backend directory:
+
+    python -m benchmarks.render_engines --positions 5 20 --runs 5
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+from latexgenerator import ResumeTheme
+from renderservice import ENGINES
+
+THEMES = {
+    'modern': ResumeTheme(primary_color='0,0,0', accent_color='100,100,100', font_family='helvetica',
+                          section_style='modern', layout='modern', font_size='11pt'),
+    'classic': ResumeTheme(primary_color='50,50,50', accent_color='150,150,150', font_family='times',
+                           section_style='classic', layout='traditional', font_size='12pt'),
+    'minimal': ResumeTheme(primary_color='0,0,0', accent_color='200,200,200', font_family='helvetica',
+                           section_style='basic', layout='traditional', font_size='10pt'),
+}
+
+def sample_profile(positions: int) -> Dict:
+    """A parsed profile with the given number of experience entries."""
+    return {
+        'contact': {
+            'name': 'Jane Doe',
+            'email': 'jane@example.com',
+            'location': 'San Francisco, CA',
+            'linkedin_url': 'https://www.linkedin.com/in/jane-doe',
+        },
+        'summary': 'Engineer building data platforms and developer tooling.',
+        'experience': [
+            {
+                'company': f'Company {i}',
+                'title': 'Senior Software Engineer',
+                'location': 'San Francisco, CA',
+                'dates': {'start': 'Jan 2020', 'end': 'Present'},
+                'description': 'Led the storage team\nCut p99 latency by 40%\nMentored four engineers',
+            }
+            for i in range(positions)
+        ],
+        'education': [
+            {'school': 'Stanford University', 'degree': "Master's", 'field': 'Computer Science',
+             'dates': {'start': 'Sep 2015', 'end': 'Jun 2017'}},
+        ],
+        'skills': ['Python', 'Go', 'Distributed Systems', 'PostgreSQL'],
+        'certifications': [
+            {'name': 'AWS Solutions Architect', 'issuer': 'Amazon Web Services', 'date': 'Jan 2023', 'expires': ''},
+        ],
+    }
+
+def time_engine(engine: str, profile: Dict, theme: ResumeTheme, runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        ENGINES[engine](profile, theme).generate_bytes()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--positions', type=int, nargs='+', default=[3, 20])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    args = parser.parse_args()
+
+    print(f"{'engine':<10}{'theme':<10}{'positions':>10}{'median ms':>12}{'min ms':>10}")
+    for positions in args.positions:
+        profile = sample_profile(positions)
+        for theme_name, theme in THEMES.items():
+            for engine in args.engines:
+                try:
+                    timings = time_engine(engine, profile, theme, args.runs)
+                except Exception as e:
+                    print(f"{engine:<10}{theme_name:<10}{positions:>10}  unavailable: {e}")
+                    continue
+                print(f"{engine:<10}{theme_name:<10}{positions:>10}"
+                      f"{statistics.median(timings) * 1000:>12.1f}{min(timings) * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
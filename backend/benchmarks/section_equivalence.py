@@ -0,0 +1,64 @@
+"""Check segment_sections against the regex sweep it replaced.
+
+Each fixtures/sections/<name>.txt is extracted export text. Its .json
+holds the sections the old identify_sections (seven re.search scans plus
+a re.sub of the joined contents) produced for it, or the error it raised,
+along with the sections that are meant to differ and why. Every other
+section must match exactly. Exits with status 1 on any unlisted
+difference. Run from the backend directory:
+
+    python -m benchmarks.section_equivalence --verbose
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from linkedinparser import segment_sections
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures' / 'sections'
+
+def _short(value: str, width: int = 60) -> str:
+    return value[:width] + '...' if len(value) > width else value
+
+def check(text: str, expected: dict):
+    """(matching sections, intended differences, unexpected differences)"""
+    sections = segment_sections(text)
+    baseline = expected['baseline']
+    intended = expected['intended_differences']
+    if 'error' in baseline:
+        return [], [f"all: {intended['*']}"], []
+
+    matching, documented, unexpected = [], [], []
+    for section, old in baseline.items():
+        new = sections.get(section, '')
+        if new == old:
+            matching.append(section)
+        elif section in intended:
+            documented.append(f"{section}: {intended[section]}")
+        else:
+            unexpected.append(f"{section}: expected {_short(old)!r}, got {_short(new)!r}")
+    return matching, documented, unexpected
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--verbose', action='store_true', help='explain each intended difference')
+    args = parser.parse_args()
+
+    failed = []
+    print(f"{'fixture':<20}{'match':>8}{'intended':>10}{'unexpected':>12}")
+    for path in sorted(FIXTURES.glob('*.txt')):
+        expected = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+        matching, documented, unexpected = check(path.read_text(encoding='utf-8'), expected)
+        print(f"{path.stem:<20}{len(matching):>8}{len(documented):>10}{len(unexpected):>12}")
+        for line in (documented if args.verbose else []) + unexpected:
+            print(f"  {line}")
+        if unexpected:
+            failed.append(path.stem)
+
+    if failed:
+        print(f"\nUnexpected differences from the old segmenter: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
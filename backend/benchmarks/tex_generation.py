@@ -0,0 +1,43 @@
+"""LaTeX source build time with a cold vs. warm section fragment cache.
+
+Each run switches through every theme, the way a user previewing themes
+does; only the .tex is built, so no TeX installation is needed.
+
+    python -m benchmarks.tex_generation --positions 5 50 --runs 20
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+from latexgenerator import ResumeGenerator, _cached_fragment
+from benchmarks.render_engines import THEMES, sample_profile
+
+def time_build(profile: Dict, runs: int, warm: bool) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        for theme in THEMES.values():
+            if not warm:
+                _cached_fragment.cache_clear()
+            start = time.perf_counter()
+            ResumeGenerator(profile, theme).to_tex()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--positions', type=int, nargs='+', default=[5, 50])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'positions':>10}{'cache':>8}{'median ms':>12}{'min ms':>10}")
+    for positions in args.positions:
+        profile = sample_profile(positions)
+        for warm in (False, True):
+            timings = time_build(profile, args.runs, warm)
+            print(f"{positions:>10}{'warm' if warm else 'cold':>8}"
+                  f"{statistics.median(timings) * 1000:>12.2f}{min(timings) * 1000:>10.2f}")
+        print(f"{'':>10}{'info':>8}  {_cached_fragment.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from linkedinparser import LinkedInPDFParser, store_profiles_in_vector_db
+
+logger = logging.getLogger(__name__)
+
+def collect_pdfs(sources: Iterable[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of PDF paths."""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            paths.update(str(p) for p in Path(source).rglob('*.pdf'))
+        else:
+            paths.update(p for p in glob.glob(source, recursive=True) if p.lower().endswith('.pdf'))
+    return sorted(os.path.abspath(p) for p in paths)
+
+def completed_files(output_path: str, store: bool = False) -> Dict[str, Optional[str]]:
+    """Files that already have a successful record in the output JSONL,
+    mapped to the profile ID they were last stored under (None if never).
+    With store, a record only counts once its profile was stored."""
+    done = {}
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if 'profile' not in record:
+                continue
+            if record.get('stored'):
+                done[record['file']] = record['profile_id']
+            elif not store:
+                done.setdefault(record['file'], None)
+    return done
+
+def parse_file(path: str) -> Dict:
+    """Parse a single PDF; runs inside a worker process."""
+    start = time.perf_counter()
+    try:
+        profile = LinkedInPDFParser(path).parse()
+        return {'file': path, 'profile': profile, 'seconds': time.perf_counter() - start}
+    except Exception as e:
+        return {'file': path, 'error': str(e), 'seconds': time.perf_counter() - start}
+
+def store_records(records: List[Dict]) -> None:
+    """Embed and upsert parsed records in one batch, tagging each with its ID.
+    Records that already carry a profile ID are stored under it again."""
+    for record in records:
+        record['profile_id'] = record.get('profile_id') or f"profile_{uuid.uuid4()}"
+    stored = store_profiles_in_vector_db([(r['profile'], r['profile_id']) for r in records])
+    for record in records:
+        record['stored'] = stored[record['profile_id']]
+
+def ingest(sources: Iterable[str], output_path: str, workers: int = None,
+           store: bool = False, store_batch_size: int = 64, update: bool = False) -> Dict:
+    """Parse every PDF across a process pool, appending results as JSONL.
+
+    Files already parsed successfully in output_path (and, with store,
+    stored) are skipped, so an interrupted run can be restarted with the
+    same arguments. With store, parsed profiles are also written to the
+    vector database in batches. With update, those files are parsed again
+    and stored under their earlier profile IDs; only the sections that
+    changed are re-embedded.
+    """
+    pdfs = collect_pdfs(sources)
+    done = completed_files(output_path, store)
+    pending = pdfs if update else [p for p in pdfs if p not in done]
+    logger.info(f"Found {len(pdfs)} PDFs, {len(done)} already ingested, {len(pending)} to parse")
+
+    summary = {'parsed': 0, 'failed': 0, 'skipped': len(pdfs) - len(pending)}
+    if not pending:
+        return summary
+
+    def write(records: List[Dict]) -> None:
+        for record in records:
+            out.write(json.dumps(record) + '\n')
+        out.flush()
+
+    workers = workers or os.cpu_count() or 1
+    buffered = []
+    with open(output_path, 'a') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_file, path) for path in pending]
+        for future in as_completed(futures):
+            record = future.result()
+
+            if 'error' in record:
+                summary['failed'] += 1
+                logger.error(f"Failed {record['file']} in {record['seconds']:.2f}s: {record['error']}")
+                write([record])
+                continue
+
+            summary['parsed'] += 1
+            logger.info(f"Parsed {record['file']} in {record['seconds']:.2f}s")
+            if done.get(record['file']):
+                record['profile_id'] = done[record['file']]
+            if not store:
+                write([record])
+                continue
+
+            buffered.append(record)
+            if len(buffered) >= store_batch_size:
+                store_records(buffered)
+                write(buffered)
+                buffered = []
+
+        if buffered:
+            store_records(buffered)
+            write(buffered)
+
+    return summary
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk-parse LinkedIn PDF exports into JSONL.')
+    parser.add_argument('sources', nargs='+', help='Directories or glob patterns of PDFs')
+    parser.add_argument('-o', '--output', required=True, help='JSONL file to append results to')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Worker processes (defaults to the number of CPU cores)')
+    parser.add_argument('--store', action='store_true',
+                        help='Also embed and upsert parsed profiles into the vector database')
+    parser.add_argument('--store-batch-size', type=int, default=64,
+                        help='Profiles per embedding/upsert batch when storing')
+    parser.add_argument('--update', action='store_true',
+                        help='Re-parse files already ingested, storing them under their existing profile IDs')
+    args = parser.parse_args(argv)
+
+    summary = ingest(args.sources, args.output, args.workers, args.store, args.store_batch_size, args.update)
+    logger.info(f"Done: {summary['parsed']} parsed, {summary['failed']} failed, {summary['skipped']} skipped")
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+from pinecone import Pinecone
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables before the shared config is read
+load_dotenv()
+
+@dataclass
+class ClientConfig:
+    """Connection settings for the shared OpenAI and Pinecone clients"""
+    index_name: str = 'linkedin-profiles'
+    openai_timeout: float = 30.0
+    openai_max_retries: int = 2
+    openai_max_connections: int = 20
+    openai_max_keepalive: int = 10
+    pinecone_pool_threads: int = 4
+
+    @classmethod
+    def from_env(cls) -> 'ClientConfig':
+        defaults = cls()
+        return cls(
+            index_name=os.getenv('PINECONE_INDEX', defaults.index_name),
+            openai_timeout=float(os.getenv('OPENAI_TIMEOUT', defaults.openai_timeout)),
+            openai_max_retries=int(os.getenv('OPENAI_MAX_RETRIES', defaults.openai_max_retries)),
+            openai_max_connections=int(os.getenv('OPENAI_MAX_CONNECTIONS', defaults.openai_max_connections)),
+            openai_max_keepalive=int(os.getenv('OPENAI_MAX_KEEPALIVE', defaults.openai_max_keepalive)),
+            pinecone_pool_threads=int(os.getenv('PINECONE_POOL_THREADS', defaults.pinecone_pool_threads)),
+        )
+
+class ClientRegistry:
+    """Process-wide, lazily built OpenAI/Pinecone clients.
+
+    Clients are created once under a lock and then shared across threads so
+    TLS sessions and connection pools are reused between requests. A forked
+    child notices the PID change and builds its own clients rather than
+    sharing sockets with its parent.
+
+    The asyncio clients (async_openai, async_index) are bound to the event
+    loop that first used them and are rebuilt if called from another loop.
+    """
+
+    def __init__(self, config: Optional[ClientConfig] = None):
+        self.config = config or ClientConfig.from_env()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._openai = None
+        self._pinecone = None
+        self._index = None
+        self._loop = None
+        self._async_openai = None
+        self._async_index = None
+
+    def _check_fork(self) -> None:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._openai = self._pinecone = self._index = None
+            self._loop = self._async_openai = self._async_index = None
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop  # Any installed async clients belong to the first loop
+        elif self._loop is not loop:
+            self._loop = loop
+            self._async_openai = self._async_index = None
+
+    def openai(self) -> OpenAI:
+        with self._lock:
+            self._check_fork()
+            if self._openai is None:
+                self._openai = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    timeout=self.config.openai_timeout,
+                    max_retries=self.config.openai_max_retries,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.config.openai_max_connections,
+                            max_keepalive_connections=self.config.openai_max_keepalive
+                        ),
+                        timeout=self.config.openai_timeout
+                    )
+                )
+            return self._openai
+
+    def pinecone(self) -> Pinecone:
+        with self._lock:
+            self._check_fork()
+            if self._pinecone is None:
+                self._pinecone = Pinecone(
+                    api_key=os.getenv("PINECONE_API_KEY"),
+                    pool_threads=self.config.pinecone_pool_threads
+                )
+            return self._pinecone
+
+    def index(self) -> Any:
+        with self._lock:
+            self._check_fork()
+            if self._index is not None:
+                return self._index
+        pc = self.pinecone()
+        with self._lock:
+            if self._index is None:
+                self._index = pc.Index(self.config.index_name, pool_threads=self.config.pinecone_pool_threads)
+            return self._index
+
+    def async_openai(self) -> AsyncOpenAI:
+        """OpenAI client for the running event loop."""
+        with self._lock:
+            self._check_fork()
+            self._check_loop()
+            if self._async_openai is None:
+                self._async_openai = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    timeout=self.config.openai_timeout,
+                    max_retries=self.config.openai_max_retries,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=self.config.openai_max_connections,
+                            max_keepalive_connections=self.config.openai_max_keepalive
+                        ),
+                        timeout=self.config.openai_timeout
+                    )
+                )
+            return self._async_openai
+
+    def async_index(self) -> Any:
+        """Pinecone asyncio index client for the running event loop."""
+        with self._lock:
+            self._check_fork()
+            self._check_loop()
+            if self._async_index is not None:
+                return self._async_index
+            loop = self._loop
+        # Resolving the index host is a blocking control-plane call; done once per loop
+        pc = self.pinecone()
+        host = pc.describe_index(self.config.index_name).host
+        with self._lock:
+            if self._async_index is None and self._loop is loop:
+                self._async_index = pc.IndexAsyncio(host=host)
+            return self._async_index
+
+    async def aclose(self) -> None:
+        """Close the asyncio clients, e.g. when the ASGI server shuts down."""
+        with self._lock:
+            async_openai, async_index = self._async_openai, self._async_index
+            self._loop = self._async_openai = self._async_index = None
+        if async_openai is not None:
+            await async_openai.close()
+        if async_index is not None:
+            await async_index.close()
+
+    def warm(self) -> None:
+        """Build every client up front so the first request skips setup."""
+        try:
+            self.openai()
+            self.index()
+            logger.info("OpenAI and Pinecone clients ready")
+        except Exception as e:
+            logger.warning(f"Could not warm API clients: {e}")
+
+    def install(self, openai: Any = None, pinecone: Any = None, index: Any = None,
+                async_openai: Any = None, async_index: Any = None) -> None:
+        """Swap in pre-built (e.g. fake) clients, mainly for tests. Async
+        clients are installed for whichever event loop uses them first."""
+        with self._lock:
+            self._pid = os.getpid()
+            if openai is not None:
+                self._openai = openai
+            if pinecone is not None:
+                self._pinecone = pinecone
+            if index is not None:
+                self._index = index
+            if async_openai is not None or async_index is not None:
+                self._loop = None
+                self._async_openai = async_openai
+                self._async_index = async_index
+
+    def reset(self) -> None:
+        """Drop all clients; they are rebuilt on next use."""
+        with self._lock:
+            self._openai = self._pinecone = self._index = None
+            self._loop = self._async_openai = self._async_index = None
+
+clients = ClientRegistry()
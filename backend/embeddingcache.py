@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process per cache directory
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """On-disk cache of embeddings keyed by (model, SHA-256 of the text).
+
+    Vectors live in fixed-size float32 slots in vectors.f32, read through a
+    memory map; index.jsonl is an append-only log of [key, slot] lines,
+    with [null, slot] marking a slot freed before it is overwritten. Once
+    max_bytes worth of slots exist, the least recently used entry's slot is
+    reused. Writers take a file lock and replay whatever other processes
+    appended first, so several workers can share one directory.
+    """
+
+    def __init__(self, directory: str, dimension: int = 1536, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.capacity = max(1, max_bytes // (dimension * 4))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / 'vectors.f32'
+        self._index_path = self.directory / 'index.jsonl'
+        self._lock_path = self.directory / '.lock'
+        self._log_file = None
+        self._reset()
+        with self._lock:
+            self._catch_up()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f'{model}\0{text}'.encode()).hexdigest()
+
+    def _reset(self) -> None:
+        self.slots: OrderedDict = OrderedDict()  # key -> slot, least recently used first
+        self.slot_keys: Dict[int, str] = {}
+        self.allocated = 0
+        self._log_offset = 0
+        if self._log_file is not None:
+            self._log_file.close()
+        self._log_file = None  # Open index log; holding it keeps its inode from being reused
+        self._matrix = None
+
+    def _catch_up(self) -> None:
+        """Apply index lines appended since the last read (by any process)."""
+        try:
+            stat = self._index_path.stat()
+        except FileNotFoundError:
+            return
+        if self._log_file is None or os.fstat(self._log_file.fileno()).st_ino != stat.st_ino:
+            # The log was compacted (or first read): rebuild from the start
+            self._reset()
+            self._log_file = open(self._index_path, 'rb')
+        if os.fstat(self._log_file.fileno()).st_size == self._log_offset:
+            return
+
+        self._log_file.seek(self._log_offset)
+        for line in self._log_file:
+            if not line.endswith(b'\n'):
+                break  # Another process is mid-append
+            self._log_offset += len(line)
+            key, slot = json.loads(line)
+            self._assign(key, slot)
+
+    def _assign(self, key: Optional[str], slot: int) -> None:
+        previous = self.slot_keys.pop(slot, None)
+        if previous is not None:
+            self.slots.pop(previous, None)
+        if key is not None:
+            self.slots[key] = slot
+            self.slots.move_to_end(key)
+            self.slot_keys[slot] = key
+        self.allocated = max(self.allocated, slot + 1)
+
+    def _matrix_view(self) -> np.ndarray:
+        slots = os.path.getsize(self._vectors_path) // (self.dimension * 4) if self._vectors_path.exists() else 0
+        if slots == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] != slots:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r',
+                                     shape=(slots, self.dimension))
+        return self._matrix
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self._lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached embedding for each text, or None where it is not cached."""
+        with self._lock:
+            self._catch_up()
+            matrix = self._matrix_view()
+            keys = [self.key(model, text) for text in texts]
+            slots = [self.slots.get(key) for key in keys]
+            rows = [matrix[slot].tolist() if slot is not None and slot < matrix.shape[0] else None
+                    for slot in slots]
+
+            # A writer logs a slot as freed before overwriting it, so anything
+            # reassigned while we were reading shows up here
+            self._catch_up()
+            results = []
+            for key, slot, row in zip(keys, slots, rows):
+                if row is None or self.slots.get(key) != slot:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.slots.move_to_end(key)
+                self.hits += 1
+                results.append(row)
+            return results
+
+    def put_many(self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Store embeddings for texts, evicting least recently used entries when full."""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if len(texts) and vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional embeddings, got {vectors.shape[1]}")
+
+        with self._lock, self._file_lock():
+            self._catch_up()
+            vectors_fd = os.open(self._vectors_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                with open(self._index_path, 'ab') as index_file:
+                    for text, vector in zip(texts, vectors):
+                        key = self.key(model, text)
+                        if key in self.slots:
+                            continue
+                        if self.allocated < self.capacity:
+                            slot = self.allocated
+                        else:
+                            _, slot = self.slots.popitem(last=False)
+                            # Free the slot durably before its vector is overwritten
+                            self._append(index_file, None, slot)
+
+                        os.pwrite(vectors_fd, vector.tobytes(), slot * self.dimension * 4)
+                        self._append(index_file, key, slot)
+            finally:
+                os.close(vectors_fd)
+
+            # Index lines are ~75 bytes; compact once most of the log is superseded
+            if self._log_offset > 4 * 80 * self.capacity:
+                self._compact()
+
+    def _append(self, index_file, key: Optional[str], slot: int) -> None:
+        line = json.dumps([key, slot]).encode() + b'\n'
+        index_file.write(line)
+        index_file.flush()
+        self._log_offset += len(line)
+        self._assign(key, slot)
+
+    def _compact(self) -> None:
+        """Rewrite the index log as one line per live entry, oldest first."""
+        temp_path = self._index_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            for key, slot in self.slots.items():
+                f.write(json.dumps([key, slot]) + '\n')
+        os.replace(temp_path, self._index_path)
+        self._reset()
+        self._catch_up()
+        logger.info(f"Compacted embedding cache index to {len(self.slots)} entries")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self.slots), 'capacity': self.capacity,
+                    'hits': self.hits, 'misses': self.misses}
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+def embedding_cache() -> Optional[EmbeddingCache]:
+    """Process-wide embedding cache at EMBEDDING_CACHE_DIR, bounded by
+    EMBEDDING_CACHE_BYTES; None when that is set to 0."""
+    global _cache
+    with _cache_lock:
+        max_bytes = int(os.getenv('EMBEDDING_CACHE_BYTES', 256 * 1024 * 1024))
+        if _cache is None and max_bytes > 0:
+            _cache = EmbeddingCache(
+                os.getenv('EMBEDDING_CACHE_DIR', os.path.join(os.getcwd(), 'tmp', 'embeddings')),
+                dimension=int(os.getenv('VECTOR_DIMENSION', 1536)),
+                max_bytes=max_bytes
+            )
+        return _cache
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+    """Replace the process-wide embedding cache (e.g. with a temp directory in tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
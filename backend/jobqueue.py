@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+@dataclass
+class Job:
+    id: str
+    key: Optional[str]
+    func: Callable = field(repr=False)
+    args: tuple = field(default=(), repr=False)
+    status: str = 'queued'  # 'queued', 'running', 'succeeded' or 'failed'
+    attempts: int = 0
+    error: str = ""
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    finished_at: str = ""
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)  # Set for submit_async jobs
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'key': self.key,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+def _unfinished(status: Optional[Dict]) -> bool:
+    return status is not None and status['status'] in ('queued', 'running')
+
+class JobQueue:
+    """Bounded background queue run by a fixed set of worker threads.
+
+    A job fails an attempt by raising; it is retried up to max_retries times
+    with exponential backoff before being marked failed. Finished jobs are
+    kept (up to max_finished) so their status can still be queried.
+
+    Under an event loop, submit_async runs coroutine jobs as asyncio tasks
+    instead, with the same retries and at most `workers` running at once.
+
+    Jobs run in the process that submitted them. With a status_store (a
+    callable returning e.g. the ProfileStore), every status change is also
+    recorded there, so other server processes can report and wait on them.
+    Unfinished jobs not updated for stale_after seconds are taken to belong
+    to a process that has gone away.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 100, max_retries: int = 3,
+                 backoff: float = 1.0, max_finished: int = 1000,
+                 status_store: Optional[Callable[[], Any]] = None,
+                 stale_after: float = 600.0, poll_interval: float = 0.25):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_finished = max_finished
+        self.workers = workers
+        self.max_queued = max_queued
+        self.jobs: Dict[str, Job] = {}
+        self.keys: Dict[str, str] = {}  # Caller key (e.g. profile_id) -> latest job ID
+        self._finished = []
+        self._lock = threading.Lock()
+        self.status_store = status_store
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._publish_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._async_pending = 0
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._threads_started = False  # Worker threads start with the first submit
+
+    def _start_threads(self) -> None:
+        """Start the worker threads; the caller holds the lock."""
+        if not self._threads_started:
+            for i in range(self.workers):
+                threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True).start()
+            self._threads_started = True
+
+    def submit(self, func: Callable, *args: Any, key: Optional[str] = None) -> Job:
+        """Queue func(*args); raises JobQueueFull if the queue is at capacity."""
+        job = Job(id=f"job_{uuid.uuid4()}", key=key, func=func, args=args)
+        with self._lock:
+            self._start_threads()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFull("Job queue is full")
+            self.jobs[job.id] = job
+            if key is not None:
+                self.keys[key] = job.id
+        self._publish(job)
+        return job
+
+    def submit_async(self, func: Callable, *args: Any, key: Optional[str] = None) -> Job:
+        """Run the coroutine function func(*args) as a task on the running
+        event loop; raises JobQueueFull if max_queued jobs are already pending."""
+        job = Job(id=f"job_{uuid.uuid4()}", key=key, func=func, args=args)
+        with self._lock:
+            if self._async_pending >= self.max_queued:
+                raise JobQueueFull("Job queue is full")
+            if self._async_slots is None:
+                self._async_slots = asyncio.Semaphore(self.workers)
+            self._async_pending += 1
+            self.jobs[job.id] = job
+            if key is not None:
+                self.keys[key] = job.id
+        self._publish(job)
+        job.task = asyncio.get_running_loop().create_task(self._run_async(job))
+        return job
+
+    async def wait(self, job: Job, timeout: float) -> bool:
+        """Wait up to timeout seconds for a job without blocking the event loop;
+        returns whether it finished."""
+        if job.task is not None:
+            await asyncio.wait({job.task}, timeout=timeout)
+        elif not job.done.is_set():
+            await asyncio.to_thread(job.done.wait, timeout)
+        return job.done.is_set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def get_by_key(self, key: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(self.keys.get(key))
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """A job's status, whichever server process is running it."""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._recorded(job_id=job_id)
+
+    def wait_by_key(self, key: str, timeout: float) -> Optional[Dict]:
+        """Status of the latest job for key once it finishes or timeout
+        seconds pass; None if there is no such job."""
+        job = self.get_by_key(key)
+        if job is not None:
+            job.done.wait(timeout)
+            return job.to_dict()
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self._recorded(key=key)
+            if not _unfinished(status) or time.monotonic() >= deadline:
+                return status
+            time.sleep(self.poll_interval)
+
+    async def await_by_key(self, key: str, timeout: float) -> Optional[Dict]:
+        """wait_by_key without blocking the event loop."""
+        job = self.get_by_key(key)
+        if job is not None:
+            await self.wait(job, timeout)
+            return job.to_dict()
+        deadline = time.monotonic() + timeout
+        while True:
+            status = await asyncio.to_thread(self._recorded, key=key)
+            if not _unfinished(status) or time.monotonic() >= deadline:
+                return status
+            await asyncio.sleep(self.poll_interval)
+
+    def _recorded(self, job_id: Optional[str] = None, key: Optional[str] = None) -> Optional[Dict]:
+        """Status another process recorded in the status store."""
+        if self.status_store is None:
+            return None
+        try:
+            found = self.status_store().get_job(job_id=job_id, key=key)
+        except Exception as e:
+            logger.warning(f"Could not read job status for {job_id or key}: {e}")
+            return None
+        if found is None:
+            return None
+        status, updated = found
+        if _unfinished(status) and time.time() - updated > self.stale_after:
+            return None
+        return status
+
+    def _publish(self, job: Job) -> None:
+        """Record the job's current status in the status store."""
+        if self.status_store is None:
+            return
+        # Serialized, with the status read under the lock, so an earlier
+        # status never overwrites a later one
+        with self._publish_lock:
+            try:
+                self.status_store().put_job(job.to_dict())
+            except Exception as e:
+                logger.warning(f"Could not record status of job {job.id}: {e}")
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            self._publish(job)
+            while True:
+                job.attempts += 1
+                try:
+                    job.func(*job.args)
+                    job.status = 'succeeded'
+                    job.error = ""
+                    break
+                except Exception as e:
+                    delay = self._failed_attempt(job, e)
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+
+            self._finish(job)
+            self._queue.task_done()
+
+    async def _run_async(self, job: Job) -> None:
+        try:
+            async with self._async_slots:
+                job.status = 'running'
+                self._publish(job)
+                while True:
+                    job.attempts += 1
+                    try:
+                        await job.func(*job.args)
+                        job.status = 'succeeded'
+                        job.error = ""
+                        break
+                    except Exception as e:
+                        delay = self._failed_attempt(job, e)
+                        if delay is None:
+                            break
+                        await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self._async_pending -= 1
+            self._finish(job)
+
+    def _failed_attempt(self, job: Job, error: Exception) -> Optional[float]:
+        """Record a failed attempt; the delay before retrying, or None once out of retries."""
+        job.error = str(error)
+        if job.attempts > self.max_retries:
+            job.status = 'failed'
+            logger.error(f"Job {job.id} failed after {job.attempts} attempts: {error}")
+            return None
+        delay = self.backoff * 2 ** (job.attempts - 1)
+        logger.warning(f"Job {job.id} attempt {job.attempts} failed, retrying in {delay:.1f}s: {error}")
+        self._publish(job)
+        return delay
+
+    def _finish(self, job: Job) -> None:
+        job.finished_at = datetime.utcnow().isoformat()
+        self._publish(job)
+        job.done.set()
+        self._retire(job)
+
+    def _retire(self, job: Job) -> None:
+        """Forget the oldest finished jobs once more than max_finished are kept."""
+        with self._lock:
+            self._finished.append(job.id)
+            while len(self._finished) > self.max_finished:
+                old = self.jobs.pop(self._finished.pop(0), None)
+                if old is not None and old.key is not None and self.keys.get(old.key) == old.id:
+                    del self.keys[old.key]
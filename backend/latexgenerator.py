@@ -1,9 +1,40 @@
 from pylatex import Document, Section, Subsection, Command, Package
-from pylatex.utils import NoEscape, bold
+from pylatex.utils import NoEscape, bold, dumps_list
 import os
+import hashlib
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from functools import lru_cache
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from metrics import timed
+from profilemodel import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Dumped pdflatex formats, one per distinct preamble; set to '' to disable
+FORMAT_DIR = os.getenv('LATEX_FORMAT_DIR', os.path.join(os.getcwd(), 'tmp', 'latex_formats'))
+
+# Scratch space for in-memory renders; tmpfs when available
+SCRATCH_DIR = os.getenv('LATEX_SCRATCH_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+
+# Debugging aid: when set, every in-memory render copies its .tex here
+KEEP_TEX_DIR = os.getenv('LATEX_KEEP_TEX_DIR', '')
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before a monotonic deadline, for subprocess timeouts."""
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise subprocess.TimeoutExpired('pdflatex', 0)
+    return remaining
+
 @dataclass
 class ResumeTheme:
     """Theme configuration for resume styling"""
@@ -14,6 +45,191 @@ class ResumeTheme:
     layout: str = 'traditional'  # 'traditional' or 'modern'
     font_size: str = '11pt'
 
+    def normalized(self) -> 'ResumeTheme':
+        """Return a copy with insignificant spelling differences removed"""
+        return ResumeTheme(
+            primary_color=self.primary_color.replace(' ', '').lower(),
+            accent_color=self.accent_color.replace(' ', '').lower(),
+            font_family=self.font_family.strip().lower(),
+            section_style=self.section_style.strip().lower(),
+            layout=self.layout.strip().lower(),
+            font_size=self.font_size.replace(' ', '').lower()
+        )
+
+def theme_from_options(theme_options: Dict) -> ResumeTheme:
+    """Build a normalized ResumeTheme from request JSON, filling in the
+    defaults, so the render key and the render see the same theme"""
+    return ResumeTheme(
+        primary_color=theme_options.get('primary_color', 'black'),
+        accent_color=theme_options.get('accent_color', '0.5,0.5,0.5'),
+        font_family=theme_options.get('font_family', 'helvetica'),
+        section_style=theme_options.get('section_style', 'basic'),
+        layout=theme_options.get('layout', 'traditional'),
+        font_size=theme_options.get('font_size', '11pt')
+    ).normalized()
+
+def _header_tex(contact: Dict) -> str:
+    """Contact information header"""
+    items = []
+    
+    # Create header with name
+    items.append(NoEscape(r'\begin{center}'))
+    items.append(NoEscape(r'{\Large\textbf{' + contact.get('name', '') + r'}}\\[0.5em]'))
+    
+    # Add contact details
+    contact_lines = []
+    if contact.get('email'):
+        contact_lines.append(rf'\faEnvelope\ {contact["email"]}')
+    if contact.get('location'):
+        contact_lines.append(rf'\faMapMarker\ {contact["location"]}')
+    if contact.get('linkedin_url'):
+        contact_lines.append(rf'\faLinkedin\ {contact["linkedin_url"]}')
+        
+    items.append(NoEscape(' | '.join(contact_lines)))
+    items.append(NoEscape(r'\end{center}'))
+    items.append(NoEscape(r'\vspace{1em}'))
+    return dumps_list(items, token='%\n')
+
+def _summary_tex(summary: str) -> str:
+    """Professional summary section"""
+    section = Section('Professional Summary', numbering=False)
+    section.append(summary)
+    return section.dumps_as_content()
+
+def _experience_tex(experiences: List[Dict]) -> str:
+    """Work experience section"""
+    section = Section('Professional Experience', numbering=False)
+    for exp in experiences:
+        # Company and title header
+        section.append(NoEscape(r'\textbf{' + exp['company'] + r'} \hfill ' + 
+                                exp['dates']['start'] + ' - ' + exp['dates']['end'] + r'\\'))
+        section.append(NoEscape(r'\textit{' + exp['title'] + r'} \hfill ' + 
+                                exp['location'] + r'\\[0.5em]'))
+        
+        # Description
+        if exp.get('description'):
+            section.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
+            for bullet in exp['description'].split('\n'):
+                if bullet.strip():
+                    section.append(NoEscape(r'\item ' + bullet.strip()))
+            section.append(NoEscape(r'\end{itemize}'))
+        
+        section.append(NoEscape(r'\vspace{1em}'))
+    return section.dumps_as_content()
+
+def _education_tex(education: List[Dict]) -> str:
+    """Education section"""
+    section = Section('Education', numbering=False)
+    for edu in education:
+        section.append(NoEscape(r'\textbf{' + edu['school'] + r'} \hfill ' +
+                                edu['dates']['start'] + ' - ' + edu['dates']['end'] + r'\\'))
+        section.append(NoEscape(r'\textit{' + edu['degree'] + 
+                                (' in ' + edu['field'] if edu.get('field') else '') + r'}\\'))
+        section.append(NoEscape(r'\vspace{0.5em}'))
+    return section.dumps_as_content()
+
+def _skills_tex(skills: List[str]) -> str:
+    """Skills section"""
+    section = Section('Skills', numbering=False)
+    section.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
+    for skill in skills:
+        section.append(NoEscape(r'\item ' + skill))
+    section.append(NoEscape(r'\end{itemize}'))
+    return section.dumps_as_content()
+
+def _certifications_tex(certifications: List[Dict]) -> str:
+    """Certifications section"""
+    section = Section('Certifications', numbering=False)
+    for cert in certifications:
+        section.append(NoEscape(r'\textbf{' + cert['name'] + r'} \hfill ' + cert['date'] + r'\\'))
+        if cert.get('issuer'):
+            section.append(NoEscape(r'\textit{' + cert['issuer'] + r'}\\'))
+        section.append(NoEscape(r'\vspace{0.5em}'))
+    return section.dumps_as_content()
+
+FRAGMENT_BUILDERS = {
+    'header': _header_tex,
+    'summary': _summary_tex,
+    'experience': _experience_tex,
+    'education': _education_tex,
+    'skills': _skills_tex,
+    'certifications': _certifications_tex,
+}
+
+@lru_cache(maxsize=int(os.getenv('LATEX_FRAGMENT_CACHE_SIZE', 2048)))
+def _cached_fragment(section: str, data_json: str) -> str:
+    return FRAGMENT_BUILDERS[section](json_loads(data_json))
+
+def section_fragment(section: str, data) -> str:
+    """LaTeX source for one resume section, cached by the section's data.
+
+    Fragments only depend on profile data; the theme only touches the
+    preamble and the layout wrapper, so theme changes reuse every fragment.
+    """
+    return _cached_fragment(section, json_dumps(data, sort_keys=True))
+
+# What pdflatex prints when a .fmt is unreadable or was dumped by another
+# TeX build; the document never starts, so no .log is written
+FORMAT_LOAD_ERRORS = (b'Fatal format file error', b"can't find the format file")
+
+def _format_load_failed(output: bytes) -> bool:
+    return any(error in output for error in FORMAT_LOAD_ERRORS)
+
+class FormatCache:
+    """Builds and reuses pdflatex format files (.fmt) keyed by preamble hash.
+
+    A format holds the already-loaded packages and preamble definitions, so
+    a compile started from it only has to typeset the document body. The
+    preamble hash is the format name, so any preamble change gets a fresh
+    format automatically.
+    """
+
+    def __init__(self, format_dir: str):
+        self.format_dir = format_dir
+        self._lock = threading.Lock()
+        os.makedirs(format_dir, exist_ok=True)
+
+    def env(self) -> Dict[str, str]:
+        """Environment that lets pdflatex find formats in the cache directory."""
+        return {**os.environ, 'TEXFORMATS': self.format_dir + os.pathsep}
+
+    def format_name(self, preamble: str) -> str:
+        return 'resume_' + hashlib.sha256(preamble.encode()).hexdigest()[:16]
+
+    def ensure(self, preamble: str, rebuild: bool = False, deadline: Optional[float] = None) -> str:
+        """Return the format name for a preamble, dumping it first if needed."""
+        name = self.format_name(preamble)
+        fmt_path = os.path.join(self.format_dir, f'{name}.fmt')
+        with self._lock:
+            if rebuild and os.path.exists(fmt_path):
+                os.remove(fmt_path)
+            if not os.path.exists(fmt_path):
+                # mylatexformat dumps everything up to \begin{document}. Both the
+                # input and the dump use a private name, so a process building the
+                # same format at the same time never touches this one's files and
+                # nobody loads a partial .fmt
+                jobname = f'{name}_{os.getpid()}'
+                tex_path = os.path.join(self.format_dir, f'{jobname}.tex')
+                with open(tex_path, 'w') as f:
+                    f.write(preamble + '\\begin{document}\n\\end{document}\n')
+                try:
+                    with timed('latex_format'):
+                        subprocess.run(
+                            ['pdflatex', '-ini', '-interaction=nonstopmode', f'-jobname={jobname}',
+                             '&pdflatex', 'mylatexformat.ltx', f'{jobname}.tex'],
+                            cwd=self.format_dir, check=True, capture_output=True, env=self.env(),
+                            timeout=_remaining(deadline)
+                        )
+                    os.replace(os.path.join(self.format_dir, f'{jobname}.fmt'), fmt_path)
+                finally:
+                    for ext in ('tex', 'log', 'fmt'):
+                        try:
+                            os.remove(os.path.join(self.format_dir, f'{jobname}.{ext}'))
+                        except FileNotFoundError:
+                            pass
+                logger.info(f"Built LaTeX format {name}")
+        return name
+
 class ResumeGenerator:
     def __init__(self, profile_data: Dict, theme: Optional[ResumeTheme] = None):
         self.profile = profile_data
@@ -23,6 +239,7 @@ class ResumeGenerator:
             geometry_options={'margin': '0.7in'},
             font_size=self.theme.font_size
         )
+        self._sections_added = False
         self._setup_document()
 
     def _setup_document(self):
@@ -41,8 +258,8 @@ class ResumeGenerator:
             self.doc.packages.append(Package('mathptmx'))
         
         # Define colors
-        self.doc.preamble.append(Command('definecolor', 'primary', 'RGB', self.theme.primary_color))
-        self.doc.preamble.append(Command('definecolor', 'accent', 'RGB', self.theme.accent_color))
+        self.doc.preamble.append(Command('definecolor', arguments=['primary', 'RGB', self.theme.primary_color]))
+        self.doc.preamble.append(Command('definecolor', arguments=['accent', 'RGB', self.theme.accent_color]))
         
         # Custom section styling
         if self.theme.section_style == 'modern':
@@ -63,112 +280,163 @@ class ResumeGenerator:
         # Remove page numbers
         self.doc.preamble.append(Command('pagenumbering', 'gobble'))
 
+    def _add_fragment(self, section: str, data) -> None:
+        """Append a section's cached LaTeX source to the document"""
+        self.doc.append(NoEscape(section_fragment(section, data)))
+
     def _add_header(self):
         """Add contact information header"""
-        contact = self.profile.get('contact', {})
-        
-        # Create header with name
-        self.doc.append(NoEscape(r'\begin{center}'))
-        self.doc.append(NoEscape(r'{\Large\textbf{' + contact.get('name', '') + r'}}\\[0.5em]'))
-        
-        # Add contact details
-        contact_lines = []
-        if contact.get('email'):
-            contact_lines.append(rf'\faEnvelope\ {contact["email"]}')
-        if contact.get('location'):
-            contact_lines.append(rf'\faMapMarker\ {contact["location"]}')
-        if contact.get('linkedin_url'):
-            contact_lines.append(rf'\faLinkedin\ {contact["linkedin_url"]}')
-            
-        self.doc.append(NoEscape(' | '.join(contact_lines)))
-        self.doc.append(NoEscape(r'\end{center}'))
-        self.doc.append(NoEscape(r'\vspace{1em}'))
+        self._add_fragment('header', self.profile.get('contact', {}))
 
     def _add_summary(self):
         """Add professional summary section"""
         if summary := self.profile.get('summary'):
-            with self.doc.create(Section('Professional Summary', numbering=False)):
-                self.doc.append(summary)
+            self._add_fragment('summary', summary)
 
     def _add_experience(self):
         """Add work experience section"""
         if experiences := self.profile.get('experience'):
-            with self.doc.create(Section('Professional Experience', numbering=False)):
-                for exp in experiences:
-                    # Company and title header
-                    self.doc.append(NoEscape(r'\textbf{' + exp['company'] + r'} \hfill ' + 
-                                          exp['dates']['start'] + ' - ' + exp['dates']['end'] + r'\\'))
-                    self.doc.append(NoEscape(r'\textit{' + exp['title'] + r'} \hfill ' + 
-                                          exp['location'] + r'\\[0.5em]'))
-                    
-                    # Description
-                    if exp.get('description'):
-                        self.doc.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
-                        for bullet in exp['description'].split('\n'):
-                            if bullet.strip():
-                                self.doc.append(NoEscape(r'\item ' + bullet.strip()))
-                        self.doc.append(NoEscape(r'\end{itemize}'))
-                    
-                    self.doc.append(NoEscape(r'\vspace{1em}'))
+            self._add_fragment('experience', experiences)
 
     def _add_education(self):
         """Add education section"""
         if education := self.profile.get('education'):
-            with self.doc.create(Section('Education', numbering=False)):
-                for edu in education:
-                    self.doc.append(NoEscape(r'\textbf{' + edu['school'] + r'} \hfill ' +
-                                          edu['dates']['start'] + ' - ' + edu['dates']['end'] + r'\\'))
-                    self.doc.append(NoEscape(r'\textit{' + edu['degree'] + 
-                                          (' in ' + edu['field'] if edu.get('field') else '') + r'}\\'))
-                    self.doc.append(NoEscape(r'\vspace{0.5em}'))
+            self._add_fragment('education', education)
 
     def _add_skills(self):
         """Add skills section"""
         if skills := self.profile.get('skills'):
-            with self.doc.create(Section('Skills', numbering=False)):
-                self.doc.append(NoEscape(r'\begin{itemize}[leftmargin=*]'))
-                for skill in skills:
-                    self.doc.append(NoEscape(r'\item ' + skill))
-                self.doc.append(NoEscape(r'\end{itemize}'))
+            self._add_fragment('skills', skills)
 
     def _add_certifications(self):
         """Add certifications section"""
         if certifications := self.profile.get('certifications'):
-            with self.doc.create(Section('Certifications', numbering=False)):
-                for cert in certifications:
-                    self.doc.append(NoEscape(r'\textbf{' + cert['name'] + r'} \hfill ' + cert['date'] + r'\\'))
-                    if cert.get('issuer'):
-                        self.doc.append(NoEscape(r'\textit{' + cert['issuer'] + r'}\\'))
-                    self.doc.append(NoEscape(r'\vspace{0.5em}'))
-
-    def generate(self, output_path: str) -> str:
-        """Generate the resume and return the path to the PDF file"""
+            self._add_fragment('certifications', certifications)
+
+    @timed('latex_build')
+    def _add_sections(self):
+        """Add all sections based on layout (once per generator)"""
+        if self._sections_added:
+            return
+        self._sections_added = True
+        if self.theme.layout == 'traditional':
+            self._add_header()
+            self._add_summary()
+            self._add_experience()
+            self._add_education()
+            self._add_skills()
+            self._add_certifications()
+        elif self.theme.layout == 'modern':
+            self._add_header()
+            # Create two-column layout
+            self.doc.append(NoEscape(r'\begin{minipage}[t]{0.3\textwidth}'))
+            self._add_skills()
+            self._add_education()
+            self._add_certifications()
+            self.doc.append(NoEscape(r'\end{minipage}\hfill'))
+            self.doc.append(NoEscape(r'\begin{minipage}[t]{0.65\textwidth}'))
+            self._add_summary()
+            self._add_experience()
+            self.doc.append(NoEscape(r'\end{minipage}'))
+
+    def to_tex(self) -> str:
+        """Build the document and return its LaTeX source without compiling"""
+        self._add_sections()
+        return self.doc.dumps()
+
+    def generate(self, output_path: str, timeout: Optional[float] = None) -> str:
+        """Generate the resume and return the path to the PDF file.
+
+        With a timeout, pdflatex is killed once that many seconds have passed
+        and subprocess.TimeoutExpired is raised.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
         try:
-            # Add all sections based on layout
-            if self.theme.layout == 'traditional':
-                self._add_header()
-                self._add_summary()
-                self._add_experience()
-                self._add_education()
-                self._add_skills()
-                self._add_certifications()
-            elif self.theme.layout == 'modern':
-                self._add_header()
-                # Create two-column layout
-                self.doc.append(NoEscape(r'\begin{minipage}[t]{0.3\textwidth}'))
-                self._add_skills()
-                self._add_education()
-                self._add_certifications()
-                self.doc.append(NoEscape(r'\end{minipage}\hfill'))
-                self.doc.append(NoEscape(r'\begin{minipage}[t]{0.65\textwidth}'))
-                self._add_summary()
-                self._add_experience()
-                self.doc.append(NoEscape(r'\end{minipage}'))
+            self._add_sections()
             # TODO: send this to an LLM using a groq api key to make a real good latex resume
             
-            # Generate PDF
-            self.doc.generate_pdf(output_path, clean_tex=False)
+            # Generate PDF, starting from a dumped preamble format when possible
+            if not (FORMAT_DIR and self._generate_with_format(output_path, deadline)):
+                if deadline is None:
+                    with timed('pdflatex'):
+                        self.doc.generate_pdf(output_path, clean_tex=False)
+                else:
+                    self._compile(output_path, [], deadline, check=True)
             return f"{output_path}.pdf"
             
+        except subprocess.TimeoutExpired:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to generate resume: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to generate resume: {str(e)}")
+
+    def generate_bytes(self, timeout: Optional[float] = None, keep_tex_dir: Optional[str] = None) -> bytes:
+        """Generate the resume in a scratch directory and return the PDF bytes.
+
+        The scratch directory is always removed; pass keep_tex_dir (or set
+        LATEX_KEEP_TEX_DIR) to keep a copy of the .tex for inspection.
+        """
+        keep_tex_dir = keep_tex_dir if keep_tex_dir is not None else KEEP_TEX_DIR
+        os.makedirs(SCRATCH_DIR, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='resume_', dir=SCRATCH_DIR) as work_dir:
+            output_path = os.path.join(work_dir, 'resume')
+            try:
+                with open(self.generate(output_path, timeout=timeout), 'rb') as f:
+                    return f.read()
+            finally:
+                if keep_tex_dir and os.path.exists(f'{output_path}.tex'):
+                    os.makedirs(keep_tex_dir, exist_ok=True)
+                    shutil.copy(f'{output_path}.tex', os.path.join(keep_tex_dir, f'{os.path.basename(work_dir)}.tex'))
+
+    def _compile(self, output_path: str, args: List[str], deadline: Optional[float],
+                 check: bool = False, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+        """Run one pdflatex pass over output_path.tex, leaving only the PDF and .tex."""
+        output_dir, name = os.path.split(os.path.abspath(output_path))
+        if not os.path.exists(f'{output_path}.tex'):
+            self.doc.generate_tex(output_path)
+        with timed('pdflatex'):
+            result = subprocess.run(
+                ['pdflatex', '-interaction=nonstopmode', *args, f'{name}.tex'],
+                cwd=output_dir, capture_output=True, env=env, timeout=_remaining(deadline)
+            )
+        for ext in ('aux', 'log', 'out'):
+            try:
+                os.remove(os.path.join(output_dir, f'{name}.{ext}'))
+            except FileNotFoundError:
+                pass
+        if check and result.returncode != 0:
+            raise Exception(f"pdflatex exited with status {result.returncode}")
+        return result
+
+    def _generate_with_format(self, output_path: str, deadline: Optional[float] = None) -> bool:
+        """Compile against the cached preamble format; False means fall back."""
+        tex = self.doc.dumps()
+        preamble = tex[:tex.index(r'\begin{document}')]
+
+        with open(f'{output_path}.tex', 'w') as f:
+            f.write(tex)
+        try:
+            format_cache = _get_format_cache()
+            for rebuild in (False, True):
+                # A format dumped by another TeX version fails to load; rebuild once
+                fmt = format_cache.ensure(preamble, rebuild=rebuild, deadline=deadline)
+                result = self._compile(output_path, [f'-fmt={fmt}'], deadline, env=format_cache.env())
+                if result.returncode == 0:
+                    return True
+                if not _format_load_failed(result.stdout):
+                    # The document itself is broken; a full compile would fail the same way
+                    raise Exception(f"pdflatex exited with status {result.returncode}")
+            logger.warning(f"Format {fmt} still fails to load after a rebuild; using a full compile")
+            return False
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"LaTeX format unavailable, using a full compile: {e}")
+            return False
+
+_format_cache: Optional[FormatCache] = None
+_format_cache_lock = threading.Lock()
+
+def _get_format_cache() -> FormatCache:
+    global _format_cache
+    with _format_cache_lock:
+        if _format_cache is None:
+            _format_cache = FormatCache(FORMAT_DIR)
+        return _format_cache
@@ -1,17 +1,23 @@
 import fitz  # PyMuPDF
+import asyncio
 import json
 import re
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
-from openai import OpenAI
-from pinecone import Pinecone
-import os
 from dotenv import load_dotenv
 import uuid
-from datetime import datetime
+from concurrent.futures import Executor, ThreadPoolExecutor
+from clients import clients
+from embeddingcache import EmbeddingCache, embedding_cache
+from jobqueue import JobQueue
+from metrics import begin_request, observe, request_timings, timed
+from parsecache import ParseCache, pdf_digest
+from profilemodel import Certification, Contact, DateRange, Education, Experience, Profile
+from profilestore import profile_store
+from similaritycache import similarity_cache
+from vectorstore import VectorMatch, VectorRecord, VectorStore, vector_store
 
 # Configure logging
 logging.basicConfig(
@@ -23,50 +29,178 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-@dataclass
-class DateRange:
-    start: str
-    end: str = "Present"
-
-@dataclass
-class Contact:
-    name: str
-    email: str
-    location: str
-    linkedin_url: str
-
-@dataclass
-class Experience:
-    company: str
-    title: str
-    location: str
-    dates: DateRange
-    description: str
-
-@dataclass
-class Education:
-    school: str
-    degree: str
-    field: str
-    dates: DateRange
-
-@dataclass
-class Certification:
-    name: str
-    issuer: str
-    date: str
-    expires: str = ""
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Each chunk query fetches this many matches per profile asked for, since
+# one similar profile usually matches with several of its chunks
+SIMILAR_CHUNK_FANOUT = 4
+
+# Section name -> sections whose header closes it (mirrors the original
+# lookahead patterns; a missing terminator runs to the end of the text)
+SECTION_TERMINATORS = {
+    'contact': ('experience', 'summary', 'education'),
+    'summary': ('experience', 'education'),
+    'experience': ('education', 'skills'),
+    'education': ('skills', 'certifications'),
+    'skills': ('languages', 'certifications'),
+    'certifications': ('languages', 'honors', 'publications'),
+    'languages': (),
+}
+
+# Header line text -> section name
+SECTION_HEADERS = {
+    'contact': 'contact',
+    'about': 'summary',
+    'experience': 'experience',
+    'education': 'education',
+    'skills': 'skills',
+    'top skills': 'skills',
+    'certifications': 'certifications',
+    'languages': 'languages',
+    # Sidebar sections that follow certifications but are not parsed
+    'honors-awards': 'honors',
+    'publications': 'publications',
+}
+
+HEADER_PATTERN = re.compile(
+    r'^[ \t]*(' + '|'.join(re.escape(h) for h in SECTION_HEADERS) + r')[ \t]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+def segment_sections(text: str) -> Dict[str, str]:
+    """Split text into sections in a single pass over its header lines.
+
+    Section boundaries are taken from header offsets rather than from the
+    section contents, so regex metacharacters in the text are harmless.
+    """
+    # One scan collects every header line as (section, header_end, line_start)
+    headers = [
+        (SECTION_HEADERS[m.group(1).lower()], m.end(), m.start())
+        for m in HEADER_PATTERN.finditer(text)
+    ]
+
+    sections = {}
+    spans = []
+    for section, terminators in SECTION_TERMINATORS.items():
+        first = next((i for i, h in enumerate(headers) if h[0] == section), None)
+        if first is None:
+            sections[section] = ""
+            continue
+
+        start = headers[first][1]
+        end = next(
+            (h[2] for h in headers[first + 1:] if h[0] in terminators),
+            len(text)
+        )
+        raw = text[start:end]
+        content = raw.strip()
+        sections[section] = content
+        if content:
+            start += len(raw) - len(raw.lstrip())
+            spans.append((start, start + len(content)))
+
+    # Drop section contents leftmost-first, skipping any that overlap an
+    # earlier one; headers and unclaimed text are collected as "other"
+    remaining = []
+    position = 0
+    for start, end in sorted(spans):
+        if start < position:
+            continue
+        remaining.append(text[position:start])
+        position = end
+    remaining.append(text[position:])
+    sections['other'] = ''.join(remaining).strip()
+
+    return sections
+
+MONTH = (r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?'
+         r'|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)')
+DATE = rf'(?:{MONTH}\.?\s+)?\d{{4}}'
+SPAN = r'\d+\s+years?(?:\s+\d+\s+months?)?|\d+\s+months?|less than a year'
+
+# Every line of an entry section is classified by one match against these
+# alternatives; the name of the alternative that matched is the line's kind
+ENTRY_LINE_PATTERN = re.compile(
+    r'(?P<page>Page \d+ of \d+)'
+    r'|(?P<bullet>[-•*]\s+.*)'
+    # "January 2024 - Present (11 months)" or "Degree, Field · (2016 - 2021)"
+    rf'|(?P<date_range>(?:(?=[^·]*·)(?P<label>[^·]*?)\s*·\s*)?\(?(?P<start>{DATE})\s*[-–]\s*(?P<end>{DATE}|Present)\)?'
+    rf'(?:\s*\((?P<length>{SPAN})\))?)'
+    # Total time at a company listed with several roles, e.g. "2 years 2 months"
+    rf'|(?P<duration>{SPAN})'
+    rf'|(?P<issued>(?=Issued|Expire)(?:Issued\s+(?P<issued_on>{DATE}))?'
+    rf'(?:\s*·?\s*Expire[sd]?\s+(?P<expires>{DATE}))?)'
+    # The lookaheads and the single "Area"/"Region" alternative keep lines
+    # that cannot match from being rescanned
+    r"|(?P<location>(?=[^,]*,)[A-Z][^,\d()·]*(?:,\s*[A-Z][^,\d()·]*){1,2}"
+    r"|[A-Z][\w .'-]* (?:Area|Region)|Remote)"
+)
+SPAN_PART_PATTERN = re.compile(r'(\d+)\s+(year|month)')
+
+# (kind, text, match) for one line; kind is bullet, date_range, duration,
+# issued, location or text, and match holds the pattern's groups
+EntryLine = Tuple[str, str, Optional[re.Match]]
+
+def tokenize_entries(text: str) -> List[EntryLine]:
+    """Classify each line of an entry section once.
+
+    Blank lines and page footers are dropped. A line's kind says what it
+    looks like in isolation; which field it fills (a "location" line can
+    also be a job title) is decided by the parsers from its position.
+    """
+    lines = []
+    fullmatch = ENTRY_LINE_PATTERN.fullmatch
+    for line in text.replace('\xa0', ' ').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        match = fullmatch(line)
+        if match is None:
+            lines.append(('text', line, None))
+        elif match.lastgroup != 'page':
+            lines.append((match.lastgroup, line, match))
+    return lines
+
+def span_months(span: Optional[str]) -> int:
+    """Months in a duration such as "1 year 3 months" (0 if unknown)."""
+    if not span:
+        return 0
+    months = sum(int(n) * (12 if unit == 'year' else 1) for n, unit in SPAN_PART_PATTERN.findall(span))
+    return months or 1  # "less than a year"
+
+DEGREE_FIELD_PATTERN = re.compile(r'(.*?)(?:,\s*|\s+in\s+)(.*)')
+
+def split_degree(text: str) -> Tuple[str, str]:
+    """("Bachelor of Science - BS", "Computer Engineering") from the degree line."""
+    match = DEGREE_FIELD_PATTERN.fullmatch(text)
+    return (match.group(1).strip(), match.group(2).strip()) if match else (text, "")
+
+PDFSource = Union[str, Path, bytes, BinaryIO]
 
 class LinkedInPDFParser:
-    def __init__(self, pdf_path: str):
-        self.pdf_path = Path(pdf_path)
+    def __init__(self, pdf_source: PDFSource):
+        # Paths are opened from disk; bytes and file-like objects are parsed
+        # in memory so concurrent requests never share a file
+        if isinstance(pdf_source, (str, Path)):
+            self.pdf_path = Path(pdf_source)
+            self.pdf_bytes = None
+        else:
+            self.pdf_path = None
+            self.pdf_bytes = pdf_source if isinstance(pdf_source, bytes) else pdf_source.read()
         self.text = ""
         self.sections = {}
         
+    def _open_document(self) -> fitz.Document:
+        """Open the PDF from disk or from the in-memory buffer."""
+        if self.pdf_bytes is not None:
+            return fitz.open(stream=self.pdf_bytes, filetype="pdf")
+        return fitz.open(self.pdf_path)
+
+    @timed('pdf_extract')
     def extract_text(self) -> None:
         """Extract text from PDF file."""
         try:
-            doc = fitz.open(self.pdf_path)
+            doc = self._open_document()
             self.text = ""
             for page in doc:
                 self.text += page.get_text()
@@ -75,30 +209,10 @@ class LinkedInPDFParser:
             logger.error(f"Error extracting text from PDF: {e}")
             raise
 
+    @timed('sections')
     def identify_sections(self) -> None:
         """Split text into sections based on LinkedIn headers."""
-        section_patterns = {
-            'contact': r'Contact(.*?)(?=Experience|About|Education|$)',
-            'summary': r'About(.*?)(?=Experience|Education|$)',
-            'experience': r'Experience(.*?)(?=Education|Skills|$)',
-            'education': r'Education(.*?)(?=Skills|Certifications|$)',
-            'skills': r'Skills(.*?)(?=Languages|Certifications|$)',
-            'certifications': r'Certifications(.*?)(?=Languages|$)',
-            'languages': r'Languages(.*?)$'
-        }
-
-        # First pass to extract known sections
-        for section, pattern in section_patterns.items():
-            match = re.search(pattern, self.text, re.DOTALL | re.IGNORECASE)
-            if match:
-                self.sections[section] = match.group(1).strip()
-            else:
-                self.sections[section] = ""
-        
-        # Second pass to collect any unmatched content into "other"
-        known_content = '|'.join(self.sections.values())
-        remaining_text = re.sub(known_content, '', self.text, flags=re.DOTALL)
-        self.sections['other'] = remaining_text.strip()
+        self.sections = segment_sections(self.text)
 
     def parse_contact(self) -> Contact:
         """Parse contact information section."""
@@ -122,319 +236,648 @@ class LinkedInPDFParser:
         return Contact(name=name, email=email, location=location, linkedin_url=linkedin_url)
 
     def parse_experience(self) -> List[Experience]:
-        """Parse work experience section."""
+        """Parse work experience section.
+
+        Each position is anchored on its date range line: the line before
+        it is the title and the one before that the company, unless the
+        company was listed once with its total duration above several roles.
+        """
         experiences = []
-        text = self.sections.get('experience', '')
-        
-        # Split into individual positions
-        positions = re.split(r'\n(?=[A-Z][^a-z]*\n)', text)
-        
-        for position in positions:
-            if not position.strip():
-                continue
-                
-            lines = position.strip().split('\n')
-            if len(lines) < 3:
-                continue
-                
-            title = lines[0].strip()
-            company = lines[1].strip()
-            
-            # Parse dates
-            date_match = re.search(r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})\s*-\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|Present)', position)
-            dates = DateRange(
-                start=date_match.group(1) if date_match else "",
-                end=date_match.group(2) if date_match else ""
-            )
-            
-            # Extract location
-            location_match = re.search(r'(?:^|\n)([^,]+,\s*[^,]+)(?:$|\n)', position)
-            location = location_match.group(1) if location_match else ""
-            
-            # Everything else is description
-            description = '\n'.join(lines[3:]).strip()
-            
-            experiences.append(Experience(
-                company=company,
-                title=title,
-                location=location,
-                dates=dates,
-                description=description
-            ))
-            
+        company = ""
+        group_months = 0  # Months of a multi-role company not yet covered by its roles
+        pending = []      # Lines since the last date range: description, then headers
+        items = []        # Description items (a bullet plus its wrapped lines)
+
+        def take_header() -> str:
+            return pending.pop()[1] if pending and pending[-1][0] != 'bullet' else ""
+
+        def finish_description() -> None:
+            if not pending:
+                return
+            for kind, text, _ in pending:
+                if kind == 'bullet' or not items:
+                    items.append(text)
+                else:
+                    items[-1] += ' ' + text
+            pending.clear()
+            if experiences:
+                experiences[-1].description = '\n'.join(items)
+            items.clear()
+
+        lines = tokenize_entries(self.sections.get('experience', ''))
+        i = 0
+        while i < len(lines):
+            kind, text, match = lines[i]
+            i += 1
+            if kind == 'duration' and pending and pending[-1][0] != 'bullet':
+                company = take_header()
+                group_months = span_months(text)
+                finish_description()
+            elif kind == 'date_range':
+                title = take_header()
+                if group_months <= 0:
+                    company = take_header()
+                finish_description()
+                # A role without its own duration closes the company's group
+                group_months -= span_months(match['length']) or group_months
+                location = ""
+                if i < len(lines) and lines[i][0] == 'location':
+                    location = lines[i][1]
+                    i += 1
+                experiences.append(Experience(
+                    company=company,
+                    title=title,
+                    location=location,
+                    dates=DateRange(start=match['start'], end=match['end']),
+                    description=""
+                ))
+            else:
+                pending.append((kind, text, match))
+        finish_description()
+
         return experiences
 
     def parse_education(self) -> List[Education]:
-        """Parse education section."""
+        """Parse education section.
+
+        An entry is the school line followed by "Degree, Field · (dates)",
+        where either part after the school may be missing.
+        """
         education_list = []
-        text = self.sections.get('education', '')
-        
-        # Split into individual education entries
-        entries = re.split(r'\n(?=[A-Z][^a-z]*\n)', text)
-        
-        for entry in entries:
-            if not entry.strip():
-                continue
-            
-            lines = entry.strip().split('\n')
-            if len(lines) < 2:
+        pending = []  # School and degree lines not yet closed by a date range
+
+        def add_undated() -> None:
+            for school, degree_line in zip(pending[::2], pending[1::2] + [""]):
+                education_list.append(Education(school, *split_degree(degree_line), DateRange("", "")))
+            pending.clear()
+
+        for kind, text, match in tokenize_entries(self.sections.get('education', '')):
+            if kind != 'date_range':
+                pending.append(text)
                 continue
-            
-            school = lines[0].strip()
-            
-            # Parse degree and field
-            degree_field = lines[1].strip()
-            degree_match = re.match(r'(.*?)\s+(?:in|,)\s+(.*)', degree_field)
-            if degree_match:
-                degree = degree_match.group(1).strip()
-                field = degree_match.group(2).strip()
-            else:
-                degree = degree_field
-                field = ""
-            
-            # Parse dates
-            date_match = re.search(r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})\s*-\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}|Present)', entry)
-            dates = DateRange(
-                start=date_match.group(1) if date_match else "",
-                end=date_match.group(2) if date_match else ""
-            )
-            
+            degree_line = match['label'] or (pending.pop() if len(pending) > 1 else "")
+            school = pending.pop() if pending else ""
+            add_undated()
+            degree, field = split_degree(degree_line)
             education_list.append(Education(
                 school=school,
                 degree=degree,
                 field=field,
-                dates=dates
+                dates=DateRange(start=match['start'], end=match['end'])
             ))
-            
+        add_undated()
+
         return education_list
 
     def parse_certifications(self) -> List[Certification]:
-        """Parse certifications section."""
+        """Parse certifications section.
+
+        The export lists each certification as its name (possibly wrapped),
+        then the issuer and an "Issued ..." line when those are known, or as
+        a bare name line otherwise.
+        """
         certifications = []
-        text = self.sections.get('certifications', '')
-        
-        # Split into individual certifications
-        entries = re.split(r'\n(?=[A-Z][^a-z]*\n)', text)
-        
-        for entry in entries:
-            if not entry.strip():
-                continue
-            
-            lines = entry.strip().split('\n')
-            if len(lines) < 2:
+        pending = []  # Name and issuer lines not yet closed by an "Issued" line
+
+        for kind, text, match in tokenize_entries(self.sections.get('certifications', '')):
+            if kind != 'issued':
+                pending.append(text)
                 continue
-            
-            name = lines[0].strip()
-            issuer = lines[1].strip() if len(lines) > 1 else ""
-            
-            # Parse date
-            date_match = re.search(r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})', entry)
-            date = date_match.group(1) if date_match else ""
-            
-            # Parse expiration date if exists
-            expires_match = re.search(r'Expires?\s+((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})', entry)
-            expires = expires_match.group(1) if expires_match else ""
-            
+            issuer = pending.pop() if len(pending) > 1 else ""
             certifications.append(Certification(
-                name=name,
+                name=' '.join(pending),
                 issuer=issuer,
-                date=date,
-                expires=expires
+                date=match['issued_on'] or "",
+                expires=match['expires'] or ""
             ))
-            
+            pending.clear()
+
+        # With dates shown every entry ends in one, so trailing lines are
+        # text that ran past the section rather than certifications
+        if not certifications:
+            certifications = [Certification(name=name, issuer="", date="") for name in pending]
+
         return certifications
 
-    def parse(self) -> Dict:
-        """Main parsing method that returns structured JSON data."""
+    def parse_profile(self) -> Profile:
+        """Parse the PDF into a typed Profile."""
         try:
             self.extract_text()
             self.identify_sections()
             
-            result = {
-                'contact': asdict(self.parse_contact()),
-                'summary': self.sections.get('summary', '').strip(),
-                'experience': [asdict(exp) for exp in self.parse_experience()],
-                'education': [asdict(edu) for edu in self.parse_education()],
-                'skills': self.sections.get('skills', '').strip().split('\n'),
-                'certifications': [asdict(cert) for cert in self.parse_certifications()],
-                'languages': self.sections.get('languages', '').strip().split('\n'),
-                'other': self.sections.get('other', '').strip()
-            }
-            
-            # Clean up empty sections
-            result = {k: v for k, v in result.items() if v}
-            
-            return result
+            with timed('parse_fields'):
+                return Profile(
+                    contact=self.parse_contact(),
+                    summary=self.sections.get('summary', '').strip(),
+                    experience=self.parse_experience(),
+                    education=self.parse_education(),
+                    skills=self.sections.get('skills', '').strip().split('\n'),
+                    certifications=self.parse_certifications(),
+                    languages=self.sections.get('languages', '').strip().split('\n'),
+                    other=self.sections.get('other', '').strip()
+                )
             
         except Exception as e:
             logger.error(f"Error parsing PDF: {e}")
             raise
 
-def profile_to_text(profile: Dict) -> str:
-    """Convert profile sections to a single text for embedding"""
-    text_parts = []
-    
-    # Add contact info
+    def parse(self) -> Dict:
+        """Main parsing method that returns structured JSON data (empty sections left out)."""
+        return self.parse_profile().to_dict()
+
+def profile_sections(profile: Dict) -> List[Tuple[str, str]]:
+    """(section, text) for each part of a profile that is embedded on its
+    own: contact and summary, each experience entry, education, skills and
+    certifications."""
+    sections = []
+
+    # Contact info and summary
+    about = []
     if "contact" in profile:
         contact = profile["contact"]
-        text_parts.append(f"Name: {contact.get('name', '')}")
-        text_parts.append(f"Location: {contact.get('location', '')}")
-    
-    # Add summary
+        about.append(f"Name: {contact.get('name', '')}")
+        about.append(f"Location: {contact.get('location', '')}")
     if "summary" in profile:
-        text_parts.append(f"Summary: {profile['summary']}")
-    
-    # Add experience
-    if "experience" in profile:
-        text_parts.append("Experience:")
-        for exp in profile["experience"]:
-            text_parts.append(
-                f"{exp['title']} at {exp['company']} "
-                f"({exp['dates']['start']} - {exp['dates']['end']})\n"
-                f"{exp.get('description', '')}"
-            )
-    
-    # Add education
-    if "education" in profile:
-        text_parts.append("Education:")
-        for edu in profile["education"]:
-            text_parts.append(
-                f"{edu['degree']} in {edu['field']} from {edu['school']} "
-                f"({edu['dates']['start']} - {edu['dates']['end']})"
-            )
-    
-    # Add skills
-    if "skills" in profile:
-        text_parts.append(f"Skills: {', '.join(profile['skills'])}")
-    
-    # Add certifications
-    if "certifications" in profile:
-        text_parts.append("Certifications:")
-        for cert in profile["certifications"]:
-            text_parts.append(
-                f"{cert['name']} from {cert['issuer']} "
-                f"(Issued: {cert['date']}, Expires: {cert.get('expires', 'N/A')})"
-            )
-    
-    return "\n\n".join(text_parts)
+        about.append(f"Summary: {profile['summary']}")
+    if about:
+        sections.append(("summary", "\n\n".join(about)))
 
-def store_profile_in_vector_db(profile: Dict, profile_id: str) -> bool:
-    """Store parsed profile in vector database"""
-    try:
+    # One chunk per experience entry
+    for exp in profile.get("experience", []):
+        sections.append(("experience",
+            f"Experience: {exp['title']} at {exp['company']} "
+            f"({exp['dates']['start']} - {exp['dates']['end']})\n"
+            f"{exp.get('description', '')}"
+        ))
+
+    if profile.get("education"):
+        sections.append(("education", "Education:\n\n" + "\n\n".join(
+            f"{edu['degree']} in {edu['field']} from {edu['school']} "
+            f"({edu['dates']['start']} - {edu['dates']['end']})"
+            for edu in profile["education"]
+        )))
+
+    if profile.get("skills"):
+        sections.append(("skills", f"Skills: {', '.join(profile['skills'])}"))
+
+    if profile.get("certifications"):
+        sections.append(("certifications", "Certifications:\n\n" + "\n\n".join(
+            f"{cert['name']} from {cert['issuer']} "
+            f"(Issued: {cert['date']}, Expires: {cert.get('expires', 'N/A')})"
+            for cert in profile["certifications"]
+        )))
+
+    return sections
+
+def profile_to_text(profile: Dict) -> str:
+    """Convert profile sections to a single text"""
+    return "\n\n".join(text for _, text in profile_sections(profile))
+
+# (chunk_id, section, text)
+ProfileChunk = Tuple[str, str, str]
+
+def profile_chunks(profile: Dict, profile_id: str) -> List[ProfileChunk]:
+    """The profile's sections keyed by content: each chunk ID is the profile
+    ID plus a hash of the model and text, so an unchanged section keeps its ID."""
+    chunks = {}
+    for section, text in profile_sections(profile):
+        chunk_id = f"{profile_id}#{EmbeddingCache.key(EMBEDDING_MODEL, text)[:16]}"
+        chunks.setdefault(chunk_id, (chunk_id, section, text))
+    return list(chunks.values())
+
+def _chunk_vector(profile_id: str, chunk: ProfileChunk, embedding: List[float]) -> Dict:
+    """Build the vector record for a profile chunk; the document lives in the profile store."""
+    chunk_id, section, _ = chunk
+    return {
+        "values": embedding,
+        "id": chunk_id,
+        "metadata": {
+            "profile_ref": profile_id,
+            "section": section,
+            "timestamp": datetime.utcnow().isoformat()  # Add timestamp for tracking
+        }
+    }
+
+def _load_profiles(profile_ids: List[str], records: Dict) -> Dict[str, Dict]:
+    """Read profiles from the profile store, falling back to (and backfilling
+    from) the JSON blob that older vector records carry in their metadata."""
+    profiles = profile_store().get_many(profile_ids)
+    legacy = []
+    for profile_id in profile_ids:
+        record = records.get(profile_id)
+        if profile_id not in profiles and record is not None and 'profile' in record.metadata:
+            legacy.append((profile_id, json.loads(record.metadata['profile'])))
+    if legacy:
+        profile_store().put_many(legacy)
+        profiles.update(legacy)
+    return profiles
+
+def _pending_profiles(profiles: List[Tuple[Dict, str]],
+                      results: Dict[str, bool]) -> List[Tuple[Dict, str, List[ProfileChunk]]]:
+    """(profile, profile_id, chunks) for each storable profile; the rest are
+    marked failed in results."""
+    pending = []
+    for profile, profile_id in profiles:
         # Validate profile has required fields
         if not profile.get("contact"):
-            raise ValueError("Profile missing contact information")
-            
-        # Initialize OpenAI and Pinecone clients
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        index = pc.Index('linkedin-profiles')
-        
-        # Convert profile to text format
-        text = profile_to_text(profile)
-        
-        # Generate embedding
-        response = client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small",
-        )
-        embedding = response.data[0].embedding
-        
-        # Create vector record
-        vector = {
-            "values": embedding,
-            "id": profile_id,  # Use validated ID
-            "metadata": {
-                "profile": json.dumps(profile),
-                "text": text,
-                "timestamp": datetime.utcnow().isoformat()  # Add timestamp for tracking
-            }
-        }
-        
-        # Upload to Pinecone
-        result = index.upsert(
-            vectors=[vector],
-            namespace="profiles"
+            logger.error(f"Profile {profile_id} missing contact information")
+            results[profile_id] = False
+        else:
+            pending.append((profile, profile_id, profile_chunks(profile, profile_id)))
+    return pending
+
+def _changed_chunks(pending: List[Tuple[Dict, str, List[ProfileChunk]]], stored: Dict[str, List[str]]
+                    ) -> Tuple[List[Tuple[str, ProfileChunk]], List[Tuple[str, str]]]:
+    """Given the chunk IDs already stored per profile, the (profile_id, chunk)
+    pairs that need embedding and the (profile_id, vector_id) pairs to delete."""
+    changed, stale = [], []
+    for _, profile_id, chunks in pending:
+        stored_ids = set(stored.get(profile_id, ()))
+        if profile_id in stored and not stored_ids:
+            # Stored before chunking, as one vector under the profile ID
+            stale.append((profile_id, profile_id))
+        chunk_ids = {chunk[0] for chunk in chunks}
+        changed += [(profile_id, chunk) for chunk in chunks if chunk[0] not in stored_ids]
+        stale += [(profile_id, chunk_id) for chunk_id in stored_ids - chunk_ids]
+    return changed, stale
+
+def _cached_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """Embedding cache lookup; None for each text that still needs embedding."""
+    cache = embedding_cache()
+    with timed('embedding_cache'):
+        return cache.get_many(EMBEDDING_MODEL, texts) if cache else [None] * len(texts)
+
+def _fill_embeddings(embeddings: List, texts: List[str], missing: List[int], response) -> None:
+    """Slot the embeddings response for the missing texts into place and cache them."""
+    fresh = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+    for i, embedding in zip(missing, fresh):
+        embeddings[i] = embedding
+    cache = embedding_cache()
+    if cache:
+        try:
+            cache.put_many(EMBEDDING_MODEL, [texts[i] for i in missing], fresh)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to cache {len(missing)} embeddings: {e}")
+
+def _save_documents(stored: List[Tuple[Dict, str, List[ProfileChunk]]]) -> None:
+    """Save the documents and chunk IDs of profiles whose vectors are in place."""
+    with timed('profile_store'):
+        profile_store().put_many(
+            ((profile_id, profile) for profile, profile_id, _ in stored),
+            chunk_ids={profile_id: [chunk[0] for chunk in chunks] for _, profile_id, chunks in stored}
         )
-        
-        logger.info(f"Profile stored in vector database with ID: {profile_id}")
-        return True
-        
+    similarity_cache().invalidate(profile_id for _, profile_id, _ in stored)
+
+def _store_results(pending: List[Tuple[Dict, str, List[ProfileChunk]]], failed: Set[str],
+                   results: Dict[str, bool], changed: int, stale: int) -> Dict[str, bool]:
+    results.update({profile_id: profile_id not in failed for _, profile_id, _ in pending})
+    stored = sum(results.values())
+    logger.info(f"Stored {stored} of {len(results)} profiles in vector database"
+                f" ({changed} chunks embedded, {stale} removed)")
+    return results
+
+def store_profiles_in_vector_db(profiles: List[Tuple[Dict, str]], embed_batch_size: int = 64,
+                                upsert_batch_size: int = 100, max_concurrency: int = 4) -> Dict[str, bool]:
+    """Store many (profile, profile_id) pairs in the vector database.
+
+    Each profile is stored as one vector per section (see profile_chunks).
+    Only chunks not already stored for the profile are embedded, in requests
+    of embed_batch_size texts with up to max_concurrency in flight, and
+    upserted in batches of upsert_batch_size; chunks the profile no longer
+    has are deleted. Returns success per profile ID.
+    """
+    results = {}
+    pending = _pending_profiles(profiles, results)
+    if not pending:
+        return results
+
+    try:
+        # Shared OpenAI client and configured vector store
+        client = clients.openai()
+        store = vector_store()
+        with timed('profile_store'):
+            stored = profile_store().chunk_ids([profile_id for _, profile_id, _ in pending])
+    except Exception as e:
+        logger.error(f"Error storing profile in vector database: {e}")
+        results.update({profile_id: False for _, profile_id, _ in pending})
+        return results
+    changed, stale = _changed_chunks(pending, stored)
+
+    def store_batch(batch: List[Tuple[str, ProfileChunk]]) -> Set[str]:
+        """Embed and upsert a batch of chunks, returning the profile IDs that failed."""
+        texts = [text for _, (_, _, text) in batch]
+        embeddings = _cached_embeddings(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            try:
+                # Generate embeddings for the uncached texts in one request
+                with timed('openai_embed'):
+                    response = client.embeddings.create(
+                        input=[texts[i] for i in missing],
+                        model=EMBEDDING_MODEL,
+                    )
+            except Exception as e:
+                logger.error(f"Error embedding batch of {len(batch)} chunks: {e}")
+                return {profile_id for profile_id, _ in batch}
+            _fill_embeddings(embeddings, texts, missing, response)
+
+        failed = set()
+        vectors = [
+            _chunk_vector(profile_id, chunk, embedding)
+            for (profile_id, chunk), embedding in zip(batch, embeddings)
+        ]
+        for i in range(0, len(vectors), upsert_batch_size):
+            upserts = vectors[i:i + upsert_batch_size]
+            try:
+                with timed('vector_upsert'):
+                    store.upsert(upserts)
+            except Exception as e:
+                logger.error(f"Error upserting batch of {len(upserts)} chunks: {e}")
+                failed.update(vector["metadata"]["profile_ref"] for vector in upserts)
+        return failed
+
+    failed = set()
+    batches = [changed[i:i + embed_batch_size] for i in range(0, len(changed), embed_batch_size)]
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as pool:
+            for batch_failed in pool.map(store_batch, batches):
+                failed |= batch_failed
+
+    # Drop replaced chunks once the new ones are in, then record what is stored
+    removable = [(profile_id, vector_id) for profile_id, vector_id in stale if profile_id not in failed]
+    for i in range(0, len(removable), upsert_batch_size):
+        batch = removable[i:i + upsert_batch_size]
+        try:
+            with timed('vector_delete'):
+                store.delete([vector_id for _, vector_id in batch])
+        except Exception as e:
+            logger.error(f"Error deleting {len(batch)} stale chunks: {e}")
+            failed.update(profile_id for profile_id, _ in batch)
+    try:
+        _save_documents([item for item in pending if item[1] not in failed])
+    except Exception as e:
+        logger.error(f"Error saving profile documents: {e}")
+        failed.update(profile_id for _, profile_id, _ in pending)
+
+    return _store_results(pending, failed, results, len(changed), len(removable))
+
+def store_profile_in_vector_db(profile: Dict, profile_id: str) -> bool:
+    """Store parsed profile in vector database"""
+    return store_profiles_in_vector_db([(profile, profile_id)])[profile_id]
+
+async def astore_profiles_in_vector_db(profiles: List[Tuple[Dict, str]], embed_batch_size: int = 64,
+                                       upsert_batch_size: int = 100, max_concurrency: int = 4) -> Dict[str, bool]:
+    """Async store_profiles_in_vector_db: embedding and upserts are awaited on
+    the asyncio clients, local disk and SQLite work runs on worker threads."""
+    results = {}
+    pending = _pending_profiles(profiles, results)
+    if not pending:
+        return results
+
+    try:
+        client = clients.async_openai()
+        store = vector_store()
+        with timed('profile_store'):
+            stored = await asyncio.to_thread(
+                profile_store().chunk_ids, [profile_id for _, profile_id, _ in pending]
+            )
     except Exception as e:
         logger.error(f"Error storing profile in vector database: {e}")
-        return False
+        results.update({profile_id: False for _, profile_id, _ in pending})
+        return results
+    changed, stale = _changed_chunks(pending, stored)
+
+    in_flight = asyncio.Semaphore(max_concurrency)
+
+    async def store_batch(batch: List[Tuple[str, ProfileChunk]]) -> Set[str]:
+        async with in_flight:
+            texts = [text for _, (_, _, text) in batch]
+            embeddings = await asyncio.to_thread(_cached_embeddings, texts)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            if missing:
+                try:
+                    with timed('openai_embed'):
+                        response = await client.embeddings.create(
+                            input=[texts[i] for i in missing],
+                            model=EMBEDDING_MODEL,
+                        )
+                except Exception as e:
+                    logger.error(f"Error embedding batch of {len(batch)} chunks: {e}")
+                    return {profile_id for profile_id, _ in batch}
+                await asyncio.to_thread(_fill_embeddings, embeddings, texts, missing, response)
+
+            failed = set()
+            vectors = [
+                _chunk_vector(profile_id, chunk, embedding)
+                for (profile_id, chunk), embedding in zip(batch, embeddings)
+            ]
+            for i in range(0, len(vectors), upsert_batch_size):
+                upserts = vectors[i:i + upsert_batch_size]
+                try:
+                    with timed('vector_upsert'):
+                        await store.aupsert(upserts)
+                except Exception as e:
+                    logger.error(f"Error upserting batch of {len(upserts)} chunks: {e}")
+                    failed.update(vector["metadata"]["profile_ref"] for vector in upserts)
+            return failed
+
+    failed = set()
+    batches = [changed[i:i + embed_batch_size] for i in range(0, len(changed), embed_batch_size)]
+    for batch_failed in await asyncio.gather(*(store_batch(batch) for batch in batches)):
+        failed |= batch_failed
+
+    removable = [(profile_id, vector_id) for profile_id, vector_id in stale if profile_id not in failed]
+    for i in range(0, len(removable), upsert_batch_size):
+        batch = removable[i:i + upsert_batch_size]
+        try:
+            with timed('vector_delete'):
+                await store.adelete([vector_id for _, vector_id in batch])
+        except Exception as e:
+            logger.error(f"Error deleting {len(batch)} stale chunks: {e}")
+            failed.update(profile_id for profile_id, _ in batch)
+    try:
+        await asyncio.to_thread(_save_documents, [item for item in pending if item[1] not in failed])
+    except Exception as e:
+        logger.error(f"Error saving profile documents: {e}")
+        failed.update(profile_id for _, profile_id, _ in pending)
+
+    return _store_results(pending, failed, results, len(changed), len(removable))
+
+def _retrieve_profile_record(profile_id: str) -> Tuple[Optional[Dict], Optional[VectorRecord]]:
+    """Profile document plus, when it had to be fetched, its vector record."""
+    with timed('profile_store'):
+        profile_data = profile_store().get(profile_id)
+    if profile_data:
+        return profile_data, None
+
+    # Profiles stored before the document store only exist in the vector DB
+    with timed('vector_fetch'):
+        records = vector_store().fetch([profile_id])
+    return _load_profiles([profile_id], records).get(profile_id), records.get(profile_id)
+
+async def _aretrieve_profile_record(profile_id: str) -> Tuple[Optional[Dict], Optional[VectorRecord]]:
+    with timed('profile_store'):
+        profile_data = await asyncio.to_thread(profile_store().get, profile_id)
+    if profile_data:
+        return profile_data, None
+
+    with timed('vector_fetch'):
+        records = await vector_store().afetch([profile_id])
+    profiles = await asyncio.to_thread(_load_profiles, [profile_id], records)
+    return profiles.get(profile_id), records.get(profile_id)
 
 def retrieve_profile(profile_id: str) -> Optional[Dict]:
     """Retrieve a specific profile by ID."""
     try:
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        index = pc.Index('linkedin-profiles')
+        profile_data, _ = _retrieve_profile_record(profile_id)
         
-        result = index.fetch(
-            ids=[profile_id],
-            namespace="profiles"
-        )
-        
-        if not result.vectors:
+        if not profile_data:
             logger.warning(f"No profile found with ID: {profile_id}")
             return None
             
-        # Parse stored JSON back to dict
-        profile_data = json.loads(result.vectors[profile_id].metadata['profile'])
         return profile_data
         
     except Exception as e:
         logger.error(f"Error retrieving profile: {e}")
         return None
 
-def find_similar_profiles(profile_id: str, top_k: int = 5) -> List[Dict]:
-    """Find similar profiles to a given profile."""
+async def aretrieve_profile(profile_id: str) -> Optional[Dict]:
+    """Async retrieve_profile for the ASGI app."""
     try:
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        index = pc.Index('linkedin-profiles')
-        
-        # First get the vector for our target profile
-        result = index.fetch(
-            ids=[profile_id],
-            namespace="profiles"
-        )
-        
-        if not result.vectors:
-            raise ValueError(f"No profile found with ID: {profile_id}")
-            
-        # Use the vector to find similar profiles
-        query_response = index.query(
-            vector=result.vectors[profile_id].values,
-            top_k=top_k,
-            namespace="profiles",
-            include_metadata=True
-        )
-        
-        # Convert results to list of profiles
-        similar_profiles = []
-        for match in query_response.matches:
-            profile_data = json.loads(match.metadata['profile'])
-            similar_profiles.append({
-                'profile': profile_data,
-                'score': match.score
-            })
-            
-        return similar_profiles
+        profile_data, _ = await _aretrieve_profile_record(profile_id)
+        if not profile_data:
+            logger.warning(f"No profile found with ID: {profile_id}")
+        return profile_data or None
+    except Exception as e:
+        logger.error(f"Error retrieving profile: {e}")
+        return None
+
+def retrieve_profiles(profile_ids: List[str]) -> Dict[str, Dict]:
+    """Retrieve many profiles with one profile store query (and one vector
+    fetch for any stored before it); IDs that are not found are left out."""
+    profile_ids = list(dict.fromkeys(profile_ids))
+    with timed('profile_store'):
+        profiles = profile_store().get_many(profile_ids)
+    missing = [profile_id for profile_id in profile_ids if profile_id not in profiles]
+    if missing:
+        with timed('vector_fetch'):
+            records = vector_store().fetch(missing)
+        profiles.update(_load_profiles(missing, records))
+    return profiles
+
+def _chunk_match_lists(store: VectorStore, profile_id: str, top_k: int) -> Optional[List[List[VectorMatch]]]:
+    """Matches for each of the profile's chunk vectors; None if it has none."""
+    with timed('profile_store'):
+        chunk_ids = profile_store().chunk_ids([profile_id]).get(profile_id)
+    # Profiles stored before chunking have one vector under their own ID
+    with timed('vector_query'):
+        match_lists = store.query_many_by_id(chunk_ids or [profile_id], top_k=top_k)
+    return [matches for matches in match_lists if matches is not None] or None
+
+async def _achunk_match_lists(store: VectorStore, profile_id: str, top_k: int) -> Optional[List[List[VectorMatch]]]:
+    with timed('profile_store'):
+        chunk_ids = (await asyncio.to_thread(profile_store().chunk_ids, [profile_id])).get(profile_id)
+    with timed('vector_query'):
+        match_lists = await store.aquery_many_by_id(chunk_ids or [profile_id], top_k=top_k)
+    return [matches for matches in match_lists if matches is not None] or None
+
+def _similar_results(profile_id: str, top_k: int, match_lists: Optional[List[List[VectorMatch]]]) -> List[Dict]:
+    """Rank profiles by their chunk matches, load them and cache the result.
+
+    Each list holds the matches for one query vector. A profile scores the
+    mean over the lists of its best match in each (0 where it has none), so
+    profiles alike in every section outrank ones sharing a single section.
+    """
+    if match_lists is None:
+        raise ValueError(f"No profile found with ID: {profile_id}")
+
+    totals: Dict[str, float] = {}
+    records = {}
+    for matches in match_lists:
+        best: Dict[str, float] = {}
+        for match in matches:
+            ref = match.metadata.get('profile_ref', match.id)
+            if ref not in best or match.score > best[ref]:
+                best[ref] = match.score
+            records.setdefault(ref, match)
+        for ref, score in best.items():
+            totals[ref] = totals.get(ref, 0.0) + score
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    # Convert results to list of profiles
+    with timed('profile_store'):
+        profiles = _load_profiles([ref for ref, _ in ranked], records)
+    similar_profiles = []
+    for ref, total in ranked:
+        profile_data = profiles.get(ref)
+        if profile_data is None:
+            continue
+        similar_profiles.append({
+            'profile': profile_data,
+            'score': total / len(match_lists)
+        })
+
+    similarity_cache().put(profile_id, top_k, similar_profiles)
+    return similar_profiles
+
+def find_similar_profiles(profile_id: str, top_k: int = 5,
+                          vector: Optional[List[float]] = None) -> List[Dict]:
+    """Find similar profiles to a given profile.
+    Each of the profile's chunk vectors (or the given vector) is queried
+    for top_k * SIMILAR_CHUNK_FANOUT chunks, and the matches are ranked per
+    profile. Results are cached per (profile_id, top_k) until the profile
+    is stored again."""
+    try:
+        cached = similarity_cache().get(profile_id, top_k)
+        if cached is not None:
+            return cached
+
+        store = vector_store()
+        if vector is not None:
+            with timed('vector_query'):
+                match_lists = [store.query(vector, top_k=top_k * SIMILAR_CHUNK_FANOUT)]
+        else:
+            match_lists = _chunk_match_lists(store, profile_id, top_k * SIMILAR_CHUNK_FANOUT)
+
+        return _similar_results(profile_id, top_k, match_lists)
         
     except Exception as e:
         logger.error(f"Error finding similar profiles: {e}")
         return []
 
+async def afind_similar_profiles(profile_id: str, top_k: int = 5,
+                                 vector: Optional[List[float]] = None) -> List[Dict]:
+    """Async find_similar_profiles, awaiting the queries on the asyncio client."""
+    try:
+        cached = similarity_cache().get(profile_id, top_k)
+        if cached is not None:
+            return cached
+
+        store = vector_store()
+        if vector is not None:
+            with timed('vector_query'):
+                match_lists = [await store.aquery(vector, top_k=top_k * SIMILAR_CHUNK_FANOUT)]
+        else:
+            match_lists = await _achunk_match_lists(store, profile_id, top_k * SIMILAR_CHUNK_FANOUT)
+
+        return await asyncio.to_thread(_similar_results, profile_id, top_k, match_lists)
+
+    except Exception as e:
+        logger.error(f"Error finding similar profiles: {e}")
+        return []
+
 def generate_resume(profile_id: str) -> Optional[Dict]:
     """Generate a resume for a given profile."""
     try:
         # 1. Retrieve the profile
-        profile = retrieve_profile(profile_id)
+        profile, record = _retrieve_profile_record(profile_id)
         if not profile:
             raise ValueError(f"Profile not found: {profile_id}")
             
-        # 2. Find similar profiles for reference
-        similar_profiles = find_similar_profiles(profile_id, top_k=3)
+        # 2. Find similar profiles for reference, reusing the vector if it was fetched
+        similar_profiles = find_similar_profiles(
+            profile_id, top_k=3, vector=record.values if record is not None else None
+        )
         
         # 3. Prepare context for AI
         context = {
@@ -457,22 +900,65 @@ def generate_resume(profile_id: str) -> Optional[Dict]:
         logger.error(f"Error generating resume: {e}")
         return None
 
-# Update parse_linkedin_pdf to return the profile ID
-def parse_linkedin_pdf(pdf_path: str, store_in_db: bool = True) -> Tuple[str, Dict]:
+def _store_parsed_profile(profile_data: Dict, profile_id: str, cache: Optional[ParseCache],
+                          digest: Optional[str]) -> None:
+    """Background job body: store a parsed profile, raising so it can be retried."""
+    if not store_profile_in_vector_db(profile_data, profile_id):
+        raise RuntimeError(f"Failed to store profile {profile_id} in vector database")
+    if cache is not None:
+        cache.put(digest, profile_id, profile_data)
+
+def parse_linkedin_pdf(pdf_source: PDFSource, store_in_db: bool = True,
+                       cache: Optional[ParseCache] = None,
+                       jobs: Optional[JobQueue] = None) -> Tuple[str, Dict]:
     """Parse LinkedIn PDF and optionally store in vector database.
+    Accepts a file path, raw PDF bytes or a binary file-like object.
+    When a cache is given, repeat uploads of the same PDF reuse the earlier
+    parse and profile ID instead of parsing and embedding again.
+    When a job queue is given, storing runs in the background as a job keyed
+    by the returned profile ID instead of before this function returns.
     Returns tuple of (profile_id, profile_data)"""
     try:
+        digest = None
+        profile_data = None
+        if cache is not None:
+            if isinstance(pdf_source, (str, Path)):
+                pdf_source = Path(pdf_source).read_bytes()
+            elif not isinstance(pdf_source, bytes):
+                pdf_source = pdf_source.read()
+            digest = pdf_digest(pdf_source)
+
+            cached = cache.get(digest)
+            if cached:
+                logger.info(f"Parse cache hit for PDF {digest[:12]}")
+                if cached[0] or not store_in_db:
+                    return cached
+                profile_data = cached[1]
+
         # Parse PDF
-        parser = LinkedInPDFParser(pdf_path)
-        profile_data = parser.parse()
+        if profile_data is None:
+            parser = LinkedInPDFParser(pdf_source)
+            profile_data = parser.parse()
         profile_id = None
-        
-        # Store in vector database if requested
-        if store_in_db:
-            profile_id = f"profile_{uuid.uuid4()}"
-            store_success = store_profile_in_vector_db(profile_data, profile_id)
-            if not store_success:
-                logger.warning("Failed to store profile in vector database")
+
+        if not store_in_db:
+            if cache is not None:
+                cache.put(digest, None, profile_data)
+            return profile_id, profile_data
+
+        # Store in vector database, in the background if a queue is available
+        profile_id = f"profile_{uuid.uuid4()}"
+        if jobs is not None:
+            jobs.submit(_store_parsed_profile, profile_data, profile_id, cache, digest, key=profile_id)
+            return profile_id, profile_data
+
+        try:
+            _store_parsed_profile(profile_data, profile_id, cache, digest)
+        except RuntimeError:
+            logger.warning("Failed to store profile in vector database")
+            # Still remember the parse; only stored IDs are worth reusing
+            if cache is not None:
+                cache.put(digest, None, profile_data)
         
         return profile_id, profile_data
         
@@ -480,6 +966,77 @@ def parse_linkedin_pdf(pdf_path: str, store_in_db: bool = True) -> Tuple[str, Di
         logger.error(f"Failed to parse LinkedIn PDF: {e}")
         raise
 
+async def _astore_parsed_profile(profile_data: Dict, profile_id: str, cache: Optional[ParseCache],
+                                 digest: Optional[str]) -> None:
+    """Async _store_parsed_profile, run as a submit_async job."""
+    if not (await astore_profiles_in_vector_db([(profile_data, profile_id)]))[profile_id]:
+        raise RuntimeError(f"Failed to store profile {profile_id} in vector database")
+    if cache is not None:
+        await asyncio.to_thread(cache.put, digest, profile_id, profile_data)
+
+def parse_pdf_bytes(pdf_bytes: bytes) -> Tuple[Dict, List[Tuple[str, float]]]:
+    """Parse a PDF, returning the profile and its stage timings. Module-level
+    so it can run in a process pool, whose metrics the parent never sees."""
+    begin_request()
+    return LinkedInPDFParser(pdf_bytes).parse(), request_timings()
+
+async def _aparse(pdf_bytes: bytes, executor: Optional[Executor]) -> Dict:
+    if executor is None:
+        return await asyncio.to_thread(LinkedInPDFParser(pdf_bytes).parse)
+    profile_data, timings = await asyncio.get_running_loop().run_in_executor(
+        executor, parse_pdf_bytes, pdf_bytes
+    )
+    for stage, seconds in timings:
+        observe(stage, seconds)
+    return profile_data
+
+async def aparse_linkedin_pdf(pdf_bytes: bytes, store_in_db: bool = True,
+                              cache: Optional[ParseCache] = None,
+                              jobs: Optional[JobQueue] = None,
+                              executor: Optional[Executor] = None) -> Tuple[str, Dict]:
+    """Async parse_linkedin_pdf for the ASGI app.
+    Parsing runs on the given executor (e.g. a process pool, since it is
+    CPU-bound) or a worker thread; storing is awaited, or submitted with
+    jobs.submit_async when a job queue is given.
+    Returns tuple of (profile_id, profile_data)"""
+    try:
+        digest = None
+        profile_data = None
+        if cache is not None:
+            digest = pdf_digest(pdf_bytes)
+            cached = await asyncio.to_thread(cache.get, digest)
+            if cached:
+                logger.info(f"Parse cache hit for PDF {digest[:12]}")
+                if cached[0] or not store_in_db:
+                    return cached
+                profile_data = cached[1]
+
+        if profile_data is None:
+            profile_data = await _aparse(pdf_bytes, executor)
+
+        if not store_in_db:
+            if cache is not None:
+                await asyncio.to_thread(cache.put, digest, None, profile_data)
+            return None, profile_data
+
+        profile_id = f"profile_{uuid.uuid4()}"
+        if jobs is not None:
+            jobs.submit_async(_astore_parsed_profile, profile_data, profile_id, cache, digest, key=profile_id)
+            return profile_id, profile_data
+
+        try:
+            await _astore_parsed_profile(profile_data, profile_id, cache, digest)
+        except RuntimeError:
+            logger.warning("Failed to store profile in vector database")
+            if cache is not None:
+                await asyncio.to_thread(cache.put, digest, None, profile_data)
+
+        return profile_id, profile_data
+
+    except Exception as e:
+        logger.error(f"Failed to parse LinkedIn PDF: {e}")
+        raise
+
 # Example usage
 if __name__ == "__main__":
     try:
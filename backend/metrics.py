@@ -0,0 +1,186 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds; spans PDF text extraction (ms) up to pdflatex runs (s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Under several server processes (serve.py), each one writes its series
+# here every METRICS_FLUSH_SECONDS and /metrics on any of them reports the
+# sum over all of them
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+
+# Stage timings of the request being handled, for the Server-Timing header
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = \
+    contextvars.ContextVar('request_timings', default=None)
+
+class Histogram:
+    """Cumulative Prometheus-style histogram, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List] = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        if METRICS_DIR and _flusher_pid != os.getpid():
+            _start_flusher()
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def snapshot(self) -> List[Tuple[Tuple[str, ...], List[int], float, int]]:
+        """(labels, bucket counts, sum, count) for every series."""
+        with self._lock:
+            return [(labels, list(counts), total, count)
+                    for labels, (counts, total, count) in self._series.items()]
+
+    def exposition(self, series: Optional[List] = None) -> List[str]:
+        """Lines in the Prometheus text format, for this process's series
+        or the given (e.g. merged) snapshot."""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        series = sorted(self.snapshot() if series is None else series)
+        for labels, counts, total, count in series:
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_labels(pairs + [le])} {cumulative}')
+            le = 'le="+Inf"'
+            lines.append(f'{self.name}_bucket{_labels(pairs + [le])} {count}')
+            label_text = _labels(pairs) if pairs else ''
+            lines.append(f'{self.name}_sum{label_text} {total}')
+            lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+def _labels(pairs: List[str]) -> str:
+    return '{' + ','.join(pairs) + '}'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+STAGE_SECONDS = Histogram(
+    'resume_stage_seconds', 'Time spent in each processing stage.', ('stage',)
+)
+REQUEST_SECONDS = Histogram(
+    'resume_http_request_seconds', 'HTTP request latency.', ('method', 'endpoint', 'status')
+)
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time a block (or, as a decorator, a function) as one processing stage.
+
+    The duration feeds the stage histogram and, inside a request, that
+    request's Server-Timing header.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+def observe(stage: str, seconds: float) -> None:
+    """Record a stage duration measured by the caller."""
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+def begin_request() -> None:
+    """Start collecting stage timings for the current request."""
+    _request_timings.set([])
+
+def request_timings() -> List[Tuple[str, float]]:
+    """Stage timings collected so far for the current request, e.g. to hand
+    back from a worker process for the parent to observe."""
+    return list(_request_timings.get() or [])
+
+def server_timing(total: Optional[float] = None) -> str:
+    """Server-Timing header value for the current request's stages (in ms)."""
+    durations: Dict[str, float] = {}
+    for stage, seconds in _request_timings.get() or []:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    entries = [f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in durations.items()]
+    if total is not None:
+        entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+HISTOGRAMS = (STAGE_SECONDS, REQUEST_SECONDS)
+
+def _flush() -> None:
+    """Write this process's series to METRICS_DIR for the others to merge."""
+    path = os.path.join(METRICS_DIR, f'metrics_{os.getpid()}.json')
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump({histogram.name: histogram.snapshot() for histogram in HISTOGRAMS}, f)
+    os.replace(f'{path}.tmp', path)
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            _flush()
+        except OSError:
+            pass
+
+_flusher_pid: Optional[int] = None
+_flusher_lock = threading.Lock()
+
+def _start_flusher() -> None:
+    global _flusher_pid
+    with _flusher_lock:
+        if _flusher_pid != os.getpid():
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+            _flusher_pid = os.getpid()
+
+def _merged() -> Dict[str, List]:
+    """Series summed over every process that has written to METRICS_DIR."""
+    _flush()
+    merged: Dict[str, Dict[Tuple[str, ...], List]] = {histogram.name: {} for histogram in HISTOGRAMS}
+    for name in os.listdir(METRICS_DIR):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for histogram_name, series in snapshot.items():
+            target = merged.get(histogram_name)
+            if target is None:
+                continue
+            for labels, counts, total, count in series:
+                entry = target.setdefault(tuple(labels), [[0] * len(counts), 0.0, 0])
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+    return {name: [(labels, counts, total, count) for labels, (counts, total, count) in series.items()]
+            for name, series in merged.items()}
+
+def exposition() -> str:
+    """Every histogram in the Prometheus text format; with METRICS_DIR set,
+    summed over all server processes."""
+    if METRICS_DIR:
+        _start_flusher()
+        merged = _merged()
+        lines = [line for histogram in HISTOGRAMS for line in histogram.exposition(merged[histogram.name])]
+    else:
+        lines = [line for histogram in HISTOGRAMS for line in histogram.exposition()]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from profilemodel import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the parser's output changes, so entries parsed by an
+# older version are parsed again instead of served
+PARSER_VERSION = 2
+
+def pdf_digest(pdf_bytes: bytes) -> str:
+    """Content hash used as the cache key for an uploaded PDF."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+class ParseCache:
+    """Two-tier cache mapping a PDF hash to (profile_id, parsed profile).
+
+    The in-process tier is an LRU bounded by entry count; it keeps each
+    entry as the JSON bytes of its file, so every hit decodes a fresh dict
+    that callers are free to modify. The on-disk tier holds one JSON file
+    per hash and is bounded by total size in bytes, evicting the least
+    recently used files first.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 256, max_disk_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Running size of the disk tier; None until the first put scans it.
+        # Other processes share the directory, so this is an estimate, and
+        # it is rescanned before anything is evicted.
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, digest: str) -> Optional[Tuple[Optional[str], Dict]]:
+        """Return (profile_id, profile_data) for a hash, or None on a miss."""
+        with self._lock:
+            if digest in self.memory:
+                self.memory.move_to_end(digest)
+                self.hits += 1
+                return self._decode(self.memory[digest])
+
+            path = self._path(digest)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                entry = json_loads(data)
+                os.utime(path)  # Refresh recency for disk eviction
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable parse cache entry {digest}: {e}")
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            if entry.get('parser_version', 1) != PARSER_VERSION:
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            self._remember(digest, data)
+            self.hits += 1
+            return entry.get('profile_id'), entry['profile']
+
+    def put(self, digest: str, profile_id: Optional[str], profile: Dict) -> None:
+        """Store a parsed profile in both tiers."""
+        with self._lock:
+            data = json_dumps({'profile_id': profile_id, 'profile': profile,
+                               'parser_version': PARSER_VERSION}).encode()
+            self._remember(digest, data)
+
+            path = self._path(digest)
+            temp_path = path.with_suffix('.tmp')
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                try:
+                    replaced = path.stat().st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to write parse cache entry {digest}: {e}")
+                return
+
+            if self._disk_bytes is None:
+                self._evict_disk()
+            else:
+                self._disk_bytes += len(data) - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+
+    @staticmethod
+    def _decode(data: bytes) -> Tuple[Optional[str], Dict]:
+        entry = json_loads(data)
+        return entry.get('profile_id'), entry['profile']
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        self.memory[digest] = data
+        self.memory.move_to_end(digest)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        """Rescan the disk tier and remove least recently used files until it
+        fits its budget."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self.memory.pop(path.stem, None)
+            total -= size
+        self._disk_bytes = total
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current tier sizes."""
+        with self._lock:
+            if self._disk_bytes is None:
+                self._evict_disk()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self.memory),
+                'disk_bytes': self._disk_bytes,
+            }
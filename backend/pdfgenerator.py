@@ -0,0 +1,184 @@
+import fitz  # PyMuPDF
+import io
+from html import escape
+from typing import Dict, List, Optional
+
+from latexgenerator import ResumeTheme
+from metrics import timed
+
+# Matches the LaTeX article defaults used by ResumeGenerator
+PAGE_RECT = fitz.paper_rect('letter')
+MARGIN = 0.7 * 72
+COLUMN_GAP = 0.05
+
+FONT_FAMILIES = {
+    'helvetica': 'sans-serif',
+    'times': 'serif',
+}
+
+def css_color(value: str) -> str:
+    """Translate a theme color ('black' or an 'r,g,b' triple) to CSS."""
+    parts = [p.strip() for p in value.split(',')]
+    if len(parts) != 3:
+        return value.strip()
+    channels = [float(p) for p in parts]
+    if all(c <= 1 for c in channels):
+        channels = [c * 255 for c in channels]
+    return '#' + ''.join(f'{round(c):02x}' for c in channels)
+
+class FastResumeGenerator:
+    """Renders the same resume layouts as ResumeGenerator straight to PDF
+    with PyMuPDF's HTML Story engine, so no TeX installation is involved."""
+
+    def __init__(self, profile_data: Dict, theme: Optional[ResumeTheme] = None):
+        self.profile = profile_data
+        self.theme = theme or ResumeTheme()
+
+    def _css(self) -> str:
+        """Stylesheet equivalent of ResumeGenerator._setup_document"""
+        primary = css_color(self.theme.primary_color)
+        accent = css_color(self.theme.accent_color)
+        heading = f'color: {primary};' if self.theme.section_style in ('modern', 'classic') else ''
+        rule = f'border-bottom: 1px solid {accent};' if self.theme.section_style == 'modern' else ''
+        return f'''
+            body {{
+                font-family: {FONT_FAMILIES.get(self.theme.font_family, 'serif')};
+                font-size: {self.theme.font_size};
+            }}
+            h1 {{ font-size: 1.44em; font-weight: bold; text-align: center; margin: 0 0 0.3em 0; }}
+            h2 {{ font-size: 1.44em; font-weight: bold; margin: 0.8em 0 0.4em 0; {heading} {rule} }}
+            p {{ margin: 0; }}
+            .contact {{ text-align: center; margin-bottom: 1em; }}
+            .meta {{ color: {accent}; }}
+            .entry {{ margin-bottom: 1em; }}
+            ul {{ margin: 0.3em 0 0 0; }}
+        '''
+
+    def _section(self, title: str) -> str:
+        if self.theme.section_style == 'classic':
+            title = title.upper()
+        return f'<h2>{escape(title)}</h2>'
+
+    def _header(self) -> str:
+        """Contact information header"""
+        contact = self.profile.get('contact', {})
+        details = [contact[key] for key in ('email', 'location', 'linkedin_url') if contact.get(key)]
+        return (
+            f'<h1>{escape(contact.get("name", ""))}</h1>'
+            f'<p class="contact">{" | ".join(escape(d) for d in details)}</p>'
+        )
+
+    def _summary(self) -> str:
+        if summary := self.profile.get('summary'):
+            return self._section('Professional Summary') + f'<p>{escape(summary)}</p>'
+        return ''
+
+    def _experience(self) -> str:
+        if not (experiences := self.profile.get('experience')):
+            return ''
+        parts = [self._section('Professional Experience')]
+        for exp in experiences:
+            parts.append('<div class="entry">')
+            parts.append(
+                f'<p><b>{escape(exp["company"])}</b> '
+                f'<span class="meta">{escape(exp["dates"]["start"])} - {escape(exp["dates"]["end"])}</span></p>'
+            )
+            parts.append(f'<p><i>{escape(exp["title"])}</i> <span class="meta">{escape(exp["location"])}</span></p>')
+            bullets = [b.strip() for b in exp.get('description', '').split('\n') if b.strip()]
+            if bullets:
+                parts.append('<ul>' + ''.join(f'<li>{escape(b)}</li>' for b in bullets) + '</ul>')
+            parts.append('</div>')
+        return ''.join(parts)
+
+    def _education(self) -> str:
+        if not (education := self.profile.get('education')):
+            return ''
+        parts = [self._section('Education')]
+        for edu in education:
+            degree = edu['degree'] + (' in ' + edu['field'] if edu.get('field') else '')
+            parts.append(
+                f'<div class="entry"><p><b>{escape(edu["school"])}</b> '
+                f'<span class="meta">{escape(edu["dates"]["start"])} - {escape(edu["dates"]["end"])}</span></p>'
+                f'<p><i>{escape(degree)}</i></p></div>'
+            )
+        return ''.join(parts)
+
+    def _skills(self) -> str:
+        if not (skills := self.profile.get('skills')):
+            return ''
+        return self._section('Skills') + '<ul>' + ''.join(f'<li>{escape(s)}</li>' for s in skills) + '</ul>'
+
+    def _certifications(self) -> str:
+        if not (certifications := self.profile.get('certifications')):
+            return ''
+        parts = [self._section('Certifications')]
+        for cert in certifications:
+            issuer = f'<p><i>{escape(cert["issuer"])}</i></p>' if cert.get('issuer') else ''
+            parts.append(
+                f'<div class="entry"><p><b>{escape(cert["name"])}</b> '
+                f'<span class="meta">{escape(cert["date"])}</span></p>{issuer}</div>'
+            )
+        return ''.join(parts)
+
+    def _columns(self) -> List[tuple]:
+        """(html, width share) for each column of the chosen layout"""
+        if self.theme.layout == 'modern':
+            return [
+                (self._skills() + self._education() + self._certifications(), 0.3),
+                (self._summary() + self._experience(), 0.65),
+            ]
+        return [(
+            self._summary() + self._experience() + self._education() + self._skills() + self._certifications(),
+            1.0
+        )]
+
+    @timed('pymupdf_render')
+    def _write(self, target) -> None:
+        css = self._css()
+        body = PAGE_RECT + (MARGIN, MARGIN, -MARGIN, -MARGIN)
+        header = fitz.Story(html=self._header(), user_css=css)
+        columns = [(fitz.Story(html=html, user_css=css), share) for html, share in self._columns()]
+        pending = [True] * len(columns)
+
+        writer = fitz.DocumentWriter(target)
+        first_page = True
+        while first_page or any(pending):
+            device = writer.begin_page(PAGE_RECT)
+            top = body.y0
+            if first_page:
+                _, filled = header.place(body)
+                header.draw(device)
+                top = fitz.Rect(filled).y1
+                first_page = False
+
+            x = body.x0
+            for i, (story, share) in enumerate(columns):
+                width = body.width * share
+                if pending[i]:
+                    more, _ = story.place(fitz.Rect(x, top, x + width, body.y1))
+                    story.draw(device)
+                    pending[i] = bool(more)
+                x += width + body.width * COLUMN_GAP
+            writer.end_page()
+        writer.close()
+
+    def generate(self, output_path: str, timeout: Optional[float] = None) -> str:
+        """Generate the resume and return the path to the PDF file.
+
+        The timeout is accepted for interface parity with ResumeGenerator;
+        rendering happens in-process and has no subprocess to kill.
+        """
+        try:
+            self._write(f"{output_path}.pdf")
+            return f"{output_path}.pdf"
+        except Exception as e:
+            raise Exception(f"Failed to generate resume: {str(e)}")
+
+    def generate_bytes(self, timeout: Optional[float] = None, keep_tex_dir: Optional[str] = None) -> bytes:
+        """Generate the resume entirely in memory and return the PDF bytes."""
+        try:
+            buffer = io.BytesIO()
+            self._write(buffer)
+            return buffer.getvalue()
+        except Exception as e:
+            raise Exception(f"Failed to generate resume: {str(e)}")
@@ -0,0 +1,90 @@
+import fitz  # PyMuPDF
+import asyncio
+import contextvars
+import hashlib
+import io
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+
+from metrics import timed
+
+try:
+    from PIL import Image
+except ImportError:  # WebP previews need Pillow; PNG works without it
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Preview formats and their MIME types
+PREVIEW_FORMATS = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+}
+MIN_DPI = 24
+MAX_DPI = 150
+
+def preview_key(render_key: str, dpi: int, fmt: str, page: int = 0) -> str:
+    """Cache key (and ETag) for one page of a rendered resume at a DPI and format."""
+    return hashlib.sha256(f"{render_key}:{page}:{dpi}:{fmt}".encode()).hexdigest()
+
+def validate_preview(dpi: int, fmt: str) -> None:
+    """Raise ValueError for a DPI or format the preview endpoint does not serve."""
+    if fmt not in PREVIEW_FORMATS:
+        raise ValueError(f"Unknown preview format: {fmt}")
+    if fmt == 'webp' and Image is None:
+        raise ValueError("WebP previews require Pillow")
+    if not MIN_DPI <= dpi <= MAX_DPI:
+        raise ValueError(f"Preview DPI must be between {MIN_DPI} and {MAX_DPI}")
+
+@timed('rasterize')
+def rasterize_page(pdf_bytes: bytes, dpi: int = 50, fmt: str = 'png', page: int = 0) -> bytes:
+    """Rasterize one page of a PDF to PNG or WebP bytes."""
+    validate_preview(dpi, fmt)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        pix = doc[page].get_pixmap(dpi=dpi, alpha=False)
+    if fmt == 'png':
+        return pix.tobytes('png')
+    buffer = io.BytesIO()
+    Image.frombytes('RGB', (pix.width, pix.height), pix.samples).save(buffer, format='WEBP', quality=80)
+    return buffer.getvalue()
+
+class PreviewRenderer:
+    """Rasterizes resume pages on a small pool of worker threads so the
+    request thread only waits for the result."""
+
+    def __init__(self, workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='preview')
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.render_seconds_total = 0.0
+
+    def render(self, pdf_bytes: bytes, dpi: int, fmt: str, page: int = 0) -> bytes:
+        """Rasterize a page off the calling thread and return the image bytes."""
+        return self._submit(pdf_bytes, dpi, fmt, page).result()
+
+    async def render_async(self, pdf_bytes: bytes, dpi: int, fmt: str, page: int = 0) -> bytes:
+        """Like render, awaiting the result instead of blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(pdf_bytes, dpi, fmt, page))
+
+    def _submit(self, pdf_bytes: bytes, dpi: int, fmt: str, page: int) -> Future:
+        validate_preview(dpi, fmt)
+        context = contextvars.copy_context()
+        return self._pool.submit(context.run, self._run, pdf_bytes, dpi, fmt, page)
+
+    def _run(self, pdf_bytes: bytes, dpi: int, fmt: str, page: int) -> bytes:
+        start = time.perf_counter()
+        image = rasterize_page(pdf_bytes, dpi, fmt, page)
+        with self._lock:
+            self.rendered += 1
+            self.render_seconds_total += time.perf_counter() - start
+        return image
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'rendered': self.rendered,
+                'render_seconds_avg': self.render_seconds_total / self.rendered if self.rendered else 0.0,
+            }
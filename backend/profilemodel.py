@@ -0,0 +1,208 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # The stdlib encoder works, just several times slower
+    orjson = None
+
+# Bumped whenever the row layout below changes
+ROW_VERSION = 1
+
+@dataclass(slots=True)
+class DateRange:
+    start: str
+    end: str = "Present"
+
+    def to_dict(self) -> Dict:
+        return {'start': self.start, 'end': self.end}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DateRange':
+        return cls(data.get('start', ''), data.get('end', 'Present'))
+
+@dataclass(slots=True)
+class Contact:
+    name: str
+    email: str
+    location: str
+    linkedin_url: str
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'email': self.email, 'location': self.location,
+                'linkedin_url': self.linkedin_url}
+
+    def to_row(self) -> List:
+        return [self.name, self.email, self.location, self.linkedin_url]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Contact':
+        return cls(data.get('name', ''), data.get('email', ''), data.get('location', ''),
+                   data.get('linkedin_url', ''))
+
+@dataclass(slots=True)
+class Experience:
+    company: str
+    title: str
+    location: str
+    dates: DateRange
+    description: str
+
+    def to_dict(self) -> Dict:
+        return {'company': self.company, 'title': self.title, 'location': self.location,
+                'dates': self.dates.to_dict(), 'description': self.description}
+
+    def to_row(self) -> List:
+        return [self.company, self.title, self.location, self.dates.start, self.dates.end, self.description]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Experience':
+        return cls(data.get('company', ''), data.get('title', ''), data.get('location', ''),
+                   DateRange.from_dict(data.get('dates') or {}), data.get('description', ''))
+
+    @classmethod
+    def from_row(cls, row: List) -> 'Experience':
+        return cls(row[0], row[1], row[2], DateRange(row[3], row[4]), row[5])
+
+@dataclass(slots=True)
+class Education:
+    school: str
+    degree: str
+    field: str
+    dates: DateRange
+
+    def to_dict(self) -> Dict:
+        return {'school': self.school, 'degree': self.degree, 'field': self.field,
+                'dates': self.dates.to_dict()}
+
+    def to_row(self) -> List:
+        return [self.school, self.degree, self.field, self.dates.start, self.dates.end]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Education':
+        return cls(data.get('school', ''), data.get('degree', ''), data.get('field', ''),
+                   DateRange.from_dict(data.get('dates') or {}))
+
+    @classmethod
+    def from_row(cls, row: List) -> 'Education':
+        return cls(row[0], row[1], row[2], DateRange(row[3], row[4]))
+
+@dataclass(slots=True)
+class Certification:
+    name: str
+    issuer: str
+    date: str
+    expires: str = ""
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'issuer': self.issuer, 'date': self.date, 'expires': self.expires}
+
+    def to_row(self) -> List:
+        return [self.name, self.issuer, self.date, self.expires]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Certification':
+        return cls(data.get('name', ''), data.get('issuer', ''), data.get('date', ''),
+                   data.get('expires', ''))
+
+@dataclass(slots=True)
+class Profile:
+    """A parsed LinkedIn profile.
+
+    to_dict gives the JSON shape the API, renderers and render keys use,
+    leaving out empty sections; to_row/encode_profile give a positional
+    form without the repeated keys for storage.
+    """
+    contact: Optional[Contact] = None
+    summary: str = ""
+    experience: List[Experience] = field(default_factory=list)
+    education: List[Education] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+    certifications: List[Certification] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+    other: str = ""
+
+    def to_dict(self) -> Dict:
+        result = {}
+        if self.contact is not None:
+            result['contact'] = self.contact.to_dict()
+        if self.summary:
+            result['summary'] = self.summary
+        if self.experience:
+            result['experience'] = [exp.to_dict() for exp in self.experience]
+        if self.education:
+            result['education'] = [edu.to_dict() for edu in self.education]
+        if self.skills:
+            result['skills'] = list(self.skills)
+        if self.certifications:
+            result['certifications'] = [cert.to_dict() for cert in self.certifications]
+        if self.languages:
+            result['languages'] = list(self.languages)
+        if self.other:
+            result['other'] = self.other
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Profile':
+        contact = data.get('contact')
+        return cls(
+            contact=Contact.from_dict(contact) if contact else None,
+            summary=data.get('summary', ''),
+            experience=[Experience.from_dict(exp) for exp in data.get('experience', ())],
+            education=[Education.from_dict(edu) for edu in data.get('education', ())],
+            skills=list(data.get('skills', ())),
+            certifications=[Certification.from_dict(cert) for cert in data.get('certifications', ())],
+            languages=list(data.get('languages', ())),
+            other=data.get('other', ''),
+        )
+
+    def to_row(self) -> List:
+        return [
+            ROW_VERSION,
+            self.contact.to_row() if self.contact is not None else None,
+            self.summary,
+            [exp.to_row() for exp in self.experience],
+            [edu.to_row() for edu in self.education],
+            self.skills,
+            [cert.to_row() for cert in self.certifications],
+            self.languages,
+            self.other,
+        ]
+
+    @classmethod
+    def from_row(cls, row: List) -> 'Profile':
+        if row[0] != ROW_VERSION:
+            raise ValueError(f"Unsupported profile row version: {row[0]}")
+        return cls(
+            contact=Contact(*row[1]) if row[1] is not None else None,
+            summary=row[2],
+            experience=[Experience.from_row(exp) for exp in row[3]],
+            education=[Education.from_row(edu) for edu in row[4]],
+            skills=row[5],
+            certifications=[Certification(*cert) for cert in row[6]],
+            languages=row[7],
+            other=row[8],
+        )
+
+def json_dumps(obj: Any, default: Optional[Callable] = None, sort_keys: bool = False) -> str:
+    """Compact JSON text, through orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, default=default, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False)
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def encode_profile(profile: Union[Profile, Dict]) -> bytes:
+    """Compact storage form of a profile (a JSON array of its rows)."""
+    if isinstance(profile, dict):
+        profile = Profile.from_dict(profile)
+    if orjson is not None:
+        return orjson.dumps(profile.to_row())
+    return json.dumps(profile.to_row(), separators=(',', ':'), ensure_ascii=False).encode()
+
+def decode_profile(blob: Union[str, bytes]) -> Profile:
+    """Inverse of encode_profile; also reads profiles stored as plain JSON objects."""
+    data = json_loads(blob)
+    return Profile.from_dict(data) if isinstance(data, dict) else Profile.from_row(data)
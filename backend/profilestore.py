@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from profilemodel import Profile, decode_profile, encode_profile
+
+logger = logging.getLogger(__name__)
+
+class ProfileStore:
+    """Profile documents in SQLite (WAL mode), keyed by profile_id.
+
+    Each thread gets its own connection; WAL lets readers proceed while a
+    writer commits. Decoded profiles are kept in a small in-process LRU
+    along with their updated_at; every read checks that against the table,
+    so writes from other processes (server workers, bulkingest) are seen
+    straight away and only changed profiles are loaded and decoded again.
+
+    Profiles are stored in the compact row form from profilemodel and kept
+    in the LRU as typed Profile objects; dicts passed in are normalized to
+    that schema. Rows written as JSON objects by older versions still load.
+
+    The profile_chunks table lists the section vectors each profile has in
+    the vector store, so a re-ingest can tell which ones changed, and the
+    store_jobs table holds the status of background store jobs so every
+    server worker can see a job that another worker is running.
+    """
+
+    def __init__(self, db_path: str, cache_size: int = 512, job_retention: float = 86400.0):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.job_retention = job_retention
+        self.cache: OrderedDict = OrderedDict()  # profile_id -> (updated_at, Profile)
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS profiles ('
+            ' profile_id TEXT PRIMARY KEY,'
+            ' profile TEXT NOT NULL,'
+            ' updated_at TEXT NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS profile_chunks ('
+            ' profile_id TEXT NOT NULL,'
+            ' chunk_id TEXT NOT NULL,'
+            ' PRIMARY KEY (profile_id, chunk_id))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS store_jobs ('
+            ' job_id TEXT PRIMARY KEY,'
+            ' key TEXT,'
+            ' job TEXT NOT NULL,'
+            ' updated REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS store_jobs_key ON store_jobs (key)')
+        conn.execute('CREATE INDEX IF NOT EXISTS store_jobs_updated ON store_jobs (updated)')
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remember(self, profile_id: str, updated_at: str, profile: Profile) -> None:
+        with self._cache_lock:
+            self.cache[profile_id] = (updated_at, profile)
+            self.cache.move_to_end(profile_id)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def put_many(self, items: Iterable[Tuple[str, Union[Profile, Dict]]],
+                 chunk_ids: Optional[Dict[str, List[str]]] = None) -> None:
+        """Insert or replace several profiles in one transaction, along with
+        the chunk IDs of any profiles listed in chunk_ids."""
+        items = [
+            (profile_id, profile if isinstance(profile, Profile) else Profile.from_dict(profile))
+            for profile_id, profile in items
+        ]
+        timestamp = datetime.utcnow().isoformat()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO profiles (profile_id, profile, updated_at) VALUES (?, ?, ?)',
+                [(profile_id, encode_profile(profile), timestamp) for profile_id, profile in items]
+            )
+            if chunk_ids:
+                conn.executemany('DELETE FROM profile_chunks WHERE profile_id = ?',
+                                 [(profile_id,) for profile_id in chunk_ids])
+                conn.executemany(
+                    'INSERT OR IGNORE INTO profile_chunks (profile_id, chunk_id) VALUES (?, ?)',
+                    [(profile_id, chunk_id) for profile_id, ids in chunk_ids.items() for chunk_id in ids]
+                )
+        for profile_id, profile in items:
+            self._remember(profile_id, timestamp, profile)
+
+    def put(self, profile_id: str, profile: Union[Profile, Dict]) -> None:
+        self.put_many([(profile_id, profile)])
+
+    def get_many(self, profile_ids: List[str]) -> Dict[str, Dict]:
+        """Return the stored profiles for the given IDs as fresh dicts, skipping unknown ones."""
+        return {profile_id: profile.to_dict() for profile_id, profile in self.get_profiles(profile_ids).items()}
+
+    def get_profiles(self, profile_ids: List[str], batch_size: int = 500) -> Dict[str, Profile]:
+        """Like get_many, returning the cached Profile objects (treat them as read-only)."""
+        found = {}
+        conn = self._connection()
+        for i in range(0, len(profile_ids), batch_size):
+            batch = profile_ids[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            versions = conn.execute(
+                f'SELECT profile_id, updated_at FROM profiles WHERE profile_id IN ({placeholders})',
+                batch
+            ).fetchall()
+
+            stale = []
+            with self._cache_lock:
+                for profile_id, updated_at in versions:
+                    cached = self.cache.get(profile_id)
+                    if cached is not None and cached[0] == updated_at:
+                        self.cache.move_to_end(profile_id)
+                        found[profile_id] = cached[1]
+                    else:
+                        stale.append(profile_id)
+
+            if stale:
+                placeholders = ','.join('?' * len(stale))
+                rows = conn.execute(
+                    f'SELECT profile_id, profile, updated_at FROM profiles WHERE profile_id IN ({placeholders})',
+                    stale
+                ).fetchall()
+                for profile_id, blob, updated_at in rows:
+                    profile = decode_profile(blob)
+                    self._remember(profile_id, updated_at, profile)
+                    found[profile_id] = profile
+
+        return found
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        return self.get_many([profile_id]).get(profile_id)
+
+    def chunk_ids(self, profile_ids: List[str], batch_size: int = 500) -> Dict[str, List[str]]:
+        """Chunk IDs stored for each of the given profiles. Profiles stored
+        before chunking map to an empty list; unknown IDs are left out."""
+        found: Dict[str, List[str]] = {}
+        conn = self._connection()
+        for i in range(0, len(profile_ids), batch_size):
+            batch = profile_ids[i:i + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(
+                'SELECT profiles.profile_id, chunk_id FROM profiles'
+                ' LEFT JOIN profile_chunks ON profile_chunks.profile_id = profiles.profile_id'
+                f' WHERE profiles.profile_id IN ({placeholders})',
+                batch
+            ).fetchall()
+            for profile_id, chunk_id in rows:
+                chunks = found.setdefault(profile_id, [])
+                if chunk_id is not None:
+                    chunks.append(chunk_id)
+        return found
+
+    def put_job(self, job: Dict) -> None:
+        """Record a store job's status (JobQueue.to_dict form) for every
+        server process to see. Only the latest job per key is kept, and jobs
+        not updated for job_retention seconds are dropped: by then they have
+        long finished, or their worker has gone away."""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM store_jobs WHERE updated < ?', (now - self.job_retention,))
+            if job['key'] is not None:
+                conn.execute('DELETE FROM store_jobs WHERE key = ? AND job_id != ?', (job['key'], job['job_id']))
+            conn.execute(
+                'INSERT OR REPLACE INTO store_jobs (job_id, key, job, updated) VALUES (?, ?, ?, ?)',
+                (job['job_id'], job['key'], json.dumps(job), now)
+            )
+
+    def get_job(self, job_id: Optional[str] = None, key: Optional[str] = None) -> Optional[Tuple[Dict, float]]:
+        """A recorded job by ID or key, with when it was last updated."""
+        column, value = ('job_id', job_id) if job_id is not None else ('key', key)
+        row = self._connection().execute(
+            f'SELECT job, updated FROM store_jobs WHERE {column} = ?', (value,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+def profile_store() -> ProfileStore:
+    """Process-wide profile store at PROFILE_DB (defaults under tmp/)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore(
+                os.getenv('PROFILE_DB', os.path.join(os.getcwd(), 'tmp', 'profiles.db')),
+                cache_size=int(os.getenv('PROFILE_CACHE_SIZE', 512)),
+                job_retention=float(os.getenv('STORE_JOB_RETENTION', 86400))
+            )
+        return _store
+
+def set_profile_store(store: Optional[ProfileStore]) -> None:
+    """Replace the process-wide profile store (e.g. with a temp DB in tests)."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from latexgenerator import ResumeTheme
+from profilemodel import json_dumps
+
+logger = logging.getLogger(__name__)
+
+def render_key(profile: Dict, theme: ResumeTheme, engine: str = 'latex') -> str:
+    """Content hash of a profile, its normalized theme and the rendering
+    engine; doubles as the ETag."""
+    payload = json_dumps(
+        {'profile': profile, 'theme': asdict(theme.normalized()), 'engine': engine},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class RenderCache:
+    """On-disk cache of rendered resume PDFs keyed by render_key.
+
+    Bounded by total size in bytes; the least recently served PDFs are
+    evicted first. Other rendered artifacts (e.g. page previews) can share
+    the same logic under their own suffix.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, suffix: str = '.pdf'):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached PDF path for a key, or None on a miss."""
+        path = self.path(key)
+        with self._lock:
+            try:
+                os.utime(path)  # Refresh recency for eviction
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return str(path)
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Cached bytes for a key, or None if missing or evicted since the lookup."""
+        path = self.get(key)
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                pass
+        return None
+
+    def put(self, key: str, pdf_bytes: bytes) -> str:
+        """Store a freshly rendered PDF and return its cached path."""
+        path = self.path(key)
+        temp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        with self._lock:
+            with open(temp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(temp_path, path)
+            self._evict(keep=path)
+        return str(path)
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f'*{self.suffix}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
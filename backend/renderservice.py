@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import logging
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from latexgenerator import ResumeGenerator, ResumeTheme
+from metrics import observe
+from pdfgenerator import FastResumeGenerator
+
+logger = logging.getLogger(__name__)
+
+# Rendering backends selectable per request
+ENGINES = {
+    'latex': ResumeGenerator,
+    'pymupdf': FastResumeGenerator,
+}
+
+def render_pdf(profile_data: Dict, theme: ResumeTheme, engine: str, timeout: Optional[float] = None) -> bytes:
+    """Render one resume to PDF bytes; also the entry point for process pools."""
+    return ENGINES[engine](profile_data, theme).generate_bytes(timeout=timeout)
+
+class RenderQueueFull(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+class RenderTimeout(Exception):
+    """Raised when a render exceeds its wall-clock limit and is killed."""
+
+class RenderService:
+    """Runs ResumeGenerator jobs on a fixed pool of worker threads.
+
+    At most `workers` renders run at once and at most `max_queued` more may
+    wait; anything beyond that is rejected straight away. Each job compiles
+    in its own scratch directory (see ResumeGenerator.generate_bytes), and
+    pdflatex is killed once the job has run for `timeout` seconds.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 8, timeout: float = 30.0):
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='render')
+        self._slots = threading.BoundedSemaphore(workers + max_queued)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.compile_seconds_total = 0.0
+        self.compile_seconds_max = 0.0
+
+    def render(self, profile_data: Dict, theme: ResumeTheme, engine: str = 'latex') -> bytes:
+        """Render a resume and return the PDF bytes, blocking until the job finishes."""
+        return self._submit(profile_data, theme, engine).result()
+
+    async def render_async(self, profile_data: Dict, theme: ResumeTheme, engine: str = 'latex') -> bytes:
+        """Like render, awaiting the job instead of blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(profile_data, theme, engine))
+
+    def _submit(self, profile_data: Dict, theme: ResumeTheme, engine: str) -> Future:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown rendering engine: {engine}")
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise RenderQueueFull("Too many resumes are being generated; try again shortly")
+
+        with self._lock:
+            self.queued += 1
+        try:
+            # Run in a copy of the caller's context so stage timings reach its request
+            context = contextvars.copy_context()
+            future = self._pool.submit(
+                context.run, self._run, profile_data, theme, engine, time.perf_counter()
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, profile_data: Dict, theme: ResumeTheme, engine: str, submitted: float) -> bytes:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+
+        start = time.perf_counter()
+        observe('render_queue', start - submitted)
+        try:
+            pdf_bytes = render_pdf(profile_data, theme, engine, self.timeout)
+            self._record(time.perf_counter() - start, 'completed')
+            return pdf_bytes
+        except subprocess.TimeoutExpired:
+            self._record(time.perf_counter() - start, 'timeouts')
+            raise RenderTimeout(f"Resume generation exceeded {self.timeout:.0f}s")
+        except Exception:
+            self._record(time.perf_counter() - start, 'failed')
+            raise
+
+    def _record(self, seconds: float, outcome: str) -> None:
+        with self._lock:
+            self.running -= 1
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.compile_seconds_total += seconds
+            self.compile_seconds_max = max(self.compile_seconds_max, seconds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            finished = self.completed + self.failed + self.timeouts
+            return {
+                'queue_depth': self.queued,
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'rejected': self.rejected,
+                'compile_seconds_avg': self.compile_seconds_total / finished if finished else 0.0,
+                'compile_seconds_max': self.compile_seconds_max,
+            }
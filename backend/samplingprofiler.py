@@ -0,0 +1,58 @@
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for a running server.
+
+    A background thread snapshots every other thread's stack each
+    `interval` seconds and counts them in collapsed-stack form
+    ("outer;inner;leaf count" lines), which flamegraph.pl and speedscope
+    read directly. Only one profile runs at a time.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, thread_prefix: Optional[str] = None) -> str:
+        """Sample for `seconds` and return the collapsed stacks. With
+        thread_prefix, only threads whose name starts with it are sampled."""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            return self._sample(seconds, thread_prefix)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, thread_prefix: Optional[str]) -> str:
+        stacks: Counter = Counter()
+        own_id = threading.get_ident()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id, str(thread_id))
+                if thread_id == own_id or (thread_prefix and not name.startswith(thread_prefix)):
+                    continue
+                stacks[self._collapse(name, frame)] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        logger.info(f"Profiled {samples} samples over {seconds:.1f}s")
+        return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common()) + '\n'
+
+    def _collapse(self, thread_name: str, frame) -> str:
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            frames.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join([thread_name] + frames[::-1])
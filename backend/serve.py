@@ -0,0 +1,37 @@
+"""Production entry point: the ASGI app (asgiapp.py) under uvicorn.
+
+    python serve.py                          # one worker per CPU on 0.0.0.0:5000
+    WEB_CONCURRENCY=4 PORT=5001 python serve.py
+
+Port 5000 is where the Next.js API routes expect the backend, the same as
+the `python app.py` Flask dev server.
+
+Each worker is a separate process with its own event loop, API clients,
+in-memory caches, store job queue and render/parse pools (RENDER_WORKERS,
+PARSE_PROCESSES and friends are per worker). The on-disk caches, profile
+store and vector store are shared. A store job runs in the worker that
+parsed the upload, but its status is kept in the profile store, so a
+generate request on any worker waits for it and /api/jobs finds it.
+Workers also write their metrics under METRICS_DIR, so /metrics on any
+worker reports the totals for all of them.
+"""
+import os
+import shutil
+
+import uvicorn
+
+if __name__ == '__main__':
+    # Start the merged metrics afresh; workers inherit the setting
+    metrics_dir = os.environ.setdefault('METRICS_DIR', os.path.join(os.getcwd(), 'tmp', 'metrics'))
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    uvicorn.run(
+        'asgiapp:app',
+        host=os.getenv('HOST', '0.0.0.0'),
+        port=int(os.getenv('PORT', 5000)),
+        workers=int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1)),
+        # Shed load past this many open connections per worker with 503s
+        limit_concurrency=int(os.getenv('MAX_CONNECTIONS', 256)),
+        timeout_keep_alive=int(os.getenv('KEEPALIVE_TIMEOUT', 5)),
+        log_level=os.getenv('LOG_LEVEL', 'info')
+    )
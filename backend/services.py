@@ -0,0 +1,81 @@
+import os
+
+from batchrender import BatchRenderer
+from jobqueue import JobQueue
+from latexgenerator import theme_from_options
+from parsecache import ParseCache
+from previewrenderer import PreviewRenderer
+from profilemodel import json_dumps
+from profilestore import profile_store
+from rendercache import RenderCache
+from renderservice import RenderService
+from samplingprofiler import SamplingProfiler
+
+# Caches, queues and worker pools shared by the WSGI (app.py) and ASGI
+# (asgiapp.py) servers; each server process builds its own set.
+
+UPLOAD_FOLDER = os.path.join(os.getcwd(), 'tmp')
+
+# Repeat uploads of the same PDF reuse the earlier parse and profile ID
+parse_cache = ParseCache(
+    os.path.join(UPLOAD_FOLDER, 'parse_cache'),
+    max_entries=int(os.getenv('PARSE_CACHE_ENTRIES', 256)),
+    max_disk_bytes=int(os.getenv('PARSE_CACHE_BYTES', 64 * 1024 * 1024))
+)
+
+# Embedding and upserting run here after the parse response has been sent;
+# job status goes to the profile store so every server worker sees it
+store_jobs = JobQueue(
+    workers=int(os.getenv('STORE_WORKERS', 2)),
+    max_queued=int(os.getenv('STORE_QUEUE_SIZE', 100)),
+    max_retries=int(os.getenv('STORE_MAX_RETRIES', 3)),
+    status_store=profile_store,
+    stale_after=float(os.getenv('STORE_JOB_STALE', 600))
+)
+STORE_JOB_WAIT = float(os.getenv('STORE_JOB_WAIT', 30))
+
+# Rendered PDFs keyed by profile content and theme; the key is also the ETag
+render_cache = RenderCache(
+    os.path.join(UPLOAD_FOLDER, 'resume_cache'),
+    max_bytes=int(os.getenv('RENDER_CACHE_BYTES', 256 * 1024 * 1024))
+)
+
+# pdflatex runs on a fixed pool with a bounded queue and a hard time limit
+render_service = RenderService(
+    workers=int(os.getenv('RENDER_WORKERS', 2)),
+    max_queued=int(os.getenv('RENDER_QUEUE_SIZE', 8)),
+    timeout=float(os.getenv('RENDER_TIMEOUT', 30))
+)
+
+# Batch renders compile on their own processes, separate from the pool
+# that serves single generate requests
+batch_renderer = BatchRenderer(
+    processes=int(os.getenv('BATCH_PROCESSES', 2)),
+    timeout=float(os.getenv('RENDER_TIMEOUT', 30)),
+    cache=render_cache
+)
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 500))
+
+# Page-one thumbnails for theme switching, keyed by render key, DPI and format
+preview_cache = RenderCache(
+    os.path.join(UPLOAD_FOLDER, 'preview_cache'),
+    max_bytes=int(os.getenv('PREVIEW_CACHE_BYTES', 32 * 1024 * 1024)),
+    suffix='.img'
+)
+preview_renderer = PreviewRenderer(workers=int(os.getenv('PREVIEW_WORKERS', 2)))
+PREVIEW_DPI = int(os.getenv('PREVIEW_DPI', 50))
+
+# On-demand stack sampling; off unless explicitly enabled for a deployment
+profiler = SamplingProfiler(interval=float(os.getenv('PROFILER_INTERVAL', 0.005))) \
+    if os.getenv('PROFILER_ENABLED', '').lower() in ('1', 'true') else None
+PROFILER_MAX_SECONDS = 60
+
+class FastJSONMixin:
+    """Mixin for the Flask and Quart JSON providers: responses are encoded
+    with json_dumps (orjson when installed) unless pretty-printed for debug."""
+
+    def dumps(self, obj, **kwargs):
+        if 'indent' in kwargs:
+            return super().dumps(obj, **kwargs)
+        return json_dumps(obj, default=self.default, sort_keys=self.sort_keys)
+
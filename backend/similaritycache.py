@@ -0,0 +1,76 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SimilarityCache:
+    """LRU of find_similar_profiles results keyed by (profile_id, top_k).
+
+    Entries for a profile are dropped when that profile is upserted again.
+    A new or updated neighbour does not invalidate other profiles' entries,
+    so entries also expire after ttl seconds to pick those up.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()  # (profile_id, top_k) -> (stored_at, results)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, profile_id: str, top_k: int) -> Optional[List[Dict]]:
+        key = (profile_id, top_k)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, profile_id: str, top_k: int, results: List[Dict]) -> None:
+        with self._lock:
+            key = (profile_id, top_k)
+            self.entries[key] = (time.monotonic(), list(results))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, profile_ids: Iterable[str]) -> None:
+        """Forget every cached top_k for the given profiles."""
+        profile_ids = set(profile_ids)
+        with self._lock:
+            stale: List[Tuple[str, int]] = [key for key in self.entries if key[0] in profile_ids]
+            for key in stale:
+                del self.entries[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+_cache: Optional[SimilarityCache] = None
+_cache_lock = threading.Lock()
+
+def similarity_cache() -> SimilarityCache:
+    """Process-wide similarity cache sized by SIMILAR_CACHE_ENTRIES and SIMILAR_CACHE_TTL."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SimilarityCache(
+                max_entries=int(os.getenv('SIMILAR_CACHE_ENTRIES', 1024)),
+                ttl=float(os.getenv('SIMILAR_CACHE_TTL', 300))
+            )
+        return _cache
+
+def set_similarity_cache(cache: Optional[SimilarityCache]) -> None:
+    """Replace the process-wide similarity cache (e.g. to disable it in tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
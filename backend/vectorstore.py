@@ -0,0 +1,448 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process per store directory
+    fcntl = None
+
+from clients import clients
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class VectorRecord:
+    id: str
+    values: List[float]
+    metadata: Dict = field(default_factory=dict)
+
+@dataclass
+class VectorMatch:
+    id: str
+    score: float
+    metadata: Dict = field(default_factory=dict)
+
+class VectorStore(ABC):
+    """Interface shared by the vector database backends."""
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict]) -> None:
+        """Insert or replace records given as {'id', 'values', 'metadata'} dicts."""
+
+    @abstractmethod
+    def fetch(self, ids: List[str]) -> Dict[str, VectorRecord]:
+        """Return the stored records for the given IDs, skipping unknown ones."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Remove the records with the given IDs; unknown IDs are ignored."""
+
+    @abstractmethod
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        """Return the top_k records by cosine similarity, best first."""
+
+    def query_many(self, vectors: List[List[float]], top_k: int) -> List[List[VectorMatch]]:
+        """query for each of several vectors, in order."""
+        return [self.query(vector, top_k) for vector in vectors]
+
+    def query_by_id(self, vector_id: str, top_k: int) -> Optional[List[VectorMatch]]:
+        """Like query, using a stored record's vector; None if the ID is unknown.
+
+        Backends that can look the vector up server-side override this to
+        save the fetch round trip.
+        """
+        records = self.fetch([vector_id])
+        if vector_id not in records:
+            return None
+        return self.query(records[vector_id].values, top_k)
+
+    def query_many_by_id(self, vector_ids: List[str], top_k: int) -> List[Optional[List[VectorMatch]]]:
+        """query_by_id for each of several IDs, in order."""
+        return [self.query_by_id(vector_id, top_k) for vector_id in vector_ids]
+
+    # Async variants for the ASGI app. By default they run the blocking
+    # method on a worker thread; backends with an asyncio client override them.
+
+    async def aupsert(self, vectors: List[Dict]) -> None:
+        await asyncio.to_thread(self.upsert, vectors)
+
+    async def afetch(self, ids: List[str]) -> Dict[str, VectorRecord]:
+        return await asyncio.to_thread(self.fetch, ids)
+
+    async def adelete(self, ids: List[str]) -> None:
+        await asyncio.to_thread(self.delete, ids)
+
+    async def aquery(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        return await asyncio.to_thread(self.query, vector, top_k)
+
+    async def aquery_by_id(self, vector_id: str, top_k: int) -> Optional[List[VectorMatch]]:
+        return await asyncio.to_thread(self.query_by_id, vector_id, top_k)
+
+    async def aquery_many_by_id(self, vector_ids: List[str], top_k: int) -> List[Optional[List[VectorMatch]]]:
+        return await asyncio.to_thread(self.query_many_by_id, vector_ids, top_k)
+
+class PineconeVectorStore(VectorStore):
+    """Vector store backed by the shared Pinecone index."""
+
+    def __init__(self, namespace: str = "profiles"):
+        self.namespace = namespace
+
+    def upsert(self, vectors: List[Dict]) -> None:
+        clients.index().upsert(vectors=vectors, namespace=self.namespace)
+
+    def fetch(self, ids: List[str]) -> Dict[str, VectorRecord]:
+        return self._records(clients.index().fetch(ids=ids, namespace=self.namespace))
+
+    def delete(self, ids: List[str]) -> None:
+        clients.index().delete(ids=ids, namespace=self.namespace)
+
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        response = clients.index().query(
+            vector=vector,
+            top_k=top_k,
+            namespace=self.namespace,
+            include_metadata=True
+        )
+        return self._matches(response)
+
+    def query_by_id(self, vector_id: str, top_k: int) -> Optional[List[VectorMatch]]:
+        # Pinecone resolves the ID to its vector server-side: one round trip
+        response = clients.index().query(
+            id=vector_id,
+            top_k=top_k,
+            namespace=self.namespace,
+            include_metadata=True
+        )
+        # An unknown ID yields no matches; a known one always matches itself
+        return self._matches(response) or None
+
+    def query_many_by_id(self, vector_ids: List[str], top_k: int) -> List[Optional[List[VectorMatch]]]:
+        # Pinecone takes one ID per query; send them concurrently
+        if len(vector_ids) <= 1:
+            return super().query_many_by_id(vector_ids, top_k)
+        workers = min(len(vector_ids), clients.config.pinecone_pool_threads)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda vector_id: self.query_by_id(vector_id, top_k), vector_ids))
+
+    async def aupsert(self, vectors: List[Dict]) -> None:
+        await clients.async_index().upsert(vectors=vectors, namespace=self.namespace)
+
+    async def afetch(self, ids: List[str]) -> Dict[str, VectorRecord]:
+        return self._records(await clients.async_index().fetch(ids=ids, namespace=self.namespace))
+
+    async def adelete(self, ids: List[str]) -> None:
+        await clients.async_index().delete(ids=ids, namespace=self.namespace)
+
+    async def aquery(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        response = await clients.async_index().query(
+            vector=vector,
+            top_k=top_k,
+            namespace=self.namespace,
+            include_metadata=True
+        )
+        return self._matches(response)
+
+    async def aquery_by_id(self, vector_id: str, top_k: int) -> Optional[List[VectorMatch]]:
+        response = await clients.async_index().query(
+            id=vector_id,
+            top_k=top_k,
+            namespace=self.namespace,
+            include_metadata=True
+        )
+        return self._matches(response) or None
+
+    async def aquery_many_by_id(self, vector_ids: List[str], top_k: int) -> List[Optional[List[VectorMatch]]]:
+        return list(await asyncio.gather(*(self.aquery_by_id(vector_id, top_k) for vector_id in vector_ids)))
+
+    @staticmethod
+    def _records(response) -> Dict[str, VectorRecord]:
+        return {
+            vector_id: VectorRecord(id=vector_id, values=vector.values, metadata=vector.metadata or {})
+            for vector_id, vector in response.vectors.items()
+        }
+
+    @staticmethod
+    def _matches(response) -> List[VectorMatch]:
+        return [
+            VectorMatch(id=match.id, score=match.score, metadata=match.metadata or {})
+            for match in response.matches
+        ]
+
+class LocalVectorStore(VectorStore):
+    """Offline vector store on a memory-mapped float32 matrix.
+
+    Vectors are appended to vectors.f32 and addressed through an id table
+    (ids.jsonl) that points each row at its metadata in metadata.jsonl.
+    Upserts only ever append; the newest row for an ID wins and older rows
+    are masked out until compaction rewrites the files. Deletes append an
+    [id, null, null] tombstone to the id table. Opening the store
+    reads just the id table, so the matrix and metadata stay on disk.
+
+    Several processes can share one directory: writers hold an exclusive
+    file lock and readers a shared one, and each replays whatever the
+    others appended to the id table before touching the files.
+    """
+
+    def __init__(self, directory: str, dimension: int = 1536, compact_ratio: float = 0.5):
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / 'vectors.f32'
+        self._ids_path = self.directory / 'ids.jsonl'
+        self._metadata_path = self.directory / 'metadata.jsonl'
+        self._lock_path = self.directory / '.lock'
+        self._ids_file = None
+        with self._lock, self._file_lock(shared=True):
+            self._load()
+
+    def _reset(self) -> None:
+        self.row_ids: List[str] = []
+        self.row_metadata: List[tuple] = []  # (offset, length) into metadata.jsonl
+        self.rows: Dict[str, int] = {}  # ID -> live row
+        if self._ids_file is not None:
+            self._ids_file.close()
+        self._ids_file = None  # Open id table; holding it keeps its inode from being reused
+        self._ids_offset = 0
+        self._matrix = None
+        self._live = np.zeros(0, dtype=bool)
+
+    def _load(self) -> None:
+        self._reset()
+        self._catch_up()
+
+    def _catch_up(self) -> None:
+        """Apply id table lines appended since the last read (by any process);
+        the caller holds the file lock."""
+        try:
+            stat = self._ids_path.stat()
+        except FileNotFoundError:
+            return
+        if self._ids_file is None or os.fstat(self._ids_file.fileno()).st_ino != stat.st_ino:
+            # Compacted by another process (or first read): start over
+            self._reset()
+            self._ids_file = open(self._ids_path, 'rb')
+        if stat.st_size == self._ids_offset:
+            return
+
+        self._ids_file.seek(self._ids_offset)
+        for line in self._ids_file:
+            if not line.endswith(b'\n'):
+                break  # Left by an interrupted write; the next writer truncates it
+            self._ids_offset += len(line)
+            vector_id, offset, length = json.loads(line)
+            if offset is None:
+                self.rows.pop(vector_id, None)
+                continue
+            self.rows[vector_id] = len(self.row_ids)
+            self.row_ids.append(vector_id)
+            self.row_metadata.append((offset, length))
+
+        # Rows beyond the id table belong to an interrupted write; ignore them
+        self._live = np.zeros(len(self.row_ids), dtype=bool)
+        self._live[list(self.rows.values())] = True
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        with open(self._lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_ids(self, entries: List[list]) -> None:
+        """Append id table lines after the last complete one and apply them;
+        the caller holds the exclusive file lock."""
+        with open(self._ids_path, 'ab') as f:
+            f.truncate(self._ids_offset)
+            f.write(b''.join(json.dumps(entry).encode() + b'\n' for entry in entries))
+        self._catch_up()
+
+    def _matrix_view(self) -> np.ndarray:
+        """Read-only memmap over the committed rows, reopened as the file grows."""
+        count = len(self.row_ids)
+        if count == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] != count:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r',
+                                     shape=(count, self.dimension))
+        return self._matrix
+
+    def _read_metadata(self, row: int) -> Dict:
+        offset, length = self.row_metadata[row]
+        with open(self._metadata_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def upsert(self, vectors: List[Dict]) -> None:
+        if not vectors:
+            return
+        matrix = np.asarray([v['values'] for v in vectors], dtype=np.float32)
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional vectors, got {matrix.shape[1]}")
+
+        with self._lock, self._file_lock():
+            self._catch_up()
+            # Truncate any partial write so rows line up with the id table
+            with open(self._vectors_path, 'ab') as f:
+                f.truncate(len(self.row_ids) * self.dimension * 4)
+                f.write(matrix.tobytes())
+
+            entries = []
+            with open(self._metadata_path, 'ab') as f:
+                for vector in vectors:
+                    blob = json.dumps(vector.get('metadata', {})).encode() + b'\n'
+                    entries.append([vector['id'], f.tell(), len(blob)])
+                    f.write(blob)
+
+            # Rows become visible once their id lines are written
+            self._append_ids(entries)
+            self._compact_if_sparse()
+
+    def delete(self, ids: List[str]) -> None:
+        with self._lock, self._file_lock():
+            self._catch_up()
+            deleted = [vector_id for vector_id in dict.fromkeys(ids) if vector_id in self.rows]
+            if deleted:
+                self._append_ids([[vector_id, None, None] for vector_id in deleted])
+                self._compact_if_sparse()
+
+    def _compact_if_sparse(self) -> None:
+        dead = len(self.row_ids) - len(self.rows)
+        if dead > self.compact_ratio * len(self.row_ids):
+            self._compact()
+
+    def compact(self) -> None:
+        """Rewrite the files keeping only the live row for each ID."""
+        with self._lock, self._file_lock():
+            self._catch_up()
+            self._compact()
+
+    def _compact(self) -> None:
+        matrix = self._matrix_view()
+        live_rows = sorted(self.rows.values())
+        vectors = [
+            {'id': self.row_ids[row], 'values': matrix[row], 'metadata': self._read_metadata(row)}
+            for row in live_rows
+        ]
+
+        temp = self.directory / 'compact'
+        temp.mkdir(exist_ok=True)
+        for path in temp.iterdir():
+            path.unlink()
+        compacted = LocalVectorStore(str(temp), self.dimension, compact_ratio=1.0)
+        compacted.upsert(vectors)
+        compacted._reset()  # Close its id table before the file is moved out
+
+        # Readers in other processes see the new id table's inode and reload
+        self._matrix = None
+        os.replace(temp / 'vectors.f32', self._vectors_path)
+        os.replace(temp / 'metadata.jsonl', self._metadata_path)
+        os.replace(temp / 'ids.jsonl', self._ids_path)
+        for path in temp.iterdir():
+            path.unlink()
+        temp.rmdir()
+        self._load()
+        logger.info(f"Compacted local vector store to {len(live_rows)} rows")
+
+    def fetch(self, ids: List[str]) -> Dict[str, VectorRecord]:
+        with self._lock, self._file_lock(shared=True):
+            self._catch_up()
+            matrix = self._matrix_view()
+            return {
+                vector_id: VectorRecord(
+                    id=vector_id,
+                    values=matrix[self.rows[vector_id]].tolist(),
+                    metadata=self._read_metadata(self.rows[vector_id])
+                )
+                for vector_id in ids if vector_id in self.rows
+            }
+
+    def query(self, vector: List[float], top_k: int) -> List[VectorMatch]:
+        return self.query_many([vector], top_k)[0]
+
+    def query_many(self, vectors: List[List[float]], top_k: int) -> List[List[VectorMatch]]:
+        with self._lock, self._file_lock(shared=True):
+            self._catch_up()
+            return self._query(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension), top_k)
+
+    def query_by_id(self, vector_id: str, top_k: int) -> Optional[List[VectorMatch]]:
+        with self._lock, self._file_lock(shared=True):
+            self._catch_up()
+            if vector_id not in self.rows:
+                return None
+            return self._query(self._matrix_view()[self.rows[vector_id]][None, :], top_k)[0]
+
+    def query_many_by_id(self, vector_ids: List[str], top_k: int) -> List[Optional[List[VectorMatch]]]:
+        with self._lock, self._file_lock(shared=True):
+            self._catch_up()
+            known = [vector_id for vector_id in vector_ids if vector_id in self.rows]
+            if not known:
+                return [None] * len(vector_ids)
+            queries = self._matrix_view()[[self.rows[vector_id] for vector_id in known]]
+            results = dict(zip(known, self._query(queries, top_k)))
+            return [results.get(vector_id) for vector_id in vector_ids]
+
+    def _query(self, queries: np.ndarray, top_k: int) -> List[List[VectorMatch]]:
+        """Top-k cosine matches for each row of queries, in one pass over the
+        matrix; the caller holds the lock."""
+        matrix = self._matrix_view()
+        live = self._live
+        if not len(self.rows) or top_k <= 0:
+            return [[] for _ in queries]
+
+        norms = np.outer(np.linalg.norm(queries, axis=1), np.linalg.norm(matrix, axis=1))
+        scores = (queries @ matrix.T) / np.where(norms == 0, 1, norms)
+        scores[:, ~live] = -np.inf
+
+        k = min(top_k, len(self.rows))
+        results = []
+        for row_scores in scores:
+            top = np.argpartition(-row_scores, k - 1)[:k]
+            top = top[np.argsort(-row_scores[top])]
+            results.append([
+                VectorMatch(id=self.row_ids[row], score=float(row_scores[row]), metadata=self._read_metadata(row))
+                for row in top
+            ])
+        return results
+
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+
+def vector_store() -> VectorStore:
+    """Process-wide vector store selected by the VECTOR_STORE env variable."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = os.getenv('VECTOR_STORE', 'pinecone')
+            if backend == 'local':
+                _store = LocalVectorStore(
+                    os.getenv('LOCAL_VECTOR_DIR', os.path.join(os.getcwd(), 'tmp', 'vectors')),
+                    dimension=int(os.getenv('VECTOR_DIMENSION', 1536))
+                )
+            elif backend == 'pinecone':
+                _store = PineconeVectorStore()
+            else:
+                raise ValueError(f"Unknown vector store backend: {backend}")
+        return _store
+
+def set_vector_store(store: Optional[VectorStore]) -> None:
+    """Replace the process-wide vector store (e.g. with a fake in tests)."""
+    global _store
+    with _store_lock:
+        _store = store
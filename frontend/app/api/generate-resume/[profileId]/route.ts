@@ -1,35 +1,67 @@
 import { NextRequest, NextResponse } from "next/server";
 
+// Last PDF seen per profile + theme, revalidated against the backend ETag
+const MAX_CACHED_PDFS = 50;
+const pdfCache = new Map<string, { etag: string; pdf: ArrayBuffer }>();
+
 export async function POST(
   request: NextRequest,
   { params }: { params: { profileId: string } }
 ) {
   try {
     const themeOptions = await request.json();
+    const cacheKey = `${params.profileId}:${JSON.stringify(themeOptions)}`;
+    const cached = pdfCache.get(cacheKey);
+
+    const headers: Record<string, string> = {
+      "Content-Type": "application/json",
+    };
+    if (cached) {
+      headers["If-None-Match"] = cached.etag;
+    }
 
     const response = await fetch(
       `http://127.0.0.1:5000/api/generate-resume/${params.profileId}`,
       {
         method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
+        headers,
         body: JSON.stringify(themeOptions),
       }
     );
 
-    if (!response.ok) {
-      throw new Error(`Backend responded with status: ${response.status}`);
+    let pdfBuffer: ArrayBuffer;
+    let etag: string | null;
+    if (response.status === 304 && cached) {
+      pdfBuffer = cached.pdf;
+      etag = cached.etag;
+    } else {
+      if (!response.ok) {
+        throw new Error(`Backend responded with status: ${response.status}`);
+      }
+
+      // Get the PDF file from the response
+      pdfBuffer = await response.arrayBuffer();
+      etag = response.headers.get("ETag");
+      if (etag) {
+        pdfCache.delete(cacheKey);
+        pdfCache.set(cacheKey, { etag, pdf: pdfBuffer });
+        if (pdfCache.size > MAX_CACHED_PDFS) {
+          pdfCache.delete(pdfCache.keys().next().value as string);
+        }
+      }
     }
 
-    // Get the PDF file from the response
-    const pdfBuffer = await response.arrayBuffer();
+    // Browsers that already hold this PDF get an empty 304
+    if (etag && request.headers.get("If-None-Match") === etag) {
+      return new NextResponse(null, { status: 304, headers: { ETag: etag } });
+    }
 
     // Return the PDF with appropriate headers
     return new NextResponse(pdfBuffer, {
       headers: {
         "Content-Type": "application/pdf",
         "Content-Disposition": `attachment; filename="resume_${params.profileId}.pdf"`,
+        ...(etag ? { ETag: etag } : {}),
       },
     });
   } catch (error) {
@@ -0,0 +1,55 @@
+import { NextRequest, NextResponse } from "next/server";
+
+export async function POST(
+  request: NextRequest,
+  { params }: { params: { profileId: string } }
+) {
+  try {
+    const previewOptions = await request.json();
+
+    const headers: Record<string, string> = {
+      "Content-Type": "application/json",
+    };
+    const ifNoneMatch = request.headers.get("If-None-Match");
+    if (ifNoneMatch) {
+      headers["If-None-Match"] = ifNoneMatch;
+    }
+
+    const response = await fetch(
+      `http://127.0.0.1:5000/api/preview-resume/${params.profileId}`,
+      {
+        method: "POST",
+        headers,
+        body: JSON.stringify(previewOptions),
+      }
+    );
+
+    const etag = response.headers.get("ETag");
+    if (response.status === 304) {
+      return new NextResponse(null, {
+        status: 304,
+        headers: etag ? { ETag: etag } : {},
+      });
+    }
+    if (!response.ok) {
+      throw new Error(`Backend responded with status: ${response.status}`);
+    }
+
+    // Return the preview image as-is
+    return new NextResponse(await response.arrayBuffer(), {
+      headers: {
+        "Content-Type": response.headers.get("Content-Type") ?? "image/png",
+        ...(etag ? { ETag: etag } : {}),
+      },
+    });
+  } catch (error) {
+    console.error("Error in preview-resume route:", error);
+    return NextResponse.json(
+      {
+        error:
+          error instanceof Error ? error.message : "Failed to preview resume",
+      },
+      { status: 500 }
+    );
+  }
+}
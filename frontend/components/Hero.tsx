@@ -170,6 +170,7 @@ const Hero = () => {
               </Button>
             </div>
             <ResumePreview
+              profileId={responseData.profile_id}
               profileData={responseData.profile_data}
               onGenerateResume={handleGenerateResume}
               isGenerating={isGenerating}
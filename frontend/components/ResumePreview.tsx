@@ -1,3 +1,5 @@
+import { useEffect, useRef, useState } from "react";
+
 import { Box } from "@/components/craft";
 import { Button } from "@/components/ui/button";
 import {
@@ -8,46 +10,110 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 
+const THEMES = {
+  modern: {
+    primary_color: "0,0,0",
+    accent_color: "100,100,100",
+    font_family: "helvetica",
+    section_style: "modern",
+    layout: "modern",
+    font_size: "11pt",
+  },
+  classic: {
+    primary_color: "50,50,50",
+    accent_color: "150,150,150",
+    font_family: "times",
+    section_style: "classic",
+    layout: "traditional",
+    font_size: "12pt",
+  },
+  minimal: {
+    primary_color: "0,0,0",
+    accent_color: "200,200,200",
+    font_family: "helvetica",
+    section_style: "basic",
+    layout: "traditional",
+    font_size: "10pt",
+  },
+};
+
+// Resolution of the page-one thumbnail shown while picking a theme
+const PREVIEW_DPI = 72;
+
 interface ResumePreviewProps {
+  profileId: string;
   profileData: any;
   onGenerateResume: (theme: any) => void;
   isGenerating: boolean;
 }
 
 const ResumePreview = ({
+  profileId,
   profileData,
   onGenerateResume,
   isGenerating,
 }: ResumePreviewProps) => {
-  const handleThemeChange = (value: string) => {
-    const themeOptions = {
-      modern: {
-        primary_color: "0,0,0",
-        accent_color: "100,100,100",
-        font_family: "helvetica",
-        section_style: "modern",
-        layout: "modern",
-        font_size: "11pt",
-      },
-      classic: {
-        primary_color: "50,50,50",
-        accent_color: "150,150,150",
-        font_family: "times",
-        section_style: "classic",
-        layout: "traditional",
-        font_size: "12pt",
-      },
-      minimal: {
-        primary_color: "0,0,0",
-        accent_color: "200,200,200",
-        font_family: "helvetica",
-        section_style: "basic",
-        layout: "traditional",
-        font_size: "10pt",
-      },
+  const [selectedTheme, setSelectedTheme] = useState<keyof typeof THEMES>();
+  const [previewUrl, setPreviewUrl] = useState<string | null>(null);
+  const [isPreviewing, setIsPreviewing] = useState(false);
+  // Object URLs of previews already fetched, so flipping back is instant
+  const previews = useRef(new Map<string, string>());
+  // The preview request in flight; a newer theme choice aborts it
+  const pending = useRef<AbortController | null>(null);
+
+  useEffect(() => {
+    const urls = previews.current;
+    return () => {
+      pending.current?.abort();
+      urls.forEach((url) => URL.revokeObjectURL(url));
+      urls.clear();
     };
+  }, [profileId]);
+
+  const handleThemeChange = async (value: string) => {
+    const themeName = value as keyof typeof THEMES;
+    setSelectedTheme(themeName);
+    pending.current?.abort();
+    pending.current = null;
+
+    const cached = previews.current.get(themeName);
+    if (cached) {
+      setPreviewUrl(cached);
+      return;
+    }
 
-    onGenerateResume(themeOptions[value as keyof typeof themeOptions]);
+    const controller = new AbortController();
+    pending.current = controller;
+    setIsPreviewing(true);
+    try {
+      const response = await fetch(`/api/preview-resume/${profileId}`, {
+        method: "POST",
+        signal: controller.signal,
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ ...THEMES[themeName], dpi: PREVIEW_DPI }),
+      });
+      if (!response.ok) {
+        throw new Error("Failed to preview resume");
+      }
+      const url = URL.createObjectURL(await response.blob());
+      previews.current.set(themeName, url);
+      setPreviewUrl(url);
+    } catch (err) {
+      // A newer theme choice owns the preview now
+      if (controller.signal.aborted) {
+        return;
+      }
+      // Fall back to the plain HTML preview below
+      console.error(err);
+      setPreviewUrl(null);
+    } finally {
+      if (pending.current === controller) {
+        pending.current = null;
+        setIsPreviewing(false);
+      }
+    }
   };
 
   return (
@@ -65,70 +131,84 @@ const ResumePreview = ({
               <SelectItem value="minimal">Minimal Theme</SelectItem>
             </SelectContent>
           </Select>
-          <Button disabled={isGenerating}>
+          <Button
+            disabled={isGenerating || !selectedTheme}
+            onClick={() => selectedTheme && onGenerateResume(THEMES[selectedTheme])}
+          >
             {isGenerating ? "Generating..." : "Download PDF"}
           </Button>
         </div>
       </div>
 
-      <div className="border rounded-lg p-8 bg-white text-black min-h-[800px]">
-        {/* Contact Section */}
-        <div className="text-center mb-8">
-          <h1 className="text-2xl font-bold mb-2">
-            {profileData.contact?.name || ""}
-          </h1>
-          <p className="text-sm">
-            {profileData.contact?.email} • {profileData.contact?.location}
-          </p>
+      {previewUrl ? (
+        <div className="border rounded-lg bg-white">
+          {/* eslint-disable-next-line @next/next/no-img-element */}
+          <img
+            src={previewUrl}
+            alt="Resume preview"
+            className={`w-full ${isPreviewing ? "opacity-50" : ""}`}
+          />
         </div>
-
-        {/* Summary Section */}
-        {profileData.summary && (
-          <div className="mb-6">
-            <h2 className="text-lg font-semibold border-b mb-2">Summary</h2>
-            <p className="text-sm">{profileData.summary}</p>
+      ) : (
+        <div className="border rounded-lg p-8 bg-white text-black min-h-[800px]">
+          {/* Contact Section */}
+          <div className="text-center mb-8">
+            <h1 className="text-2xl font-bold mb-2">
+              {profileData.contact?.name || ""}
+            </h1>
+            <p className="text-sm">
+              {profileData.contact?.email} • {profileData.contact?.location}
+            </p>
           </div>
-        )}
 
-        {/* Experience Section */}
-        {profileData.experience && (
-          <div className="mb-6">
-            <h2 className="text-lg font-semibold border-b mb-2">Experience</h2>
-            {profileData.experience.map((exp: any, index: number) => (
-              <div key={index} className="mb-4">
-                <div className="flex justify-between">
-                  <strong>{exp.title}</strong>
-                  <span className="text-sm">
-                    {exp.dates.start} - {exp.dates.end}
-                  </span>
-                </div>
-                <div className="text-sm">{exp.company}</div>
-                <p className="text-sm mt-1">{exp.description}</p>
-              </div>
-            ))}
-          </div>
-        )}
+          {/* Summary Section */}
+          {profileData.summary && (
+            <div className="mb-6">
+              <h2 className="text-lg font-semibold border-b mb-2">Summary</h2>
+              <p className="text-sm">{profileData.summary}</p>
+            </div>
+          )}
 
-        {/* Education Section */}
-        {profileData.education && (
-          <div className="mb-6">
-            <h2 className="text-lg font-semibold border-b mb-2">Education</h2>
-            {profileData.education.map((edu: any, index: number) => (
-              <div key={index} className="mb-2">
-                <div className="flex justify-between">
-                  <strong>{edu.school}</strong>
-                  <span className="text-sm">
-                    {edu.dates.start} - {edu.dates.end}
-                  </span>
+          {/* Experience Section */}
+          {profileData.experience && (
+            <div className="mb-6">
+              <h2 className="text-lg font-semibold border-b mb-2">Experience</h2>
+              {profileData.experience.map((exp: any, index: number) => (
+                <div key={index} className="mb-4">
+                  <div className="flex justify-between">
+                    <strong>{exp.title}</strong>
+                    <span className="text-sm">
+                      {exp.dates.start} - {exp.dates.end}
+                    </span>
+                  </div>
+                  <div className="text-sm">{exp.company}</div>
+                  <p className="text-sm mt-1">{exp.description}</p>
                 </div>
-                <div className="text-sm">
-                  {edu.degree} in {edu.field}
+              ))}
+            </div>
+          )}
+
+          {/* Education Section */}
+          {profileData.education && (
+            <div className="mb-6">
+              <h2 className="text-lg font-semibold border-b mb-2">Education</h2>
+              {profileData.education.map((edu: any, index: number) => (
+                <div key={index} className="mb-2">
+                  <div className="flex justify-between">
+                    <strong>{edu.school}</strong>
+                    <span className="text-sm">
+                      {edu.dates.start} - {edu.dates.end}
+                    </span>
+                  </div>
+                  <div className="text-sm">
+                    {edu.degree} in {edu.field}
+                  </div>
                 </div>
-              </div>
-            ))}
-          </div>
-        )}
-      </div>
+              ))}
+            </div>
+          )}
+        </div>
+      )}
     </Box>
   );
 };